@@ -0,0 +1,56 @@
+"""Shared fixtures for the benchmarks.
+
+Benchmarks are plain (sync) functions driving their own event loop: pytest-benchmark calls the
+benchmarked function repeatedly and can't await it. Every request goes to a local `MockToggl`.
+"""
+
+# pylint: disable=redefined-outer-name
+
+import asyncio
+
+import pytest
+
+from lib_toggl import __version__
+from lib_toggl.client import Toggl
+from lib_toggl.mock_server import MockToggl
+from lib_toggl.ratelimit import LeakyBucket
+
+
+def pytest_benchmark_update_machine_info(config, machine_info):  # pylint: disable=unused-argument
+    """Stored with every saved run so results can be lined up against releases."""
+    machine_info["lib_toggl"] = __version__
+
+
+@pytest.fixture(scope="module")
+def loop():
+    """Event loop the module's server and clients run on."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def server(loop):
+    """A mock server with no latency, errors or limits."""
+    server = MockToggl()
+    loop.run_until_complete(server.start())
+    yield server
+    loop.run_until_complete(server.close())
+
+
+def make_client(server: MockToggl, **kwargs) -> Toggl:
+    """Client for `server` that is never held back by its own rate limiter."""
+    return Toggl(
+        "benchmark-token",
+        rate_limiter=LeakyBucket(rate=1_000_000, capacity=1_000_000),
+        base_url=server.base_url,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def client(loop, server):
+    """Client talking to `server`."""
+    client = make_client(server)
+    yield client
+    loop.run_until_complete(client.close())
@@ -0,0 +1,47 @@
+"""Many callers asking for the current Time Entry at once"""
+
+# pylint: disable=missing-function-docstring,redefined-outer-name
+
+import asyncio
+
+import pytest
+
+CONCURRENCY = [1, 10, 100]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def running(server):
+    return server.add_time_entry(1, description="Running", duration=-1)
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCY)
+def test_get_current_time_entry(benchmark, loop, server, client, concurrency):
+    """Always asks the server; concurrent callers share one request."""
+
+    async def poll():
+        return await asyncio.gather(
+            *(client.get_current_time_entry() for _ in range(concurrency))
+        )
+
+    def setup():
+        server.stats.reset()
+
+    results = benchmark.pedantic(
+        lambda: loop.run_until_complete(poll()), setup=setup, rounds=50
+    )
+    benchmark.extra_info["requests_per_round"] = server.stats.requests
+    assert len(results) == concurrency
+    assert server.stats.requests == 1
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCY)
+def test_current_time_entry_property(benchmark, loop, client, concurrency):
+    """Served from the cache once fresh."""
+
+    async def poll():
+        return await asyncio.gather(
+            *(client.current_time_entry for _ in range(concurrency))
+        )
+
+    results = benchmark(lambda: loop.run_until_complete(poll()))
+    assert all(te is not None for te in results)
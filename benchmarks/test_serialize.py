@@ -0,0 +1,51 @@
+"""Time Entry serialization, the body of every create and edit"""
+
+# pylint: disable=missing-function-docstring
+
+from datetime import UTC, datetime, timedelta
+
+from pyrfc3339 import generate
+
+from lib_toggl.codec import dump_model
+from lib_toggl.time_entries import TimeEntry
+
+START = datetime(2024, 1, 1, 9, tzinfo=UTC)
+
+
+def _entries(count: int) -> list[TimeEntry]:
+    return [
+        TimeEntry(
+            id=i,
+            workspace_id=1,
+            project_id=2,
+            start=START + timedelta(hours=i),
+            stop=START + timedelta(hours=i, minutes=45),
+            duration=45 * 60,
+            description=f"Entry {i}",
+            tags=["alpha", "beta"],
+            tag_ids=[1, 2],
+        )
+        for i in range(count)
+    ]
+
+
+def test_model_dump_json(benchmark):
+    [te] = _entries(1)
+    assert benchmark(te.model_dump_json, exclude_none=True)
+
+
+def test_dump_model(benchmark):
+    """The bytes the client actually sends; skips decoding to str."""
+    [te] = _entries(1)
+    assert benchmark(dump_model, te, exclude_none=True)
+
+
+def test_model_dump_json_batch(benchmark):
+    entries = _entries(1_000)
+    benchmark.extra_info["entries"] = len(entries)
+    benchmark(lambda: [te.model_dump_json(exclude_none=True) for te in entries])
+
+
+def test_rfc3339_generate(benchmark):
+    """The start/stop field serializers; called twice per finished entry."""
+    assert benchmark(generate, START, utc=True, accept_naive=True)
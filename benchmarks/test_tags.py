@@ -0,0 +1,43 @@
+"""`update_tags()`: time and requests per retag"""
+
+# pylint: disable=missing-function-docstring,redefined-outer-name
+
+import itertools
+
+import pytest
+
+from lib_toggl.time_entries import TimeEntry
+
+# current tags -> desired tags, requests it should take. {i} is unique per round.
+SCENARIOS = {
+    "unchanged": (["a", "b"], ["a", "b"], 0),
+    "add": (["a"], ["a", "b"], 1),
+    "remove": (["a", "b"], ["a"], 1),
+    "swap": (["a"], ["b"], 2),
+    "create": (["a"], ["a", "new-{i}"], 2),
+}
+
+
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+def test_update_tags(benchmark, loop, server, client, scenario):
+    current, desired, expected = SCENARIOS[scenario]
+    server.add_tag(1, "a")
+    server.add_tag(1, "b")
+    # Warm the tag index; a cold one costs one extra GET
+    loop.run_until_complete(client.tag_index(1))
+    rounds = itertools.count()
+    wanted: list[str] = []
+
+    def setup():
+        wanted[:] = [tag.format(i=next(rounds)) for tag in desired]
+        te = server.add_time_entry(1, tags=current, duration=60)
+        server.stats.reset()
+        return (TimeEntry.model_validate(server.render_time_entry(te)), wanted), {}
+
+    def retag(te, tags):
+        return loop.run_until_complete(client.update_tags(te, tags))
+
+    result = benchmark.pedantic(retag, setup=setup, rounds=20)
+    benchmark.extra_info["requests"] = server.stats.requests
+    assert server.stats.requests == expected
+    assert sorted(result.tags) == sorted(wanted)
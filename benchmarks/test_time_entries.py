@@ -0,0 +1,71 @@
+"""Time Entry listing: decode on its own, and the whole `get_time_entries()` call"""
+
+# pylint: disable=missing-function-docstring,redefined-outer-name
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from conftest import make_client
+
+from lib_toggl.decode import DecodeMode, decode_time_entries_json
+from lib_toggl.mock_server import MockToggl
+from lib_toggl.time_entries import ENDPOINT
+
+START = datetime(2020, 1, 1, tzinfo=UTC)
+SIZES = [1_000, 10_000, 100_000]
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n}")
+def seeded(request, loop):
+    """A server holding `request.param` entries, one every 15 minutes from START."""
+    server = MockToggl()
+    server.seed_time_entries(
+        request.param,
+        start=START,
+        spacing=timedelta(minutes=15),
+        duration=timedelta(minutes=10),
+    )
+    loop.run_until_complete(server.start())
+    yield server, request.param
+    loop.run_until_complete(server.close())
+
+
+def _range(count: int) -> tuple[datetime, datetime]:
+    return START, START + timedelta(minutes=15) * count
+
+
+@pytest.fixture(scope="module")
+def body(seeded, loop) -> tuple[bytes, int]:
+    """The raw response for the whole seeded range, fetched once."""
+    server, count = seeded
+    client = make_client(server)
+    start, end = _range(count)
+    params = {"start_date": start.isoformat(), "end_date": end.isoformat()}
+    raw = loop.run_until_complete(
+        client.do_get_request(ENDPOINT, data=params, raw=True)
+    )
+    loop.run_until_complete(client.close())
+    return raw, count
+
+
+@pytest.mark.parametrize("mode", list(DecodeMode), ids=lambda m: m.value)
+def test_decode_time_entries(benchmark, body, mode):
+    raw, count = body
+    benchmark.extra_info["entries"] = count
+    benchmark.extra_info["bytes"] = len(raw)
+    entries = benchmark(decode_time_entries_json, raw, mode)
+    assert len(entries) == count
+
+
+def test_get_time_entries(benchmark, seeded, loop):
+    server, count = seeded
+    client = make_client(server)
+    start, end = _range(count)
+    benchmark.extra_info["entries"] = count
+    entries = benchmark.pedantic(
+        lambda: loop.run_until_complete(client.get_time_entries(start, end)),
+        rounds=3 if count >= 100_000 else 10,
+        warmup_rounds=1,
+    )
+    loop.run_until_complete(client.close())
+    assert len(entries) == count
@@ -0,0 +1,262 @@
+"""Duration totals over a `TimeEntryFrame`.
+
+Everything here works a column at a time on the frame's arrays, in a single pass, and never
+materializes `TimeEntry` objects. A month of entries for a large team is summarized in
+milliseconds.
+
+Durations follow what Toggl's own reports do:
+
+- Running entries (negative `duration`) count up to `now`.
+- Deleted entries (`server_deleted_at` set) are skipped.
+- Workspace rounding is applied to each entry's duration, not to the totals.
+  See: https://support.toggl.com/en/articles/2225331-rounding-in-reports
+- Per day and per week totals split entries that cross midnight, in the given time zone.
+  A rounded entry's duration is shared between its days in proportion to the time spent in each.
+"""
+
+import time
+from array import array
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta, tzinfo
+
+from pydantic import BaseModel, Field
+
+from .frame import NULL, TimeEntryFrame
+from .time_entries import TimeEntry
+from .workspace import Workspace
+
+_DAY = 24 * 60 * 60
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+class Rounding(BaseModel):
+    """How durations are rounded, as configured on a workspace."""
+
+    minutes: int = Field(
+        default=0, ge=0, description="Round to this many minutes. 0 disables rounding."
+    )
+
+    direction: int = Field(
+        default=0,
+        ge=-1,
+        le=1,
+        description="-1 rounds down, 0 to the nearest, 1 up. Same values as `Workspace.rounding`.",
+    )
+
+    @classmethod
+    def from_workspace(cls, workspace: Workspace) -> "Rounding":
+        """Rounding configured for `workspace`; none if it isn't set."""
+        if not workspace.rounding_minutes or workspace.rounding is None:
+            return cls()
+        return cls(minutes=workspace.rounding_minutes, direction=workspace.rounding)
+
+    def apply(self, seconds: int) -> int:
+        """Rounds a duration in seconds."""
+        if not self.minutes:
+            return seconds
+        step = self.minutes * 60
+        if self.direction < 0:
+            return seconds - seconds % step
+        if self.direction > 0:
+            return -(-seconds // step) * step
+        return (seconds + step // 2) // step * step
+
+
+class Summary(BaseModel):
+    """Totals in seconds. Entries without a project or tags are counted under None."""
+
+    total: int = 0
+    billable: int = 0
+    entries: int = Field(default=0, description="Entries counted.")
+    running: int = Field(default=0, description="Running entries among them.")
+
+    by_day: dict[date, int] = Field(default_factory=dict)
+    by_week: dict[date, int] = Field(
+        default_factory=dict, description="Keyed by the first day of the week."
+    )
+    by_project: dict[int | None, int] = Field(default_factory=dict)
+    by_tag: dict[str | None, int] = Field(
+        default_factory=dict,
+        description="An entry with several tags counts towards each of them.",
+    )
+    by_billable: dict[bool, int] = Field(default_factory=dict)
+
+
+def _now() -> int:
+    return int(time.time())
+
+
+def effective_durations(
+    frame: TimeEntryFrame, rounding: Rounding | None = None, now: int | None = None
+) -> array:
+    """Duration of every row in seconds, with running entries counted up to `now` and rounding applied.
+
+    Args:
+        frame (TimeEntryFrame): Entries to look at.
+        rounding (Rounding | None, optional): Rounding to apply per entry. Defaults to none.
+        now (int | None, optional): Epoch seconds running entries count up to. Defaults to the current time.
+
+    Returns:
+        array: One int64 per row, in row order.
+    """
+    now = _now() if now is None else now
+    starts = frame.column("start")
+    out = array("q", frame.column("duration"))
+    for i, seconds in enumerate(out):
+        if seconds < 0:
+            start = starts[i]
+            out[i] = max(0, now - start) if start != NULL else 0
+    if rounding is not None and rounding.minutes:
+        apply = rounding.apply
+        for i, seconds in enumerate(out):
+            out[i] = apply(seconds)
+    return out
+
+
+def _fixed_offset(tz: tzinfo) -> int | None:
+    """UTC offset in seconds if `tz` has the same offset all year (UTC, `timezone(...)`), else None."""
+    winter = tz.utcoffset(datetime(2000, 1, 1))
+    summer = tz.utcoffset(datetime(2000, 7, 1))
+    if winter is None or winter != summer:
+        return None
+    return int(winter.total_seconds())
+
+
+def _day_spans(start: int, stop: int, tz: tzinfo, offset: int | None):
+    """Splits the span [start, stop) (epoch seconds) at local midnights. Yields (date, seconds)."""
+    if offset is not None:
+        # Fixed offset: plain integer math, no datetime objects
+        local = start + offset
+        end = stop + offset
+        while True:
+            day = local // _DAY
+            boundary = (day + 1) * _DAY
+            if end <= boundary:
+                yield day, end - local
+                return
+            yield day, boundary - local
+            local = boundary
+
+    current = datetime.fromtimestamp(start, tz)
+    while True:
+        next_day = current.date() + timedelta(days=1)
+        boundary = int(
+            datetime(next_day.year, next_day.month, next_day.day, tzinfo=tz).timestamp()
+        )
+        if stop <= boundary:
+            yield current.date(), stop - int(current.timestamp())
+            return
+        yield current.date(), boundary - int(current.timestamp())
+        current = datetime.fromtimestamp(boundary, tz)
+
+
+def summarize(
+    entries: TimeEntryFrame | Iterable[TimeEntry],
+    rounding: Rounding | None = None,
+    tz: tzinfo = UTC,
+    beginning_of_week: int = 1,
+    now: datetime | None = None,
+) -> Summary:
+    """Totals per day, week, project, tag and billable flag.
+
+    Args:
+        entries (TimeEntryFrame | Iterable[TimeEntry]): Entries to summarize. Lists are converted to a frame.
+        rounding (Rounding | None, optional): Per entry rounding, see `Rounding.from_workspace()`. Defaults to none.
+        tz (tzinfo, optional): Time zone that decides where a day starts. Defaults to UTC.
+        beginning_of_week (int, optional): First day of the week, 0 is Sunday, as in `Account.beginning_of_week`.
+            Defaults to 1, Monday.
+        now (datetime | None, optional): Time running entries count up to. Defaults to the current time.
+
+    Returns:
+        Summary: The totals.
+    """
+    frame = (
+        entries
+        if isinstance(entries, TimeEntryFrame)
+        else TimeEntryFrame.from_entries(entries)
+    )
+    now_epoch = _now() if now is None else int(now.timestamp())
+    raw = effective_durations(frame, now=now_epoch)
+    rounded = raw
+    if rounding is not None and rounding.minutes:
+        rounded = array("q", map(rounding.apply, raw))
+
+    tag_names = frame.tag_names
+    tag_offsets, tag_codes = frame.tag_column()
+    offset = _fixed_offset(tz)
+
+    counted = running = 0
+    by_day: dict = {}
+    by_project: dict[int | None, int] = {}
+    by_tag: dict[str | None, int] = {}
+    by_billable = {True: 0, False: 0}
+
+    rows = zip(
+        range(len(frame)),
+        rounded,
+        raw,
+        frame.column("start"),
+        frame.column("duration"),
+        frame.column("server_deleted_at"),
+        frame.column("project_id"),
+        frame.column("billable"),
+    )
+    for i, seconds, actual, start, duration, deleted, project, billable in rows:
+        if deleted != NULL:
+            continue
+        counted += 1
+        if duration < 0:
+            running += 1
+        by_billable[billable == 1] += seconds
+
+        if project == NULL:
+            project = None
+        by_project[project] = by_project.get(project, 0) + seconds
+
+        lo, hi = tag_offsets[i], tag_offsets[i + 1]
+        if lo == hi:
+            by_tag[None] = by_tag.get(None, 0) + seconds
+        for code in tag_codes[lo:hi]:
+            tag = tag_names[code]
+            by_tag[tag] = by_tag.get(tag, 0) + seconds
+
+        if start == NULL:
+            continue
+        if offset is not None:
+            # Most entries don't cross midnight; skip the generator for those
+            day = (start + offset) // _DAY
+            if start + offset + actual <= (day + 1) * _DAY:
+                by_day[day] = by_day.get(day, 0) + seconds
+                continue
+        spans = _day_spans(start, start + actual, tz, offset)
+        if seconds == actual:
+            for day, part in spans:
+                by_day[day] = by_day.get(day, 0) + part
+            continue
+        # Cumulative shares so the parts add up to exactly the rounded duration
+        elapsed = allocated = 0
+        for day, part in spans:
+            elapsed += part
+            share = elapsed * seconds // actual if actual else seconds
+            by_day[day] = by_day.get(day, 0) + share - allocated
+            allocated = share
+
+    summary = Summary(
+        total=by_billable[True] + by_billable[False],
+        billable=by_billable[True],
+        entries=counted,
+        running=running,
+        by_project=by_project,
+        by_tag=by_tag,
+        by_billable=by_billable,
+    )
+
+    # Day keys are day numbers on the fixed offset path; convert once per day, not per entry
+    week_shift = (beginning_of_week - 1) % 7
+    for day, seconds in sorted(by_day.items()):
+        if not isinstance(day, date):
+            day = _EPOCH_DATE + timedelta(days=day)
+        summary.by_day[day] = summary.by_day.get(day, 0) + seconds
+        week = day - timedelta(days=(day.weekday() - week_shift) % 7)
+        summary.by_week[week] = summary.by_week.get(week, 0) + seconds
+    return summary
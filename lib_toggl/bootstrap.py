@@ -0,0 +1,99 @@
+"""Everything a cold client needs, in one request.
+
+`GET /me?with_related_data=true` returns the account along with the workspaces, tags, projects,
+clients, tasks and recent Time Entries the user can see. `Toggl.bootstrap()` uses it to fill every cache
+at once instead of running `get_account_details`, `get_workspaces`, `get_tags` per workspace and
+`get_current_time_entry` one after the other.
+See: https://engineering.toggl.com/docs/api/me#get-me
+"""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from .account import Account
+from .clients import Client
+from .decode import DecodeMode, decode_time_entry
+from .projects import Project
+from .tags import Tag
+from .tasks import Task
+from .time_entries import TimeEntry
+from .workspace import Workspace
+
+# Query parameters asking /me for the related objects
+RELATED_DATA_PARAMS = {"with_related_data": "true"}
+
+
+class Bootstrap(BaseModel):
+    """What `Toggl.bootstrap()` loaded into the caches."""
+
+    account: Account | None = None
+    workspaces: list[Workspace] = Field(default_factory=list)
+    tags: dict[int, list[Tag]] = Field(
+        default_factory=dict, description="Keyed by workspace ID."
+    )
+    projects: dict[int, list[Project]] | None = Field(
+        default=None, description="Keyed by workspace ID. None if not loaded."
+    )
+    clients: dict[int, list[Client]] | None = Field(
+        default=None, description="Keyed by workspace ID. None if not loaded."
+    )
+    tasks: dict[int, list[Task]] | None = Field(
+        default=None, description="Keyed by workspace ID. None if not loaded."
+    )
+    current_time_entry: TimeEntry | None = None
+    has_time_entries: bool = Field(
+        default=False,
+        description="True if the running Time Entry was looked up; `current_time_entry` is only meaningful then.",
+    )
+    related_data: bool = Field(
+        default=False,
+        description="True if everything came from the one /me request, False if the fallback ran.",
+    )
+
+
+def _by_workspace(
+    model: type[Any], items: list[dict[str, Any]] | None, workspace_ids: list[int]
+) -> dict[int, list[Any]] | None:
+    if items is None:
+        return None
+    grouped: dict[int, list[Any]] = {x: [] for x in workspace_ids}
+    for x in items:
+        item = model.model_validate(x)
+        grouped.setdefault(item.workspace_id, []).append(item)
+    return grouped
+
+
+def parse_related_data(
+    data: dict[str, Any], mode: DecodeMode = DecodeMode.VALIDATE
+) -> Bootstrap | None:
+    """Builds a `Bootstrap` from a /me?with_related_data=true response.
+
+    Args:
+        data (dict[str, Any]): Decoded response body.
+        mode (DecodeMode, optional): How the Time Entries are decoded. Defaults to DecodeMode.VALIDATE.
+
+    Returns:
+        Bootstrap | None: None if the response came without related data.
+    """
+    if data.get("workspaces") is None:
+        return None
+    workspaces = [Workspace(**x) for x in data["workspaces"]]
+    workspace_ids = [ws.id for ws in workspaces if ws.id is not None]
+    current = None
+    for x in data.get("time_entries") or ():
+        # Only one entry can be running at a time
+        if x.get("duration", 0) < 0 and x.get("server_deleted_at") is None:
+            current = decode_time_entry(x, mode)
+            break
+    return Bootstrap(
+        account=Account(**data),
+        workspaces=workspaces,
+        tags=_by_workspace(Tag, data.get("tags") or [], workspace_ids) or {},
+        projects=_by_workspace(Project, data.get("projects"), workspace_ids),
+        clients=_by_workspace(Client, data.get("clients"), workspace_ids),
+        tasks=_by_workspace(Task, data.get("tasks"), workspace_ids),
+        current_time_entry=current,
+        has_time_entries="time_entries" in data,
+        related_data=True,
+    )
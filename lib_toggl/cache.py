@@ -0,0 +1,298 @@
+"""Small in-memory caches used by the client."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any, NamedTuple, Protocol
+
+from pydantic import BaseModel, Field
+
+from .const import (
+    ACCOUNT_CACHE_STALE_SECONDS,
+    ACCOUNT_CACHE_TTL_SECONDS,
+    CURRENT_TIME_ENTRY_CACHE_STALE_SECONDS,
+    CURRENT_TIME_ENTRY_CACHE_TTL_SECONDS,
+    WORKSPACES_CACHE_STALE_SECONDS,
+    WORKSPACES_CACHE_TTL_SECONDS,
+)
+from .tags import Tag
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size bounded LRU cache where every entry also expires after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value); order is least to most recently used
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value, or `default` if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores `value`, evicting the least recently used entry if full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes and returns the value for `key`, expired or not."""
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        """Drops everything."""
+        self._data.clear()
+
+
+class TagIndex:
+    """Name <-> ID lookup for the Tags in one workspace."""
+
+    __slots__ = ("by_id", "by_name", "workspace_id")
+
+    def __init__(self, workspace_id: int, tags: Iterable[Tag] = ()) -> None:
+        self.workspace_id = workspace_id
+        self.by_name: dict[str, int] = {}
+        self.by_id: dict[int, str] = {}
+        for tag in tags:
+            self.add(tag)
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def add(self, tag: Tag) -> None:
+        """Adds or renames a tag. Tags without a name or ID are ignored."""
+        if tag.name is None or tag.id is None:
+            return
+        old_name = self.by_id.get(tag.id)
+        if old_name is not None and old_name != tag.name:
+            self.by_name.pop(old_name, None)
+        self.by_name[tag.name] = tag.id
+        self.by_id[tag.id] = tag.name
+
+    def remove(self, tag_id: int) -> None:
+        """Forgets a tag by ID."""
+        name = self.by_id.pop(tag_id, None)
+        if name is not None:
+            self.by_name.pop(name, None)
+
+
+class _Named(Protocol):
+    id: int
+    name: str
+
+
+class NamedIndex[T: _Named]:
+    """ID -> object and name -> ID lookup for the Projects, Clients or Tasks of one workspace.
+
+    Task names are only unique within a Project; `by_name` keeps the last one seen.
+    """
+
+    __slots__ = ("by_id", "by_name", "workspace_id")
+
+    def __init__(self, workspace_id: int, items: Iterable[T] = ()) -> None:
+        self.workspace_id = workspace_id
+        self.by_id: dict[int, T] = {}
+        self.by_name: dict[str, int] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def add(self, item: T) -> None:
+        """Adds or replaces an item. Deleted items are dropped instead."""
+        if getattr(item, "server_deleted_at", None) is not None:
+            self.remove(item.id)
+            return
+        old = self.by_id.get(item.id)
+        if old is not None and old.name != item.name:
+            self.by_name.pop(old.name, None)
+        self.by_id[item.id] = item
+        self.by_name[item.name] = item.id
+
+    def remove(self, item_id: int) -> None:
+        """Forgets an item by ID."""
+        old = self.by_id.pop(item_id, None)
+        if old is not None and self.by_name.get(old.name) == item_id:
+            del self.by_name[old.name]
+
+    def get(self, item_id: int | None) -> T | None:
+        """The item with that ID, None if unknown (or `item_id` is None)."""
+        return None if item_id is None else self.by_id.get(item_id)
+
+    def name(self, item_id: int | None) -> str | None:
+        """Name of the item with that ID, None if unknown."""
+        item = self.get(item_id)
+        return None if item is None else item.name
+
+
+class EntryNames(NamedTuple):
+    """Names behind a Time Entry's project_id, its project's client_id and task_id."""
+
+    project: str | None
+    client: str | None
+    task: str | None
+
+
+class Freshness(BaseModel):
+    """How long a cached value may be served."""
+
+    ttl: float = Field(
+        ge=0, description="Seconds a value is served without refreshing."
+    )
+
+    stale: float = Field(
+        default=0,
+        ge=0,
+        description="Seconds after `ttl` the old value is still served while a refresh runs in the background.",
+    )
+
+
+class CachePolicy(BaseModel):
+    """Freshness of each cached `Toggl` property."""
+
+    account: Freshness = Field(
+        default=Freshness(
+            ttl=ACCOUNT_CACHE_TTL_SECONDS, stale=ACCOUNT_CACHE_STALE_SECONDS
+        )
+    )
+
+    workspaces: Freshness = Field(
+        default=Freshness(
+            ttl=WORKSPACES_CACHE_TTL_SECONDS, stale=WORKSPACES_CACHE_STALE_SECONDS
+        )
+    )
+
+    current_time_entry: Freshness = Field(
+        default=Freshness(
+            ttl=CURRENT_TIME_ENTRY_CACHE_TTL_SECONDS,
+            stale=CURRENT_TIME_ENTRY_CACHE_STALE_SECONDS,
+        )
+    )
+
+
+class RefreshingValue:
+    """A single cached value with a TTL and a stale-while-revalidate window.
+
+    `None` is a perfectly good value (e.g. "no time entry is running") so whether we have a
+        value is tracked separately.
+    """
+
+    def __init__(
+        self, fetch: Callable[[], Awaitable[Any]], freshness: Freshness
+    ) -> None:
+        self._fetch = fetch
+        self.freshness = freshness
+        self._value: Any = None
+        self._has_value = False
+        self._fetched_at = 0.0
+        self._refresh: asyncio.Future | None = None
+        self._background: asyncio.Future | None = None
+        # Bumped by every set()/invalidate() so a fetch that started before a local write
+        #   can't overwrite the newer value when it lands.
+        self._generation = 0
+        self._refresh_generation = 0
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the value was stored, None if there is no value."""
+        if not self._has_value:
+            return None
+        return time.monotonic() - self._fetched_at
+
+    @property
+    def has_value(self) -> bool:
+        """True if a value is stored, however old; False before the first fetch and after `invalidate()`."""
+        return self._has_value
+
+    def peek(self) -> Any:
+        """The cached value, however old, without fetching anything."""
+        return self._value
+
+    def set(self, value: Any, age: float = 0.0) -> None:
+        """Stores a value we know to be current, e.g. one the server just returned from a write.
+
+        Pass `age` for a value that was fetched a while ago, e.g. one loaded from disk.
+        """
+        self._value = value
+        self._has_value = True
+        self._fetched_at = time.monotonic() - age
+        self._generation += 1
+
+    def invalidate(self) -> None:
+        """Forgets the value; the next `get()` waits for a fresh one."""
+        self._value = None
+        self._has_value = False
+        self._generation += 1
+
+    async def refresh(self) -> Any:
+        """Fetches and stores a new value. Concurrent refreshes share one fetch."""
+        if self._refresh is None or self._refresh.done():
+            self._refresh_generation = self._generation
+            self._refresh = asyncio.ensure_future(self._fetch())
+        generation = self._refresh_generation
+        value = await asyncio.shield(self._refresh)
+        if self._generation == generation:
+            self.set(value)
+            return value
+        # Something was written while we were fetching; that is newer than what we got
+        return self._value if self._has_value else value
+
+    def _refresh_in_background(self) -> None:
+        if self._background is not None and not self._background.done():
+            return
+
+        async def _run():
+            try:
+                await self.refresh()
+            # Serving stale data beats surfacing an error nobody is waiting for
+            # pylint: disable-next=broad-except
+            except Exception as exc:
+                log.warning("background refresh failed", exc_info=exc)
+
+        self._background = asyncio.ensure_future(_run())
+
+    async def get(self) -> Any:
+        """Returns the cached value, fetching or refreshing it as the freshness policy requires."""
+        age = self.age
+        if age is None or age >= self.freshness.ttl + self.freshness.stale:
+            return await self.refresh()
+        if age >= self.freshness.ttl:
+            self._refresh_in_background()
+        return self._value
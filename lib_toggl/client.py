@@ -2,21 +2,72 @@
 Very basic Toggl API wrapper
 """
 
-from datetime import UTC, datetime
-from typing import Any, List
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, List
 
 import aiohttp
 from pyrfc3339 import generate
 
 from .account import ENDPOINT as ACCOUNT_ENDPOINT
 from .account import Account
-from .const import USER_AGENT
+from .bootstrap import RELATED_DATA_PARAMS, Bootstrap, parse_related_data
+from .cache import (
+    CachePolicy,
+    EntryNames,
+    NamedIndex,
+    RefreshingValue,
+    TagIndex,
+    TTLCache,
+)
+from .clients import CLIENTS_ENDPOINT, Client
+from .codec import JsonCodec, default_codec, dump_model
+from .const import (
+    API_ROOT,
+    BASE,
+    BULK_EDIT_MAX_IDS,
+    DEFAULT_CATALOG_CACHE_TTL_SECONDS,
+    DEFAULT_TAG_CACHE_SIZE,
+    DEFAULT_TAG_CACHE_TTL_SECONDS,
+    DEFAULT_TIME_ENTRY_WINDOW_DAYS,
+    LISTING_PAGE_SIZE,
+    QUOTA_REMAINING_HEADER,
+    QUOTA_RESETS_IN_HEADER,
+    USER_AGENT,
+)
+from .decode import DecodeMode, decode_time_entries_json, decode_time_entry_json
+from .frame import TimeEntryFrame
+from .instrumentation import (
+    DecodeTiming,
+    Instrumentation,
+    RateLimitWait,
+    RequestTimer,
+    RetryEvent,
+    current_operation,
+    instrumented,
+)
+from .log_payloads import debug_payload, payloads_enabled
+from .pool import ConnectionPool, PoolMetrics
+from .prefetch import prefetched_pages
+from .projects import PROJECTS_ENDPOINT, Project
+from .ratelimit import LeakyBucket, RetryPolicy, bucket_for_token, parse_retry_after
+from .store import LocalStore
+from .sync import SyncState, TimeEntryChanges, apply_changes
+from .tag_update import TagUpdatePlan, plan_tag_update
 from .tags import TAGS_ENDPOINT, Tag
+from .tasks import TASKS_ENDPOINT, Task
+from .time_entries import BULK_EDIT_ENDPOINT as TIME_ENTRY_BULK_EDIT_ENDPOINT
 from .time_entries import CREATE_ENDPOINT as TIME_ENTRY_CREATE_ENDPOINT
 from .time_entries import EDIT_ENDPOINT as TIME_ENTRY_EDIT_ENDPOINT
 from .time_entries import ENDPOINT as TIME_ENTRY_ENDPOINT
 from .time_entries import (
     EXPLICIT_ENDPOINT,
+    BulkEditFailure,
+    BulkEditResult,
+    PatchOperation,
     TimeEntry,
     validate_time_entry_id,
     validate_workspace_id,
@@ -25,6 +76,9 @@ from .time_entries import STOP_ENDPOINT as TIME_ENTRY_STOP_ENDPOINT
 from .workspace import ENDPOINT as WORKSPACE_ENDPOINT
 from .workspace import Workspace
 
+if TYPE_CHECKING:
+    from .webhooks import WebhookEvent
+
 # Try structlog (available in dev context), fall back to stdlib logging
 try:
     import structlog
@@ -36,6 +90,9 @@ except ImportError:
 
     log = logging.getLogger(__name__)
 
+# Verbs that can be replayed without side effects if the first attempt may have reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "PATCH", "DELETE"})
+
 
 # pylint: disable=too-many-instance-attributes
 class Toggl:
@@ -60,13 +117,111 @@ class Toggl:
     # default API user agent value
     _user_agent = USER_AGENT
 
-    def __init__(self, api_key: str | None) -> None:
-        self.headers = {}
-        self._session = aiohttp.ClientSession()
+    def __init__(
+        self,
+        api_key: str | None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: LeakyBucket | None = None,
+        session: aiohttp.ClientSession | None = None,
+        pool: ConnectionPool | None = None,
+        tag_cache: TTLCache | None = None,
+        cache_policy: CachePolicy | None = None,
+        decode_mode: DecodeMode = DecodeMode.VALIDATE,
+        json_codec: JsonCodec | None = None,
+        store: LocalStore | None = None,
+        base_url: str | None = None,
+        instrumentation: Instrumentation | None = None,
+    ) -> None:
+        """
+        Args:
+            api_key (str | None): Toggl API token.
+            retry_policy (RetryPolicy | None, optional): How transient failures are retried. Defaults to RetryPolicy().
+            rate_limiter (LeakyBucket | None, optional): Bucket to pace requests with. Defaults to the bucket shared
+                by every client using the same API token.
+            session (aiohttp.ClientSession | None, optional): Externally managed session to use. It is never closed
+                by the client.
+            pool (ConnectionPool | None, optional): Pool to share sockets, DNS cache and TLS sessions with other
+                clients. It is never closed by the client. If neither `session` nor `pool` is given, the client
+                gets a private pool that is closed along with it.
+            tag_cache (TTLCache | None, optional): Cache of per-workspace TagIndex objects. Defaults to one sized by
+                DEFAULT_TAG_CACHE_SIZE and DEFAULT_TAG_CACHE_TTL_SECONDS.
+            cache_policy (CachePolicy | None, optional): TTL and stale-while-revalidate windows for the
+                `account`, `workspaces` and `current_time_entry` properties. Defaults to CachePolicy().
+            decode_mode (DecodeMode, optional): How Time Entry responses are decoded. DecodeMode.TRUSTED skips
+                pydantic validation for server payloads, see `lib_toggl.decode`. Defaults to DecodeMode.VALIDATE.
+            json_codec (JsonCodec | None, optional): Encodes request bodies and decodes responses that aren't
+                validated by pydantic directly. Defaults to the fastest installed one, see `default_codec()`.
+            store (LocalStore | None, optional): Local mirror to read through and write through. It is never
+                closed by the client. See `lib_toggl.store`. Defaults to None.
+            base_url (str | None, optional): API root to send requests to instead of the real one, e.g. a
+                `lib_toggl.mock_server.MockToggl`. Requests for the webhooks and reports APIs go to the
+                same host. Defaults to None.
+            instrumentation (Instrumentation | None, optional): Receives request timings, decode times, retries
+                and rate limit waits, per operation. See `lib_toggl.instrumentation`. Defaults to none.
+        """
+        if session is not None and pool is not None:
+            raise ValueError("Pass either session or pool, not both.")
 
-        self._account: Account | None = None
-        self._current_time_entry: TimeEntry | None = None
-        self._workspaces: List[Workspace] | None = None
+        self.headers = {}
+        # Created lazily in _pre_flight_check(); aiohttp wants a running event loop
+        self._session: aiohttp.ClientSession | None = session
+        self._external_session = session is not None
+        self._owns_pool = session is None and pool is None
+        self._pool = ConnectionPool() if self._owns_pool else pool
+
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._base_url = base_url.rstrip("/") if base_url else None
+        # The webhooks and reports APIs live next to /api/v9 on the same host
+        self._api_root = (
+            self._base_url.removesuffix(BASE[len(API_ROOT) :])
+            if self._base_url
+            else None
+        )
+        self._instrumentation = instrumentation or Instrumentation()
+        self.decode_mode = DecodeMode(decode_mode)
+        self._codec = json_codec or default_codec()
+        # An explicitly passed bucket wins, otherwise the api_key setter picks the per-token one
+        self._custom_rate_limiter = rate_limiter
+        self._rate_limiter = rate_limiter or LeakyBucket()
+
+        cache_policy = cache_policy or CachePolicy()
+        self._account = RefreshingValue(
+            self._fetch_account_details, cache_policy.account
+        )
+        self._workspaces = RefreshingValue(
+            self._fetch_workspaces, cache_policy.workspaces
+        )
+        self._current_time_entry = RefreshingValue(
+            self._fetch_current_time_entry, cache_policy.current_time_entry
+        )
+        # Not `or`; an empty cache is falsy
+        if tag_cache is None:
+            tag_cache = TTLCache(
+                maxsize=DEFAULT_TAG_CACHE_SIZE, ttl=DEFAULT_TAG_CACHE_TTL_SECONDS
+            )
+        self._tag_cache = tag_cache
+        # Per-workspace NamedIndex objects for Projects, Clients and Tasks
+        self._project_cache = TTLCache(
+            maxsize=tag_cache.maxsize, ttl=DEFAULT_CATALOG_CACHE_TTL_SECONDS
+        )
+        self._client_cache = TTLCache(
+            maxsize=tag_cache.maxsize, ttl=DEFAULT_CATALOG_CACHE_TTL_SECONDS
+        )
+        self._task_cache = TTLCache(
+            maxsize=tag_cache.maxsize, ttl=DEFAULT_CATALOG_CACHE_TTL_SECONDS
+        )
+        self._store = store
+        if store is not None:
+            # Cold start: whatever the last process fetched, as old as it really is
+            stored = store.workspaces()
+            if stored is not None:
+                self._workspaces.set(*stored)
+        # Single-flight GETs, keyed by URL + query params
+        self._inflight_gets: dict[tuple, asyncio.Future] = {}
+        # Per-workspace high-water marks for sync_time_entries()
+        self._sync_state: dict[int, SyncState] = {}
+        # Told about the running Time Entry after every confirmed write, see add_write_listener()
+        self._write_listeners: list[Callable[[TimeEntry | None], None]] = []
 
         self._auth = None
 
@@ -83,13 +238,22 @@ class Toggl:
         return self
 
     async def __aexit__(self, *excinfo):
-        await self._session.close()
+        await self.close()
 
     async def close(self) -> None:
-        """Closes the underlying aiohttp session.
+        """Closes the underlying aiohttp session if this client owns it.
 
+        Injected sessions and shared pools are left open for their owner to close.
         Needed when not using with X as Y context manager pattern."""
-        await self._session.close()
+        if self._owns_pool and self._pool is not None:
+            await self._pool.close()
+
+    @property
+    def pool_metrics(self) -> PoolMetrics | None:
+        """Connection pool counters, None when using an injected session."""
+        if self._pool is None:
+            return None
+        return self._pool.metrics
 
     @property
     def api_key(self) -> str | None:
@@ -112,155 +276,488 @@ class Toggl:
         self._auth = aiohttp.BasicAuth(
             login=self._api_key, password="api_token", encoding="utf-8"
         )
+        if self._custom_rate_limiter is None:
+            self._rate_limiter = bucket_for_token(value)
 
     @property
     async def account(self) -> Account | None:
-        """Toggle Account details."""
-        if self._account is None:
-            self._account = await self.get_account_details()
-        return self._account
+        """Toggle Account details. Cached, see CachePolicy."""
+        return await self._account.get()
 
     @property
     async def workspaces(self) -> List[Workspace] | None:
-        """List of Workspaces the user has access to."""
-        if self._workspaces is None:
-            self._workspaces = await self.get_workspaces()
-        return self._workspaces
+        """List of Workspaces the user has access to. Cached, see CachePolicy."""
+        return await self._workspaces.get()
 
     @property
     async def current_time_entry(self) -> TimeEntry | None:
-        """Currently running Time Entry, if one exists."""
-        if self._current_time_entry is None:
-            self._current_time_entry = await self.get_current_time_entry()
-        return self._current_time_entry
+        """Currently running Time Entry, if one exists.
+
+        Cached, see CachePolicy. Creating, stopping and editing Time Entries through this client
+            keeps the cached value in step without another request.
+        """
+        return await self._current_time_entry.get()
+
+    def invalidate_cache(self) -> None:
+        """Forgets the cached account, workspaces, running Time Entry, tags, projects, clients and tasks."""
+        self._account.invalidate()
+        self._workspaces.invalidate()
+        self._current_time_entry.invalidate()
+        self.invalidate_tags()
+        self._project_cache.clear()
+        self._client_cache.clear()
+        self._task_cache.clear()
+
+    def _remember_time_entry(self, te: TimeEntry | None) -> None:
+        """Applies a write the server just confirmed to the caches and the local store."""
+        if te is None:
+            return
+        self._track_current_time_entry(te)
+        if self._store is not None:
+            self._store.put_time_entries([te])
+
+    def _track_current_time_entry(self, te: TimeEntry | None) -> None:
+        """Keeps the cached running Time Entry in step with a write the server just confirmed."""
+        if te is None:
+            return
+        if te.stop is None and te.duration < 0:
+            # Only one entry can run at a time; starting one stops any other
+            self._current_time_entry.set(te)
+        else:
+            current = self._current_time_entry.peek()
+            if current is not None and current.id == te.id:
+                self._current_time_entry.set(None)
+        self._notify_write_listeners(te)
+
+    def _notify_write_listeners(self, written: TimeEntry | None) -> None:
+        if self._current_time_entry.has_value:
+            current = self._current_time_entry.peek()
+        elif written is not None:
+            # Nothing is known about what runs (e.g. after invalidate_cache()), so listeners get the
+            #   stopped entry that was written and work out what it means for what they have seen
+            current = written
+        else:
+            return
+        for listener in list(self._write_listeners):
+            listener(current)
+
+    def apply_webhook_event(self, event: "WebhookEvent") -> None:
+        """Applies a change Toggl pushed through a webhook to the caches and the local store.
+
+        Time Entries update the running entry (and tell write listeners, see `add_write_listener()`);
+            Tags, Projects, Clients and Tasks update their workspace's index if it is cached.
+            Time Entries of other users, which workspace wide subscriptions deliver too, are
+            skipped, as are all Time Entries while the account isn't cached to tell them apart.
+
+        Args:
+            event (WebhookEvent): Event from `lib_toggl.webhooks.WebhookReceiver`.
+
+        Raises:
+            pydantic.ValidationError: If the payload doesn't fit its model.
+        """
+        if event.is_ping or event.entity_id is None:
+            return
+        deleted = event.action == "deleted"
+        workspace_id = event.metadata.workspace_id  # pyright: ignore
+        if event.model == "time_entry":
+            me = self._account.peek()
+            if me is None or event.payload.get("user_id") != me.id:
+                log.debug("skipping webhook event for a Time Entry that isn't ours")
+                return
+            if not deleted:
+                self._remember_time_entry(event.entity())  # pyright: ignore
+                return
+            current = self._current_time_entry.peek()
+            if current is not None and current.id == event.entity_id:
+                self._current_time_entry.set(None)
+            if self._store is not None:
+                self._store.delete_time_entries([event.entity_id])
+            self._notify_write_listeners(None)
+            return
+
+        cache = {
+            "tag": self._tag_cache,
+            "project": self._project_cache,
+            "client": self._client_cache,
+            "task": self._task_cache,
+        }.get(event.model or "")
+        index = None if cache is None else cache.get(workspace_id)
+        if index is None:
+            # Not cached, nothing to keep in step
+            return
+        if deleted:
+            index.remove(event.entity_id)
+            return
+        entity = event.entity()
+        index.add(entity)
+        if isinstance(entity, Tag) and self._store is not None:
+            self._store.put_tag(entity)
+
+    def add_write_listener(
+        self, listener: Callable[[TimeEntry | None], None]
+    ) -> Callable[[], None]:
+        """Calls `listener` after every Time Entry write the server confirms.
+
+        It is passed the running Time Entry as cached after the write (None if nothing runs) and
+            must not block. Used by `lib_toggl.poller` to poll sooner after local changes. If the
+            running entry isn't cached (e.g. after `invalidate_cache()`) and the write left an entry
+            stopped, it is passed that stopped entry instead.
+
+        Args:
+            listener (Callable[[TimeEntry | None], None]): Called with the running Time Entry, or
+                the stopped one that was written.
+
+        Returns:
+            Callable[[], None]: Removes the listener again.
+        """
+        self._write_listeners.append(listener)
+
+        def remove() -> None:
+            if listener in self._write_listeners:
+                self._write_listeners.remove(listener)
+
+        return remove
 
     async def _pre_flight_check(self):
         """Common pre-request checks"""
         if self._api_key is None:
             raise ValueError("api_key must be set before making requests.")
 
-        if self._session.closed:
-            log.error("session is closed, creating new session")
-            self._session = aiohttp.ClientSession()
+        if self._external_session:
+            if self._session is None or self._session.closed:
+                raise RuntimeError("The injected aiohttp session is closed.")
+        elif self._pool is not None:
+            # The pool hands out the same session to every client and replaces it if closed
+            self._session = self._pool.get_session()
 
         # Merge common headers with instance specific headers
         self.headers.update(self._headers)
 
+    def _observe_quota(self, headers) -> None:
+        """Pauses the shared bucket if the response says the hourly quota is used up."""
+        resets_in = parse_retry_after(headers.get(QUOTA_RESETS_IN_HEADER))
+        remaining = headers.get(QUOTA_REMAINING_HEADER)
+        if resets_in is not None and remaining is not None and remaining.strip() == "0":
+            log.warning("Toggl API quota exhausted, pausing for %ss", resets_in)
+            self._rate_limiter.pause_for(resets_in)
+
+    def _retry_delay(
+        self, idempotent: bool, resp: aiohttp.ClientResponse, attempt: int
+    ) -> float | None:
+        """Decides if a failed response should be retried and how long to wait first.
+
+        Returns None when the error should be raised to the caller.
+        """
+        if attempt >= self._retry_policy.max_retries:
+            return None
+
+        # 402 is how Toggl reports an exhausted quota; only worth waiting for if it resets soon.
+        if resp.status == 402:
+            resets_in = parse_retry_after(resp.headers.get(QUOTA_RESETS_IN_HEADER))
+            if resets_in is None or resets_in > self._retry_policy.backoff_max:
+                return None
+            self._rate_limiter.pause_for(resets_in)
+            return resets_in
+
+        if resp.status not in self._retry_policy.retry_statuses:
+            return None
+
+        # A 429 means the request was rejected before being processed, so it's safe to replay
+        #   anything. A 5xx might have been processed; don't create duplicates with a POST.
+        if resp.status != 429 and not idempotent:
+            return None
+
+        delay = self._retry_policy.backoff(attempt)
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if retry_after is not None:
+            if retry_after > self._retry_policy.backoff_max:
+                return None
+            delay = max(delay, retry_after)
+
+        if resp.status == 429:
+            # Everybody sharing this token needs to back off, not just us
+            self._rate_limiter.pause_for(delay)
+        return delay
+
+    async def do_request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        data: str | bytes | None = None,
+        raw: bool = False,
+        response_headers: dict[str, str] | None = None,
+        idempotent: bool | None = None,
+    ) -> Any:
+        """Sends a request through the shared rate limiter, retrying transient failures.
+
+        429 and 5xx responses and dropped connections are retried with jittered exponential
+            backoff, honoring `Retry-After` and Toggl quota headers.
+        Non-idempotent requests (POST) are only replayed when the server says it did not process them.
+
+        Args:
+            method (str): HTTP verb.
+            url (str): URL to send the request to.
+            params (dict | None, optional): Query parameters. Defaults to None.
+            data (str | bytes | None, optional): JSON encoded request body. Defaults to None.
+            raw (bool, optional): Return the response body as bytes instead of decoding it. Defaults to False.
+            response_headers (dict[str, str] | None, optional): Filled with the headers of the successful
+                response, e.g. to read pagination cursors. Defaults to None.
+            idempotent (bool | None, optional): Whether the request may be replayed if it might have reached
+                the server, e.g. True for a POST that only reads. Defaults to deciding by method.
+
+        Raises:
+            aiohttp.ClientResponseError: If the server responds with an error status code and retries are exhausted.
+            aiohttp.ClientConnectionError: If the connection fails and retries are exhausted.
+
+        Returns:
+            Any: The decoded JSON response, or the body as bytes if `raw`.
+        """
+        await self._pre_flight_check()
+        if self._base_url is not None:
+            if url.startswith(BASE):
+                url = self._base_url + url[len(BASE) :]
+            elif url.startswith(API_ROOT):
+                url = self._api_root + url[len(API_ROOT) :]  # pyright: ignore
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        instrumentation = self._instrumentation
+        attempt = 0
+        while True:
+            waited = await self._rate_limiter.acquire()
+            timer = None
+            if instrumentation.enabled:
+                if waited > 0:
+                    instrumentation.on_rate_limit_wait(
+                        RateLimitWait(operation=current_operation(), seconds=waited)
+                    )
+                timer = RequestTimer(method, url, attempt)
+            try:
+                async with self._session.request(
+                    method,
+                    url,
+                    headers=self.headers,
+                    auth=self._auth,
+                    params=params,
+                    data=data,
+                    trace_request_ctx=timer,
+                ) as resp:
+                    if timer is not None:
+                        timer.headers_received(resp.status)
+                    self._observe_quota(resp.headers)
+                    if resp.status < 400:
+                        body = await resp.read()
+                        if response_headers is not None:
+                            response_headers.update(resp.headers)
+                        if timer is not None:
+                            instrumentation.on_request(timer.finish(len(body)))
+                        return body if raw else self._decode_body(body)
+                    if timer is not None:
+                        instrumentation.on_request(timer.finish())
+                    delay = self._retry_delay(idempotent, resp, attempt)
+                    if delay is None:
+                        if payloads_enabled(log):
+                            debug_payload(log, "here is resp", resp=await resp.read())
+                        resp.raise_for_status()
+                    reason = str(resp.status)
+                    log.info(
+                        "%s %s got %s, retrying in %.2fs",
+                        method,
+                        url,
+                        resp.status,
+                        delay,
+                    )
+            except (aiohttp.ClientConnectionError, TimeoutError) as exc:
+                if timer is not None:
+                    instrumentation.on_request(timer.finish(error=exc))
+                if not idempotent or attempt >= self._retry_policy.max_retries:
+                    raise
+                delay = self._retry_policy.backoff(attempt)
+                reason = type(exc).__name__
+                log.info(
+                    "%s %s failed (%s), retrying in %.2fs", method, url, exc, delay
+                )
+            if instrumentation.enabled:
+                instrumentation.on_retry(
+                    RetryEvent(
+                        operation=current_operation(),
+                        method=method,
+                        url=url.split("?", 1)[0],
+                        attempt=attempt,
+                        reason=reason,
+                        delay=delay,
+                    )
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _decode_body(self, body: bytes) -> Any:
+        """Decodes a response body with the codec, timing it if instrumentation is on."""
+        if not self._instrumentation.enabled:
+            return self._codec.loads(body)
+        started = time.perf_counter()
+        decoded = self._codec.loads(body)
+        self._instrumentation.on_decode(
+            DecodeTiming(
+                operation=current_operation(),
+                mode=self._codec.name,
+                bytes=len(body),
+                items=len(decoded) if isinstance(decoded, list) else None,
+                seconds=time.perf_counter() - started,
+            )
+        )
+        return decoded
+
+    def _decode_time_entry(self, raw: bytes | None) -> TimeEntry | None:
+        """`decode_time_entry_json()` with this client's settings, timed if instrumentation is on."""
+        if not self._instrumentation.enabled:
+            return decode_time_entry_json(raw, self.decode_mode, self._codec)
+        started = time.perf_counter()
+        te = decode_time_entry_json(raw, self.decode_mode, self._codec)
+        self._instrumentation.on_decode(
+            DecodeTiming(
+                operation=current_operation(),
+                mode=self.decode_mode.value,
+                bytes=len(raw or b""),
+                items=int(te is not None),
+                seconds=time.perf_counter() - started,
+            )
+        )
+        return te
+
+    def _decode_time_entries(self, raw: bytes | None) -> list[TimeEntry]:
+        """`decode_time_entries_json()` with this client's settings, timed if instrumentation is on."""
+        if not self._instrumentation.enabled:
+            return decode_time_entries_json(raw, self.decode_mode, self._codec)
+        started = time.perf_counter()
+        entries = decode_time_entries_json(raw, self.decode_mode, self._codec)
+        self._instrumentation.on_decode(
+            DecodeTiming(
+                operation=current_operation(),
+                mode=self.decode_mode.value,
+                bytes=len(raw or b""),
+                items=len(entries),
+                seconds=time.perf_counter() - started,
+            )
+        )
+        return entries
+
     async def do_get_request(
-        self, url: str, data: dict | None = None
-    ) -> dict[str, Any]:
+        self, url: str, data: dict | None = None, raw: bool = False
+    ) -> Any:
         """Does a GET request to the specified URL.
 
         Args:
             url (str): URL to send the GET request to.
             data (dict | None, optional): A dictionary to be passed as query parameters. Defaults to None.
+            raw (bool, optional): Return the response body as bytes instead of decoding it. Defaults to False.
 
         Returns:
             Response: The server's response to the GET request.
         """
-
-        await self._pre_flight_check()
-        log.debug("do_get_request", extra={"data": data})
-        # TODO: error handling, lots of ways network/json parse can fail...
-        async with self._session.get(
-            url, headers=self.headers, auth=self._auth, params=data
-        ) as resp:
-            if resp.status != 200:
-                log.debug("here is resp", extra={"resp": await resp.text()})
-                resp.raise_for_status()
-            return await resp.json()
-
-    async def do_post_request(self, url: str, data_as_json_str: str) -> dict[str, Any]:
+        debug_payload(log, "do_get_request", data=data)
+        # Single-flight: concurrent callers asking for the same thing share one request.
+        # Callers get the same decoded object back so it must be treated as read-only.
+        key = (url, tuple(sorted((data or {}).items())), raw)
+        task = self._inflight_gets.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self.do_request("GET", url, params=data, raw=raw)
+            )
+            self._inflight_gets[key] = task
+            task.add_done_callback(lambda t: self._get_done(key, t))
+        else:
+            log.debug("do_get_request joining in-flight request", extra={"url": url})
+        # Shield so one caller being cancelled doesn't cancel the request for everybody else
+        return await asyncio.shield(task)
+
+    def _get_done(self, key: tuple, task: asyncio.Future) -> None:
+        """Forgets a finished single-flight GET."""
+        if self._inflight_gets.get(key) is task:
+            del self._inflight_gets[key]
+        # If every caller was cancelled nobody retrieves the error; do it so asyncio doesn't complain
+        if not task.cancelled():
+            task.exception()
+
+    async def do_post_request(
+        self, url: str, data_as_json_str: str | bytes, raw: bool = False
+    ) -> Any:
         """Does a POST request to the specified URL.
 
         Args:
             url (str): URL to send the POST request to.
-            data_as_json_str (str): String encoded JSON data. Not using built-in json kwarg because we need to use the json encoder in pydantic so we can exclude None values.
+            data_as_json_str (str | bytes): JSON encoded data. Not using built-in json kwarg because we need to use the json encoder in pydantic so we can exclude None values.
+            raw (bool, optional): Return the response body as bytes instead of decoding it. Defaults to False.
 
         Returns:
             Response: The server's response to the POST request.
         """
-
-        await self._pre_flight_check()
-
-        log.debug("do_post_request", extra={"data": data_as_json_str})
-        # TODO: error handling, lots of ways network/json parse can fail...
-        async with self._session.post(
-            url, headers=self.headers, auth=self._auth, data=data_as_json_str
-        ) as resp:
-            if resp.status != 200:
-                log.debug("here is resp", extra={"resp": await resp.text()})
-                resp.raise_for_status()
-            return await resp.json()
+        debug_payload(log, "do_post_request", data=data_as_json_str)
+        return await self.do_request("POST", url, data=data_as_json_str, raw=raw)
 
     async def do_patch_request(
-        self, url: str, data: dict | None = None
-    ) -> dict[str, Any]:
+        self, url: str, data: dict | list | None = None, raw: bool = False
+    ) -> Any:
         """Performs a PATCH request to the specified URL.
 
         Args:
             url (str): URL to send the PATCH request to.
-            data (dict | None, optional): A dictionary to be sent as JSON in the body of the request. Defaults to None.
+            data (dict | list | None, optional): Data to be sent as JSON in the body of the request. Defaults to None.
+            raw (bool, optional): Return the response body as bytes instead of decoding it. Defaults to False.
 
         Returns:
             Response: The server's response to the PATCH request.
         """
-        await self._pre_flight_check()
+        debug_payload(log, "do_patch_request", data=data)
+        body = self._codec.dumps(data) if data is not None else None
+        return await self.do_request("PATCH", url, data=body, raw=raw)
 
-        log.debug("do_patch_request", extra={"data": data})
-        # TODO: error handling, lots of ways network/json parse can fail...
-        async with self._session.patch(
-            url, headers=self.headers, auth=self._auth, data=data
-        ) as resp:
-            if resp.status != 200:
-                log.debug("here is resp", extra={"resp": await resp.text()})
-                resp.raise_for_status()
-            return await resp.json()
-
-    async def do_put_request(self, url: str, data_as_json_str: str) -> dict[str, Any]:
+    async def do_put_request(
+        self, url: str, data_as_json_str: str | bytes, raw: bool = False
+    ) -> Any:
         """Does PUT request to the specified URL.
 
         Args:
             url (str): URL to send the PUT request to.
-            data (str): JSON encoded string to send in the body of the request.
+            data (str | bytes): JSON encoded data to send in the body of the request.
+            raw (bool, optional): Return the response body as bytes instead of decoding it. Defaults to False.
 
         Returns:
             dict[str, Any]: JSON response from the server.
         """
-        await self._pre_flight_check()
-
-        log.debug("do_put_request", extra={"data": data_as_json_str})
-        # TODO: error handling, lots of ways network/json parse can fail...
-        async with self._session.put(
-            url, headers=self.headers, auth=self._auth, data=data_as_json_str
-        ) as resp:
-            if resp.status != 200:
-                log.debug("here is resp", extra={"resp": await resp.text()})
-                resp.raise_for_status()
-
-            return await resp.json()
+        debug_payload(log, "do_put_request", data=data_as_json_str)
+        return await self.do_request("PUT", url, data=data_as_json_str, raw=raw)
 
     ##
     # Actual methods for fetching things from Toggl
     ##
 
+    @instrumented()
     async def get_workspaces(self) -> List[Workspace]:
-        """Gets a list of Workspaces the user has access to.
+        """Gets a list of Workspaces the user has access to. Always asks the server and updates the cache.
 
         Returns:
             [Workspace]: List of Workspace objects.
         """
+        return await self._workspaces.refresh()
+
+    @instrumented("get_workspaces")
+    async def _fetch_workspaces(self) -> list[Workspace]:
         log.debug("get_workspaces is alive...")
         ws = await self.do_get_request(WORKSPACE_ENDPOINT)
-        log.debug("get_workspaces", extra={"ws": ws})
+        debug_payload(log, "get_workspaces", ws=ws)
         # As of now, not a ton of error handling in the do_*_request functions.
         # We do basic checking here to make sure pylance is happy.
         if ws is None:
             log.debug("No workspaces found")
             return []
         # Assuming nothing went wrong, `ws` will be a list with one json object per workspace
-        return [Workspace(**x) for x in ws]  # pyright: ignore reportCallIssue
+        result = [Workspace(**x) for x in ws]  # pyright: ignore reportCallIssue
+        if self._store is not None:
+            self._store.put_workspaces(result)
+        return result
 
+    @instrumented()
     async def get_tags(self, workspace_id: int) -> List[Tag]:
         """Returns a list of Tags for the specified workspace.
 
@@ -271,15 +768,229 @@ class Toggl:
             List[Tag]: List of Tag objects.
         """
         tags = await self.do_get_request(TAGS_ENDPOINT(workspace_id))
-        log.debug("get_tags", extra={"tags": tags})
+        debug_payload(log, "get_tags", tags=tags)
         # As of now, not a ton of error handling in the do_*_request functions.
         # We do basic checking here to make sure pylance is happy.
         if tags is None:
-            log.debug("No workspaces found")
-            return []
+            log.debug("No tags found")
         # Assuming nothing went wrong, `tags` will be a list with one json object per tag
-        return [Tag(**x) for x in tags]  # pyright: ignore reportCallIssue
+        result = [Tag(**x) for x in tags or ()]  # pyright: ignore reportCallIssue
+        # We just paid for a full listing (even an empty one) so refresh the index while we're at it
+        self._cache_tags(workspace_id, result)
+        return result
+
+    @instrumented()
+    async def tag_index(self, workspace_id: int) -> TagIndex:
+        """Name <-> ID index for the workspace's Tags, served from cache when fresh.
+
+        Args:
+            workspace_id (int): Workspace ID to get the index for.
+
+        Returns:
+            TagIndex: Index of the workspace's Tags.
+        """
+        index = self._tag_cache.get(workspace_id)
+        if index is None and self._store is not None:
+            stored = self._store.tags(workspace_id)
+            if stored is not None and stored[1] < self._tag_cache.ttl:
+                index = TagIndex(workspace_id, stored[0])
+                self._tag_cache.set(workspace_id, index)
+        if index is None:
+            await self.get_tags(workspace_id)
+            index = self._tag_cache.get(workspace_id)
+        return index
+
+    def invalidate_tags(self, workspace_id: int | None = None) -> None:
+        """Drops cached Tags for one workspace, or all of them."""
+        if workspace_id is None:
+            self._tag_cache.clear()
+        else:
+            self._tag_cache.pop(workspace_id)
+
+    async def _reload_tag_index(self, workspace_id: int) -> TagIndex:
+        """Drops the cached Tags of the workspace and fetches them again."""
+        self.invalidate_tags(workspace_id)
+        await self.get_tags(workspace_id)
+        return self._tag_cache.get(workspace_id)
+
+    def _cache_tags(self, workspace_id: int, tags: list[Tag]) -> None:
+        """Stores a full Tag listing for the workspace."""
+        self._tag_cache.set(workspace_id, TagIndex(workspace_id, tags))
+        if self._store is not None:
+            self._store.put_tags(workspace_id, tags)
+
+    def _invalidate_tags_on_conflict(
+        self, workspace_id: int, exc: aiohttp.ClientResponseError
+    ) -> None:
+        """A 404/409 from a tag write means our idea of the workspace's Tags is out of date."""
+        if exc.status in (404, 409):
+            log.debug("tag write got %s, dropping tag cache", exc.status)
+            self.invalidate_tags(workspace_id)
+
+    async def _get_listing(self, url: str, paginate: bool = False) -> list[dict]:
+        """GETs a full listing, walking every page if `paginate`.
+
+        Args:
+            url (str): Listing endpoint.
+            paginate (bool, optional): Send page/per_page and keep going until a short page. Defaults to False.
+
+        Returns:
+            list[dict]: Every item, undecoded.
+        """
+        if not paginate:
+            return await self.do_get_request(url) or []
+        items: list[dict] = []
+        page = 1
+        while True:
+            data = await self.do_get_request(
+                url, data={"page": page, "per_page": LISTING_PAGE_SIZE}
+            )
+            # Some listings come wrapped, e.g. {"data": [...], "total_count": 1234}
+            if isinstance(data, dict):
+                data = data.get("data")
+            items.extend(data or ())
+            if not data or len(data) < LISTING_PAGE_SIZE:
+                return items
+            page += 1
+
+    @instrumented()
+    async def get_projects(self, workspace_id: int) -> list[Project]:
+        """Returns every Project in the workspace, archived ones included, and refreshes the index.
+
+        Args:
+            workspace_id (int): Workspace ID to fetch projects for.
+
+        Returns:
+            List[Project]: List of Project objects.
+        """
+        raw = await self._get_listing(PROJECTS_ENDPOINT(workspace_id), paginate=True)
+        debug_payload(log, "get_projects", projects=raw)
+        result = [Project.model_validate(x) for x in raw]
+        self._project_cache.set(workspace_id, NamedIndex(workspace_id, result))
+        return result
+
+    @instrumented()
+    async def get_clients(self, workspace_id: int) -> list[Client]:
+        """Returns every Client in the workspace and refreshes the index.
+
+        Args:
+            workspace_id (int): Workspace ID to fetch clients for.
+
+        Returns:
+            List[Client]: List of Client objects.
+        """
+        raw = await self._get_listing(CLIENTS_ENDPOINT(workspace_id))
+        debug_payload(log, "get_clients", clients=raw)
+        result = [Client.model_validate(x) for x in raw]
+        self._client_cache.set(workspace_id, NamedIndex(workspace_id, result))
+        return result
+
+    @instrumented()
+    async def get_tasks(self, workspace_id: int) -> list[Task]:
+        """Returns every Task of every Project in the workspace and refreshes the index.
+
+        Args:
+            workspace_id (int): Workspace ID to fetch tasks for.
+
+        Returns:
+            List[Task]: List of Task objects.
+        """
+        raw = await self._get_listing(TASKS_ENDPOINT(workspace_id), paginate=True)
+        debug_payload(log, "get_tasks", tasks=raw)
+        result = [Task.model_validate(x) for x in raw]
+        self._task_cache.set(workspace_id, NamedIndex(workspace_id, result))
+        return result
+
+    @instrumented()
+    async def project_index(self, workspace_id: int) -> NamedIndex[Project]:
+        """ID/name index of the workspace's Projects, served from cache when fresh."""
+        index = self._project_cache.get(workspace_id)
+        if index is None:
+            await self.get_projects(workspace_id)
+            index = self._project_cache.get(workspace_id)
+        return index
+
+    @instrumented()
+    async def client_index(self, workspace_id: int) -> NamedIndex[Client]:
+        """ID/name index of the workspace's Clients, served from cache when fresh."""
+        index = self._client_cache.get(workspace_id)
+        if index is None:
+            await self.get_clients(workspace_id)
+            index = self._client_cache.get(workspace_id)
+        return index
+
+    @instrumented()
+    async def task_index(self, workspace_id: int) -> NamedIndex[Task]:
+        """ID/name index of the workspace's Tasks, served from cache when fresh."""
+        index = self._task_cache.get(workspace_id)
+        if index is None:
+            await self.get_tasks(workspace_id)
+            index = self._task_cache.get(workspace_id)
+        return index
+
+    async def _catalog(
+        self, workspace_id: int
+    ) -> tuple[NamedIndex[Project], NamedIndex[Client], NamedIndex[Task]]:
+        projects, clients, tasks = await asyncio.gather(
+            self.project_index(workspace_id),
+            self.client_index(workspace_id),
+            self.task_index(workspace_id),
+        )
+        return projects, clients, tasks
+
+    @instrumented()
+    async def prefetch_catalog(
+        self, workspace_ids: Iterable[int] | None = None
+    ) -> None:
+        """Loads the Project, Client and Task indexes of several workspaces concurrently.
+
+        Indexes that are still fresh are not fetched again.
+
+        Args:
+            workspace_ids (Iterable[int] | None, optional): Workspaces to load. Defaults to all of them.
+        """
+        if workspace_ids is None:
+            workspace_ids = [ws.id for ws in await self.workspaces or [] if ws.id]
+        await asyncio.gather(*(self._catalog(x) for x in set(workspace_ids)))
+
+    @instrumented()
+    async def resolve_names(self, entries: Iterable[TimeEntry]) -> list[EntryNames]:
+        """Project, Client and Task names for each Time Entry.
+
+        The indexes of every workspace involved are loaded once up front (concurrently, and only
+            if not cached); after that each entry is a few dict lookups.
+
+        Args:
+            entries (Iterable[TimeEntry]): Time Entries to name.
 
+        Returns:
+            List[EntryNames]: One per entry, in order. Unknown or unset IDs give None.
+        """
+        entries = list(entries)
+        workspace_ids = list({te.workspace_id for te in entries if te.workspace_id})
+        catalogs = await asyncio.gather(*(self._catalog(x) for x in workspace_ids))
+        by_workspace = dict(zip(workspace_ids, catalogs))
+        result = []
+        for te in entries:
+            catalog = by_workspace.get(te.workspace_id)
+            if catalog is None:
+                result.append(EntryNames(None, None, None))
+                continue
+            projects, clients, tasks = catalog
+            project = projects.get(te.project_id)
+            if project is None:
+                result.append(EntryNames(None, None, tasks.name(te.task_id)))
+            else:
+                result.append(
+                    EntryNames(
+                        project.name,
+                        clients.name(project.client_id),
+                        tasks.name(te.task_id),
+                    )
+                )
+        return result
+
+    @instrumented()
     async def create_tag(self, workspace_id: int, tag_name: str) -> Tag | None:
         """Creates a new Tag in the specified workspace.
 
@@ -292,18 +1003,29 @@ class Toggl:
         """
         body = {"name": tag_name, "workspace_id": workspace_id}
         _t = Tag(**body)
-        data = _t.json(exclude_none=True)
-        log.debug("create_tag. To make: %s", data)
-        d = await self.do_post_request(
-            TAGS_ENDPOINT(workspace_id), data_as_json_str=data
-        )
+        data = dump_model(_t, exclude_none=True)
+        debug_payload(log, "create_tag", data=data)
+        try:
+            d = await self.do_post_request(
+                TAGS_ENDPOINT(workspace_id), data_as_json_str=data
+            )
+        except aiohttp.ClientResponseError as exc:
+            self._invalidate_tags_on_conflict(workspace_id, exc)
+            raise
         # As of now, not a ton of error handling in the do_*_request functions.
         # We do basic checking here to make sure pylance is happy.
         if d is None:
             log.debug("Tag not created?")
             return None
-        return Tag(**d)
-
+        tag = Tag(**d)
+        index = self._tag_cache.get(workspace_id)
+        if index is not None:
+            index.add(tag)
+        if self._store is not None:
+            self._store.put_tag(tag)
+        return tag
+
+    @instrumented()
     async def get_time_entries(
         self,
         start_date: datetime,
@@ -330,6 +1052,10 @@ class Toggl:
         if end_date and not start_date:
             raise ValueError("end_date provided but not start_date")
 
+        if self._store is not None and self._store.covers(start_date, end_date):
+            log.debug("get_time_entries served from the local store")
+            return self._store.time_entries(start_date, end_date)
+
         # Toggle wants RFC3339 formatted strings
         _start = generate(start_date, utc=True, accept_naive=True)
         _end = generate(end_date, utc=True, accept_naive=True)
@@ -338,34 +1064,184 @@ class Toggl:
         # When
         params = {"start_date": _start, "end_date": _end}
 
-        time_entries = await self.do_get_request(TIME_ENTRY_ENDPOINT, data=params)
-        log.debug("get_time_entries", extra={"time_entries": time_entries})
-        # As of now, not a ton of error handling in the do_*_request functions.
-        # We do basic checking here to make sure pylance is happy.
-        if time_entries is None:
+        fetched_at = datetime.now(UTC)
+        # Raw bytes; pydantic parses and validates them in one pass
+        raw = await self.do_get_request(TIME_ENTRY_ENDPOINT, data=params, raw=True)
+        debug_payload(log, "get_time_entries", time_entries=raw)
+        # Assuming nothing went wrong, `raw` will be a list with one json object per time entry
+        time_entries = self._decode_time_entries(raw)
+        if not time_entries:
             log.debug("No time entries found")
-            return []
-        # Assuming nothing went wrong, `time_entries` will be a list with one json object per time entry
-        return [TimeEntry(**x) for x in time_entries]  # pyright: ignore reportCallIssue
+        if self._store is not None:
+            self._store.put_time_entries(time_entries)
+            # Entries can still be started later in a range that ends in the future
+            self._store.add_coverage(start_date, min(end_date, fetched_at))
+        return time_entries
+
+    async def iter_time_entries(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        window: timedelta = timedelta(days=DEFAULT_TIME_ENTRY_WINDOW_DAYS),
+        prefetch: bool = True,
+    ) -> AsyncIterator[TimeEntry]:
+        """Streams Time Entries in a date range, one window-sized request at a time.
+
+        Only the current window (and, with `prefetch`, the next one) is held in memory so
+            multi-year ranges don't build one giant list.
+        Entries that straddle a window boundary are returned by both windows; they are only yielded once.
 
+        Args:
+            start_date (datetime): The start date of the range.
+            end_date (datetime): The end date of the range.
+            window (timedelta, optional): Span of each request. Defaults to DEFAULT_TIME_ENTRY_WINDOW_DAYS.
+            prefetch (bool, optional): Fetch the next window while the current one is consumed. Defaults to True.
+
+        Raises:
+            ValueError: If the start_date is later than the end_date or the window is not positive.
+
+        Yields:
+            TimeEntry: Entries window by window, oldest window first.
+        """
+        if start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+        if window <= timedelta(0):
+            raise ValueError("window must be positive")
+
+        async def fetch(
+            span: tuple[datetime, datetime],
+        ) -> tuple[list[TimeEntry], tuple[datetime, datetime] | None]:
+            entries = await self.get_time_entries(*span)
+            window_start = span[1]
+            if window_start >= end_date:
+                return entries, None
+            return entries, (window_start, min(window_start + window, end_date))
+
+        if start_date == end_date:
+            return
+        first = (start_date, min(start_date + window, end_date))
+        # IDs yielded by the previous window; all we need to dedupe across one boundary
+        previous_ids: set[int] = set()
+        async for entries in prefetched_pages(fetch, first, prefetch):
+            current_ids: set[int] = set()
+            for te in entries:
+                if te.id is not None:
+                    if te.id in previous_ids or te.id in current_ids:
+                        continue
+                    current_ids.add(te.id)
+                yield te
+            previous_ids = current_ids
+            # Drop our reference so the window can be garbage collected before the next one lands
+            del entries
+
+    @instrumented()
+    async def get_time_entry_frame(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        window: timedelta = timedelta(days=DEFAULT_TIME_ENTRY_WINDOW_DAYS),
+    ) -> TimeEntryFrame:
+        """Loads a date range into a columnar `TimeEntryFrame`, for reporting over many entries.
+
+        Streams through `iter_time_entries()` so at most a window or two of models exist at a time.
+
+        Args:
+            start_date (datetime): The start date of the range.
+            end_date (datetime): The end date of the range.
+            window (timedelta, optional): Span of each request. Defaults to DEFAULT_TIME_ENTRY_WINDOW_DAYS.
+
+        Returns:
+            TimeEntryFrame: Every entry in the range.
+        """
+        frame = TimeEntryFrame()
+        async for te in self.iter_time_entries(start_date, end_date, window=window):
+            frame.append(te)
+        return frame
+
+    def sync_state(self, workspace_id: int) -> SyncState:
+        """Incremental sync state for a workspace; can be saved and restored with `restore_sync_state()`."""
+        validate_workspace_id(workspace_id)
+        if workspace_id not in self._sync_state:
+            state = None
+            if self._store is not None:
+                state = self._store.load_sync_state(workspace_id)
+            self._sync_state[workspace_id] = state or SyncState(
+                workspace_id=workspace_id
+            )
+        return self._sync_state[workspace_id]
+
+    def restore_sync_state(self, state: SyncState) -> None:
+        """Resumes incremental sync from a previously saved state."""
+        validate_workspace_id(state.workspace_id)
+        self._sync_state[state.workspace_id] = state
+
+    @instrumented()
+    async def sync_time_entries(
+        self, workspace_id: int, since: datetime | None = None
+    ) -> TimeEntryChanges:
+        """Fetches only the Time Entries modified since the last sync of this workspace.
+
+        The first sync (no saved high-water mark, no `since`) returns whatever the server
+            considers recent as `inserted`. Every sync after that uses the `since` parameter
+            so only modified and deleted entries come over the wire.
+
+        Args:
+            workspace_id (int): Workspace to sync.
+            since (datetime | None, optional): Overrides the stored high-water mark. Defaults to None.
+
+        Returns:
+            TimeEntryChanges: Inserted, updated and deleted entries.
+        """
+        state = self.sync_state(workspace_id)
+        if since is not None:
+            state.since = since
+
+        params = None
+        if state.since is not None:
+            params = {"since": int(state.since.timestamp())}
+
+        started_at = datetime.now(UTC)
+        raw = await self.do_get_request(TIME_ENTRY_ENDPOINT, data=params, raw=True)
+        entries = self._decode_time_entries(raw)
+        changes = apply_changes(state, entries, fallback_until=started_at)
+        if self._store is not None:
+            # Every entry that came back is current, whichever workspace it is in
+            self._store.put_time_entries(entries)
+            self._store.save_sync_state(state)
+        log.debug(
+            "sync_time_entries",
+            extra={
+                "workspace_id": workspace_id,
+                "inserted": len(changes.inserted),
+                "updated": len(changes.updated),
+                "deleted": len(changes.deleted),
+            },
+        )
+        return changes
+
+    @instrumented()
     async def get_current_time_entry(self) -> TimeEntry | None:
-        """Returns active Time Entry if one is running, else None"""
+        """Returns active Time Entry if one is running, else None. Always asks the server and updates the cache."""
+        return await self._current_time_entry.refresh()
+
+    @instrumented("get_current_time_entry")
+    async def _fetch_current_time_entry(self) -> TimeEntry | None:
         log.info("get_current_time_entry is alive...")
 
-        cte = await self.do_get_request(f"{TIME_ENTRY_ENDPOINT}/current")
-        if cte is None:
-            log.debug("There doesn't seem to be a currently running Time Entry")
-            return None
+        raw = await self.do_get_request(f"{TIME_ENTRY_ENDPOINT}/current", raw=True)
         try:
-            log.debug("get_current_time_entry", extra={"cte": cte})
-            self._current_time_entry = TimeEntry(**cte)
-            return await self.current_time_entry
+            debug_payload(log, "get_current_time_entry", cte=raw)
+            cte = self._decode_time_entry(raw)
 
         # pylint: disable-next=broad-except
         except Exception as exc:
             log.debug("err", exc_info=exc)
-        return None
+            return None
+        if cte is None:
+            log.debug("There doesn't seem to be a currently running Time Entry")
+        return cte
 
+    @instrumented()
     async def get_time_entry_by_id(self, time_entry_id: int) -> TimeEntry | None:
         """Retrieves a specific Time Entry by its ID
 
@@ -377,34 +1253,115 @@ class Toggl:
         """
         log.info("get_current_time_entry is alive...")
 
-        te = await self.do_get_request(f"{EXPLICIT_ENDPOINT(time_entry_id)}")
-        if te is None:
-            log.debug("There doesn't seem to be a currently running Time Entry")
-            return None
+        raw = await self.do_get_request(f"{EXPLICIT_ENDPOINT(time_entry_id)}", raw=True)
         try:
-            log.debug("get_current_time_entry", extra={"cte": te})
-            return TimeEntry(**te)
+            debug_payload(log, "get_current_time_entry", cte=raw)
+            te = self._decode_time_entry(raw)
 
         # pylint: disable-next=broad-except
         except Exception as exc:
             log.debug("err", exc_info=exc)
-        return None
+            return None
+        if te is None:
+            log.debug("There doesn't seem to be a currently running Time Entry")
+        return te
 
+    @instrumented()
     async def get_account_details(self) -> Account | None:
-        """Retrieves the account details
+        """Retrieves the account details. Always asks the server and updates the cache.
 
         Returns:
             Account | None: The Account object containing the details of the current account if the operation is successful, else None.
         """
+        return await self._account.refresh()
+
+    @instrumented("get_account_details")
+    async def _fetch_account_details(self) -> Account | None:
         d = await self.do_get_request(ACCOUNT_ENDPOINT)
-        log.debug("get_account_details", extra={"data": d})
+        debug_payload(log, "get_account_details", data=d)
         # As of now, not a ton of error handling in the do_*_request functions.
         # We do basic checking here to make sure pylance is happy.
         if d is None:
             return None
-        self._account = Account(**d)
-        return await self.account
+        return Account(**d)
+
+    @instrumented()
+    async def bootstrap(self, related_data: bool = True) -> Bootstrap:
+        """Fills every cache in as few round trips as possible.
 
+        Asks `/me?with_related_data=true` for the account, workspaces, tags, projects, clients and
+            running Time Entry in one go. If the response comes without related data (or
+            `related_data` is False), the individual requests are run concurrently instead.
+
+        Args:
+            related_data (bool, optional): Try the single request first. Defaults to True.
+
+        Returns:
+            Bootstrap: Everything that was loaded.
+        """
+        account = None
+        if related_data:
+            d = await self.do_get_request(ACCOUNT_ENDPOINT, data=RELATED_DATA_PARAMS)
+            debug_payload(log, "bootstrap", data=d)
+            if d is not None:
+                result = parse_related_data(d, self.decode_mode)
+                if result is not None:
+                    self._apply_bootstrap(result)
+                    return result
+                # No related data, but the account is still good
+                account = Account(**d)
+                self._account.set(account)
+            log.info("/me came without related data, bootstrapping the slow way")
+        return await self._bootstrap_concurrently(account)
+
+    async def _bootstrap_concurrently(self, account: Account | None) -> Bootstrap:
+        async def workspaces_and_tags() -> tuple[list[Workspace], dict[int, list[Tag]]]:
+            workspaces = await self._workspaces.refresh() or []
+            ids = [ws.id for ws in workspaces if ws.id is not None]
+            tags = await asyncio.gather(*(self.get_tags(x) for x in ids))
+            return workspaces, dict(zip(ids, tags))
+
+        if account is None:
+            account, (workspaces, tags), current = await asyncio.gather(
+                self._account.refresh(),
+                workspaces_and_tags(),
+                self._current_time_entry.refresh(),
+            )
+        else:
+            (workspaces, tags), current = await asyncio.gather(
+                workspaces_and_tags(), self._current_time_entry.refresh()
+            )
+        return Bootstrap(
+            account=account,
+            workspaces=workspaces,
+            tags=tags,
+            current_time_entry=current,
+            has_time_entries=True,
+        )
+
+    def _apply_bootstrap(self, result: Bootstrap) -> None:
+        """Loads a /me?with_related_data=true response into the caches."""
+        self._account.set(result.account)
+        self._workspaces.set(result.workspaces)
+        if self._store is not None:
+            self._store.put_workspaces(result.workspaces)
+        for workspace_id, tags in result.tags.items():
+            self._cache_tags(workspace_id, tags)
+        for cache, listing in (
+            (self._project_cache, result.projects),
+            (self._client_cache, result.clients),
+            (self._task_cache, result.tasks),
+        ):
+            for workspace_id, items in (listing or {}).items():
+                cache.set(workspace_id, NamedIndex(workspace_id, items))
+        if not result.has_time_entries:
+            # Not knowing what runs is not the same as nothing running; leave it to the next get()
+            return
+        self._current_time_entry.set(result.current_time_entry)
+        if result.current_time_entry is not None and self._store is not None:
+            self._store.put_time_entries([result.current_time_entry])
+
+    @instrumented()
     async def create_new_time_entry(self, te: TimeEntry) -> TimeEntry | None:
         """Creates a new Toggl Track Time Entry
 
@@ -438,15 +1395,18 @@ class Toggl:
         # TODO: i'll want to do more sophisticated validation / coercion to handle this case.
         #   e.g: tag_action should remain None unless tags is a list with at least one string, then default to add
         ##
-        data = te.model_dump_json(exclude_none=True)
-        log.debug("create_new_time_entry. To make: %s", data)
-        d = await self.do_post_request(_url, data_as_json_str=data)
+        data = dump_model(te, exclude_none=True)
+        debug_payload(log, "create_new_time_entry", data=data)
+        d = await self.do_post_request(_url, data_as_json_str=data, raw=True)
         # As of now, not a ton of error handling in the do_*_request functions.
         # We do basic checking here to make sure pylance is happy.
-        if d is None:
+        created = self._decode_time_entry(d)
+        if created is None:
             return None
-        return TimeEntry(**d)
+        self._remember_time_entry(created)
+        return created
 
+    @instrumented("persist_time_entry")
     async def _persist_time_entry(self, te: TimeEntry) -> TimeEntry | None:
         """Lower level level API that attempts to update state for an existing Time Entry.
         Can be used directly, is meant to be used by higher level API functions like edit_time_entry().
@@ -465,15 +1425,142 @@ class Toggl:
             te.workspace_id,
             te.id,  # pyright: ignore reportArgumentType
         )
-        data = te.json(exclude_none=True)
-        log.debug("_persist_time_entry. sending: %s", data)
-        d = await self.do_put_request(_url, data_as_json_str=data)
+        data = dump_model(te, exclude_none=True)
+        debug_payload(log, "_persist_time_entry", data=data)
+        d = await self.do_put_request(_url, data_as_json_str=data, raw=True)
         # As of now, not a ton of error handling in the do_*_request functions.
         # We do basic checking here to make sure pylance is happy.
-        if d is None:
+        persisted = self._decode_time_entry(d)
+        if persisted is None:
             return None
-        return TimeEntry(**d)
+        self._remember_time_entry(persisted)
+        return persisted
+
+    @instrumented()
+    async def update_time_entry(self, te: TimeEntry) -> TimeEntry | None:
+        """Replaces an existing Time Entry with `te` in a single PUT.
 
+        Unlike `edit_time_entry()` nothing is fetched first and the tags are sent as they are.
+
+        Args:
+            te (TimeEntry): Object representing the desired state, including its ID.
+
+        Returns:
+            TimeEntry | None: Object representing the persisted state or None on failure.
+        """
+        return await self._persist_time_entry(te)
+
+    @instrumented()
+    async def patch_time_entries(
+        self,
+        workspace_id: int,
+        time_entry_ids: list[int],
+        operations: list[PatchOperation],
+    ) -> BulkEditResult:
+        """Applies the same JSON Patch operations to many Time Entries in one workspace.
+
+        IDs are split into requests of at most BULK_EDIT_MAX_IDS which are sent concurrently
+            (and paced by the rate limiter).
+        A request that fails outright marks every ID in it as failed rather than raising so
+            the caller always gets a per-entry answer.
+
+        Args:
+            workspace_id (int): Workspace the Time Entries belong to.
+            time_entry_ids (List[int]): Time Entries to patch.
+            operations (List[PatchOperation]): Operations to apply to each of them.
+
+        Returns:
+            BulkEditResult: IDs that were patched and the ones that were not, with the reason.
+        """
+        validate_workspace_id(workspace_id)
+        if not operations:
+            raise ValueError("operations must not be empty")
+        ids = list(dict.fromkeys(time_entry_ids))
+        body = [x.model_dump(mode="json") for x in operations]
+        chunks = [
+            ids[i : i + BULK_EDIT_MAX_IDS]
+            for i in range(0, len(ids), BULK_EDIT_MAX_IDS)
+        ]
+
+        async def _patch(chunk: list[int]) -> BulkEditResult:
+            try:
+                d = await self.do_patch_request(
+                    TIME_ENTRY_BULK_EDIT_ENDPOINT(workspace_id, chunk), data=body
+                )
+                return BulkEditResult(**(d or {}))
+            # ValueError covers bodies that don't decode or don't fit BulkEditResult
+            except (aiohttp.ClientError, TimeoutError, ValueError) as exc:
+                log.error(
+                    "bulk edit of %s time entries failed", len(chunk), exc_info=exc
+                )
+                return BulkEditResult(
+                    failure=[
+                        BulkEditFailure(id=x, message=str(exc) or type(exc).__name__)
+                        for x in chunk
+                    ]
+                )
+
+        result = BulkEditResult()
+        for chunk_result in await asyncio.gather(*(_patch(x) for x in chunks)):
+            result.merge(chunk_result)
+        if self._store is not None:
+            # The response only has IDs; what we stored for them is now out of date
+            self._store.forget_time_entries(result.success)
+        return result
+
+    @instrumented()
+    async def bulk_edit_time_entries(
+        self, entries: Iterable[TimeEntry], fields: Iterable[str]
+    ) -> BulkEditResult:
+        """Persists `fields` of many Time Entries with as few requests as possible.
+
+        Each entry's `fields` are turned into `replace` operations. Entries that end up with identical
+            operations in the same workspace (e.g. the same new tags) are patched together, so retagging
+            thousands of entries after a project rename is a handful of requests.
+
+        Args:
+            entries (Iterable[TimeEntry]): Time Entries in their desired state. Must have an `id` and `workspace_id`.
+            fields (Iterable[str]): TimeEntry fields to persist, e.g. `{"tags", "project_id"}`.
+
+        Returns:
+            BulkEditResult: Combined outcome of every request.
+        """
+        fields = list(fields)
+        for field in fields:
+            if field not in TimeEntry.model_fields or field in ("id", "workspace_id"):
+                raise ValueError(f"{field} can not be bulk edited")
+
+        groups: dict[tuple[int, str], list[int]] = {}
+        group_ops: dict[tuple[int, str], list[PatchOperation]] = {}
+        for te in entries:
+            validate_workspace_id(te.workspace_id)
+            validate_time_entry_id(te.id)
+            # Dump through pydantic so start/stop get the same RFC3339 treatment as a PUT
+            values = te.model_dump(mode="json", include=set(fields))
+            ops = [
+                PatchOperation(op="replace", path=f"/{field}", value=values.get(field))
+                for field in fields
+            ]
+            key = (
+                te.workspace_id,
+                json.dumps([x.model_dump(mode="json") for x in ops], sort_keys=True),
+            )
+            group_ops.setdefault(key, ops)
+            groups.setdefault(key, []).append(te.id)  # pyright: ignore reportArgumentType
+
+        log.debug("bulk_edit_time_entries", extra={"groups": len(groups)})
+        results = await asyncio.gather(
+            *(
+                self.patch_time_entries(key[0], ids, group_ops[key])
+                for key, ids in groups.items()
+            )
+        )
+        result = BulkEditResult()
+        for group_result in results:
+            result.merge(group_result)
+        return result
+
+    @instrumented()
     async def edit_time_entry(self, local_te: TimeEntry) -> TimeEntry | None:
         """High level API that attempts to update state for an existing Time Entry.
 
@@ -520,6 +1607,7 @@ class Toggl:
         log.debug("edit_time_entry: [returning] updated_te: %s", updated_te)
         return await self._persist_time_entry(updated_te)
 
+    @instrumented()
     async def stop_time_entry(self, te: TimeEntry) -> TimeEntry | None:
         """Summary
 
@@ -541,13 +1629,16 @@ class Toggl:
             te.id,  # pyright: ignore reportArgumentType
         )
 
-        d = await self.do_patch_request(_url)
+        d = await self.do_patch_request(_url, raw=True)
         # As of now, not a ton of error handling in the do_*_request functions.
         # We do basic checking here to make sure pylance is happy.
-        if d is None:
+        stopped = self._decode_time_entry(d)
+        if stopped is None:
             return None
-        return TimeEntry(**d)
+        self._remember_time_entry(stopped)
+        return stopped
 
+    @instrumented()
     async def update_tags(self, te: TimeEntry, new_tags: List[str]) -> TimeEntry | None:
         """
         A wrapper to abstract the logic of updating the tags on a TimeEntry object.
@@ -568,119 +1659,138 @@ class Toggl:
 
         Then we need to figure out which tag_ids should be added and or removed from the Time Entry.
 
+        The work is split in two: `plan_tag_update()` works out the minimal set of calls (served from the cached
+            tag index, so usually without any request) and `apply_tag_update()` runs them.
+        Missing tags are created concurrently, then all additions go in one PUT and all removals in another.
+
         We take a best effort approach to updating the tags on the Time Entry. Add new tags first, then remove old tags.
         This way, even if there's an error removing tags, the Time Entry will still have the new tags that the user wanted.
         They can always manually search for the old tag(s) and remove them if necessary.
         """
+        plan = await self.plan_tag_update(te, new_tags)
+        if not plan:
+            log.info("No changes to tags needed.")
+            return te
+        return await self.apply_tag_update(plan)
+
+    @instrumented()
+    async def plan_tag_update(
+        self, te: TimeEntry, new_tags: list[str]
+    ) -> TagUpdatePlan:
+        """Works out which calls `update_tags()` would make, without making them.
+
+        Args:
+            te (TimeEntry): Time Entry as the server knows it.
+            new_tags (List[str]): Complete list of tags the Time Entry should have.
+
+        Returns:
+            TagUpdatePlan: The plan; `call_count` is the number of requests applying it will cost.
+        """
         validate_workspace_id(te.workspace_id)
         validate_time_entry_id(te.id)
         if new_tags is None:
             raise ValueError("new_tags is required.")
 
-        log.debug("Updating tags on TimeEntry: %s.", te.description)
-        # TODO: much better error handling
-        known_tags = await self.get_tags(te.workspace_id)
-        if known_tags is None:
-            log.error("Failed to get tags for workspace: %s.", te.workspace_id)
-            return
-
-        # Even though get_tags should never return a Tag with either field as None
-        # Pylance only sees that Pydantic has either None or Int/Str for the fields
-        known_tags = {
-            tag.name: tag.id
-            for tag in known_tags
-            if tag.name is not None and tag.id is not None
-        }
-        log.debug("Found %s known tags: %s.", len(known_tags), known_tags)
-
-        # Figure out what tags need to be created, added and removed
-        tags_to_create = set(new_tags) - set(known_tags.keys())
-        log.debug("%s Tags to create: %s", len(tags_to_create), tags_to_create)
-
-        # Pylance only sees that `tags` is Optional[List[str]]. It knows that Pydanitc's Optional means None is possible.
-        # It can't see that there is a post validation function that replaces None with [].
-        tags_to_add = set(new_tags) - set(te.tags)  # pyright: ignore reportArgumentType
-        log.debug("%s Tags to add: %s", len(tags_to_add), tags_to_add)
+        log.debug("Planning tag update on TimeEntry: %s.", te.description)
+        index = await self.tag_index(te.workspace_id)
+        plan = plan_tag_update(te, new_tags, index)
+        if plan.unresolved:
+            # The cached index may predate tags created elsewhere; plan once more from a fresh one
+            index = await self._reload_tag_index(te.workspace_id)
+            plan = plan_tag_update(te, new_tags, index)
+        log.debug(
+            "tag plan",
+            extra={
+                "create": plan.to_create,
+                "add": plan.to_add,
+                "remove": plan.to_remove,
+                "calls": plan.call_count,
+            },
+        )
+        if plan.unresolved:
+            log.error(
+                "Tags not found in known tags, cannot remove: %s", plan.unresolved
+            )
+        return plan
+
+    async def _persist_tag_action(
+        self, plan: TagUpdatePlan, action: str, tags: dict[str, int]
+    ) -> TimeEntry | None:
+        """Sends one tag-only PUT so nothing but the tags is touched on the server."""
+        # API appears to be inconsistent about weather the string or the ID matters more depending on the action
+        #   so send both to be sure.
+        te = TimeEntry(
+            id=plan.time_entry_id,
+            workspace_id=plan.workspace_id,
+            tags=list(tags),
+            tag_ids=list(tags.values()),
+            tag_action=action,
+        )
+        try:
+            return await self._persist_time_entry(te)
+        except aiohttp.ClientResponseError as exc:
+            self._invalidate_tags_on_conflict(plan.workspace_id, exc)
+            raise
 
-        # fmt: off
-        tags_to_remove = set(te.tags) - set(new_tags) # pyright: ignore reportArgumentType
-        log.debug("%s Tags to remove: %s", len(tags_to_remove), tags_to_remove)
+    @instrumented()
+    async def apply_tag_update(self, plan: TagUpdatePlan) -> TimeEntry | None:
+        """Runs a plan from `plan_tag_update()`.
 
-        if (
-            len(tags_to_create) == 0
-            and len(tags_to_add) == 0
-            and len(tags_to_remove) == 0
-        ):
-            log.info("No changes to tags needed.")
-            return te
+        Args:
+            plan (TagUpdatePlan): Plan to run.
 
-        # Technically, if the TimeEntry that the user passed in has a valid ID but a different description / start / stop / duration... etc
-        #   from what the server has handy, calling _persist_time_entry will update the Time Entry to match the user's Time Entry in it's entirety.
-        # The name of this function implies that it's only for updating tags so we unset any attributes on the current Time Entry that aren't tags.
-        # This way, when we persist the Time Entry, we only update the tags on the server.
-        # Easiest way to do this is to clone the Time Entry that user passed in and then unset the non-tag fields; leave the TE they passed in alone.
-        ##
-        te = TimeEntry(
-            id=te.id,
-            workspace_id=te.workspace_id,
-            tags=te.tags,
-            tag_ids=te.tag_ids,
-            tag_action=te.tag_action,
-        )
+        Returns:
+            TimeEntry | None: The Time Entry after the last write, or None if adding tags failed
+                (nothing is removed then) or there was nothing that could be written.
+        """
+        creation_failed = False
+        if plan.to_create:
+            created = await asyncio.gather(
+                *(self.create_tag(plan.workspace_id, tag) for tag in plan.to_create),
+                return_exceptions=True,
+            )
+            for tag, result in zip(plan.to_create, created, strict=True):
+                if isinstance(result, BaseException) or result is None:
+                    log.error("Failed to create tag: %s", tag, exc_info=result)
+                    creation_failed = True
+
+        # create_tag() put the new tags in the index
+        index = await self.tag_index(plan.workspace_id)
+        missing = [tag for tag in plan.to_add if tag not in index.by_name]
+        if missing or creation_failed:
+            # E.g. created elsewhere after the index was cached, so creating it here failed
+            index = await self._reload_tag_index(plan.workspace_id)
+            missing = [tag for tag in plan.to_add if tag not in index.by_name]
+        if missing:
+            log.error(
+                "Tags not found in known tags: %s. Creation failed? Not touching the Time Entry",
+                missing,
+            )
+            return None
+        known_tags = index.by_name
 
-        # Create the new tags
-        for tag in tags_to_create:
-            log.info("Creating new tag: %s", tag)
-            new_tag = await self.create_tag(te.workspace_id, tag)
-            if new_tag is None:
-                log.error("Failed to create tag: %s", tag)
-                continue
-            if new_tag.name is None or new_tag.id is None:
+        updated_te = None
+        if plan.to_add:
+            to_add = {tag: known_tags[tag] for tag in plan.to_add}
+            updated_te = await self._persist_tag_action(plan, "add", to_add)
+            if updated_te is None:
                 log.error(
-                    "Tag creation failed: [%s] (%s,%s)", tag, new_tag.id, new_tag.name
+                    "Failed to update Time Entry with new tags; refusing to remove old tags (if any)"
                 )
-                continue
-            # Creation was successful, add the new tag to the known tags
-            known_tags[new_tag.name] = new_tag.id
-
-        # Assuming nothing went wrong, we should now have an updated list of known tags
-        for tag in tags_to_add:
-            log.info("Adding tag: %s", tag)
-            if tag not in known_tags:
-                log.error("Tag not found in known tags: %s. Creation failed?", tag)
-                continue
-            # Update the Time Entry with the new tag ID and name to be sure.
-            # API appears to be inconsistent about weather the string or the ID matters more depending on the action!?!!
-            ##
-            # pylint: disable=no-member
-            te.tag_ids.append(known_tags[tag]) # pyright: ignore reportOptionalMemberAccess
-            # pylint: disable=no-member
-            te.tags.append(tag) # pyright: ignore reportOptionalMemberAccess
-
-        updated_te = await self._persist_time_entry(te)
-        if updated_te is None:
-            log.error(
-                "Failed to update Time Entry with new tags; refusing to remove old tags (if any)"
-            )
-            return
+                return None
 
-        # Assuming nothing broke, the time entry should have tag IDs for new tags and old tags.
-        # Clear the tag_ids / strings, set the tag_action to remove, and then set string/ids to the tags that need to be removed.
-        if len(tags_to_remove) > 0:
-            updated_te.tag_ids = []
-            updated_te.tags = []
-            updated_te.tag_action = "remove"
-            for tag in tags_to_remove:
-                log.debug("Removing tag: %s", tag)
-                if tag not in known_tags:
-                    log.error("Tag not found in known tags: %s. Cannot remove.", tag)
-                    continue
-                # Again, when remove is the action, behavior is inconsistent when the tag_ids versus tag strings don't match
-                updated_te.tag_ids.append(known_tags[tag])
-                updated_te.tags.append(tag)
-
-        # Should return a Time Entry with just the new tags
-        return await self._persist_time_entry(updated_te)
+        to_remove = {
+            tag: known_tags[tag]
+            for tag in plan.to_remove + plan.unresolved
+            if tag in known_tags
+        }
+        if to_remove:
+            updated_te = await self._persist_tag_action(plan, "delete", to_remove)
+        unresolved = [tag for tag in plan.unresolved if tag not in known_tags]
+        if unresolved:
+            log.error("Tags not found in known tags, cannot remove: %s", unresolved)
+
+        return updated_te
 
 
 # TODO: General exceptions to handle and wrap
@@ -693,6 +1803,3 @@ class Toggl:
 #       409 when trying to stop a time entry that's already stopped... etc
 # When sending a request BODY with verb GET (or just a bad request in general)
 #   aiohttp.client_exceptions.ClientResponseError: 400, message='Bad Request',
-##
-# TODO: can probably re-factor a bit and remove the do_$VERB_request functions and replace with
-#   a singular do_request which takes an aiohttp.request() object
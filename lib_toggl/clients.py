@@ -0,0 +1,45 @@
+"""Represents a Toggl Client object (the customer a Project is for, not an API client)."""
+
+import logging
+from datetime import datetime
+
+from pydantic import AliasChoices, BaseModel, Field
+
+from .const import BASE
+from .time_entries import validate_workspace_id
+
+log = logging.getLogger(__name__)
+
+
+@staticmethod
+# pylint: disable=invalid-name
+def CLIENTS_ENDPOINT(workspace_id: int) -> str:
+    """Returns the endpoint for listing the Clients in a particular workspace."""
+    validate_workspace_id(workspace_id)
+    return f"{BASE}/workspaces/{workspace_id}/clients"
+
+
+class Client(BaseModel):  # pyright: ignore[reportGeneralTypeIssues]
+    """Class representing Client object.
+    See: https://engineering.toggl.com/docs/api/clients
+    """
+
+    id: int = Field(description="Client ID.")
+
+    # The API still calls it `wid` here
+    workspace_id: int = Field(
+        validation_alias=AliasChoices("workspace_id", "wid"),
+        description="Workspace ID the client belongs to.",
+    )
+
+    name: str = Field(description="Client name.")
+
+    archived: bool = Field(default=False)
+
+    notes: str | None = Field(default=None, repr=False)
+
+    creator_id: int | None = Field(default=None, repr=False)
+
+    at: datetime | None = Field(
+        default=None, exclude=True, repr=False, description="When last updated."
+    )
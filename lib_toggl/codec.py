@@ -0,0 +1,104 @@
+"""Pluggable JSON encoding/decoding for request and response bodies.
+
+Responses are read as bytes. Payloads that end up as models (Time Entries, mostly) are handed
+straight to pydantic's `validate_json()` and never go through a codec at all. The codec covers
+everything else: bodies we build from plain dicts/lists, and responses that are used as dicts.
+
+`default_codec()` picks the fastest backend that is installed: orjson, then msgspec, then the
+standard library. Neither orjson nor msgspec is a dependency; install one to use it.
+"""
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+
+class JsonCodec:
+    """Standard library `json`. Always available; the other codecs override both methods."""
+
+    name = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decodes a JSON document. An empty body decodes to None."""
+        if not data or not data.strip():
+            return None
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encodes `obj` as compact UTF-8 JSON."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson backed codec. See: https://github.com/ijl/orjson"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("orjson is not installed.")
+
+    def loads(self, data: bytes | str) -> Any:
+        if not data or not data.strip():
+            return None
+        return orjson.loads(data)  # pyright: ignore[reportOptionalMemberAccess]
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)  # pyright: ignore[reportOptionalMemberAccess]
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec backed codec. See: https://jcristharif.com/msgspec/"""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise RuntimeError("msgspec is not installed.")
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: bytes | str) -> Any:
+        if not data or not data.strip():
+            return None
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+def default_codec() -> JsonCodec:
+    """Returns the fastest installed codec."""
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    log.debug("neither orjson nor msgspec is installed, using the json module")
+    return JsonCodec()
+
+
+def dump_model(model: BaseModel, **kwargs) -> bytes:
+    """Like `model.model_dump_json(**kwargs)` but returns the serializer's bytes without decoding them to str."""
+    return model.__pydantic_serializer__.to_json(model, **kwargs)
@@ -6,7 +6,10 @@ Implements a subset of the complete API.
 
 from . import __version__ as version
 
-BASE = "https://api.track.toggl.com/api/v9"
+API_ROOT = "https://api.track.toggl.com"
+BASE = f"{API_ROOT}/api/v9"
+WEBHOOKS_BASE = f"{API_ROOT}/webhooks/api/v1"
+REPORTS_BASE = f"{API_ROOT}/reports/api/v3"
 
 CURRENT_RUNNING_TIME = f"{BASE}/time_entries/current"
 PROJECTS = f"{BASE}/projects"
@@ -14,3 +17,75 @@ START_TIME = f"{BASE}/time_entries/start"
 
 DEFAULT_CREATED_BY = "lib-toggl"
 USER_AGENT = f"{DEFAULT_CREATED_BY} ({version})"
+
+# Toggl documents a "safe" request rate of about one request per second per API token.
+# Short bursts are tolerated by their leaky bucket so allow a few requests through back-to-back.
+# See: https://engineering.toggl.com/docs/#leaky-bucket
+RATE_LIMIT_PER_SECOND = 1.0
+RATE_LIMIT_BURST = 4
+
+# Retry behavior for transient failures (429, 5xx, dropped connections)
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE_SECONDS = 0.5
+DEFAULT_BACKOFF_MAX_SECONDS = 30.0
+
+# Sent when the hourly per-workspace/organization quota is nearly or fully used.
+# See: https://engineering.toggl.com/docs/#api-limits
+QUOTA_REMAINING_HEADER = "X-Toggl-Quota-Remaining"
+QUOTA_RESETS_IN_HEADER = "X-Toggl-Quota-Resets-In"
+
+# How many tokens MultiToggl works on at the same time, across all tokens
+DEFAULT_FANOUT_CONCURRENCY = 50
+
+# Size of each request window when streaming time entries over a long date range
+DEFAULT_TIME_ENTRY_WINDOW_DAYS = 30
+
+# Tags rarely change; keep a per-workspace name/id index around instead of fetching on every edit
+DEFAULT_TAG_CACHE_TTL_SECONDS = 15 * 60
+DEFAULT_TAG_CACHE_SIZE = 64
+
+# Same idea for the per-workspace Project, Client and Task indexes
+DEFAULT_CATALOG_CACHE_TTL_SECONDS = 15 * 60
+
+# Page size used when walking paginated listings (projects, tasks); the API caps it at 200
+LISTING_PAGE_SIZE = 200
+
+# Most Time Entry IDs the bulk PATCH endpoint takes in one request
+BULK_EDIT_MAX_IDS = 100
+
+# Freshness of the values behind the Toggl.account / workspaces / current_time_entry properties.
+# TTL is how long a value is served as-is; STALE is how much longer it is served while a refresh
+#   runs in the background.
+ACCOUNT_CACHE_TTL_SECONDS = 60 * 60
+ACCOUNT_CACHE_STALE_SECONDS = 24 * 60 * 60
+WORKSPACES_CACHE_TTL_SECONDS = 60 * 60
+WORKSPACES_CACHE_STALE_SECONDS = 24 * 60 * 60
+CURRENT_TIME_ENTRY_CACHE_TTL_SECONDS = 30
+CURRENT_TIME_ENTRY_CACHE_STALE_SECONDS = 30
+
+# Longest payload (request/response body, decoded data) rendered into a debug log line
+LOG_PAYLOAD_MAX_CHARS = 1024
+
+# Polling of the running Time Entry, see lib_toggl.poller. Polls start at the min interval and
+#   back off by BACKOFF each time nothing changed, up to the max interval. A local write brings the
+#   next poll forward to AFTER_WRITE seconds.
+DEFAULT_POLL_MIN_INTERVAL_SECONDS = 15.0
+DEFAULT_POLL_MAX_INTERVAL_SECONDS = 5 * 60.0
+DEFAULT_POLL_BACKOFF = 1.5
+DEFAULT_POLL_JITTER = 0.1
+DEFAULT_POLL_AFTER_WRITE_SECONDS = 2.0
+
+# Toggl signs every webhook delivery with HMAC-SHA256 of the body, keyed by the subscription secret
+# See: https://engineering.toggl.com/docs/webhooks_start/validating_received_events
+WEBHOOK_SIGNATURE_HEADER = "X-Webhook-Signature-256"
+
+# Event IDs remembered by the webhook receiver to drop redelivered events
+WEBHOOK_DEDUPE_SIZE = 1024
+
+# Reports API v3 pagination. The cursor for the next page comes back in these headers and is sent
+# as first_id/first_row_number/first_timestamp in the body of the next request.
+# See: https://engineering.toggl.com/docs/reports_start
+REPORTS_NEXT_ID_HEADER = "X-Next-ID"
+REPORTS_NEXT_ROW_NUMBER_HEADER = "X-Next-Row-Number"
+REPORTS_NEXT_TIMESTAMP_HEADER = "X-Next-Timestamp"
+DEFAULT_REPORT_PAGE_SIZE = 50
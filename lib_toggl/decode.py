@@ -0,0 +1,181 @@
+"""Turns Time Entry payloads from the API into `TimeEntry` objects.
+
+`TimeEntry(**x)` runs full pydantic validation on every item: type checks, the `tag_action`
+pattern, alias resolution and RFC3339 parsing for four datetime fields. That is the right thing
+for data a user typed in but most of it is wasted on what the Toggl API sends back, and on a year
+of Time Entries it's where the CPU goes.
+
+`DecodeMode.TRUSTED` assumes the payload is well formed. It only parses the datetime fields
+(`datetime.fromisoformat()` is implemented in C) and resolves the legacy aliases the same way
+validation does, then fills in the model's state directly, the way `model_construct()` does. The
+resulting objects compare equal to validated ones. Malformed payloads are not caught; they show
+up later as wrong types.
+
+The `*_json()` variants take the raw response body. Validated decoding hands the bytes straight
+to pydantic's `validate_json()` so the payload is parsed once, in Rust, instead of being turned
+into dicts first and validated second. Trusted decoding parses with the client's `JsonCodec`.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from .codec import JsonCodec
+from .time_entries import TimeEntry
+
+# Fields that arrive as RFC3339 strings and are stored as datetime
+_DATETIME_FIELDS = ("start", "stop", "at", "server_deleted_at")
+_FIELDS = frozenset(TimeEntry.model_fields)
+# Every TimeEntry default is immutable (None, False, -1, a str) so they can be shared between instances
+_DEFAULTS = {
+    name: field.get_default(call_default_factory=True)
+    for name, field in TimeEntry.model_fields.items()
+}
+_TIME_ENTRY_ADAPTER = TypeAdapter(TimeEntry | None)
+_TIME_ENTRIES_ADAPTER = TypeAdapter(list[TimeEntry] | None)
+# Looked up once; this runs per Time Entry
+_fromisoformat = datetime.fromisoformat
+_new = TimeEntry.__new__
+_setattr = object.__setattr__
+
+
+class DecodeMode(StrEnum):
+    """How a client turns Time Entry payloads into models."""
+
+    VALIDATE = "validate"
+    """Full pydantic validation. Safe for any input."""
+
+    TRUSTED = "trusted"
+    """Skip validation for payloads that came straight from the Toggl API."""
+
+
+def construct_time_entry(data: dict[str, Any]) -> TimeEntry:
+    """Builds a `TimeEntry` from a server payload without validating it.
+
+    Args:
+        data (dict[str, Any]): One Time Entry, as decoded from the API's JSON.
+
+    Returns:
+        TimeEntry: Equal to `TimeEntry(**data)` for any well formed payload.
+    """
+    fields_set = data.keys() & _FIELDS
+    values = _DEFAULTS.copy()
+    if len(fields_set) == len(data):
+        values.update(data)
+    else:
+        for name in fields_set:
+            values[name] = data[name]
+    # `task_id` is only populated through its `tid` alias, matching validation
+    values["task_id"] = values["tid"]
+    if "tid" in fields_set:
+        fields_set.add("task_id")
+    else:
+        fields_set.discard("task_id")
+    for name in _DATETIME_FIELDS:
+        value = values[name]
+        if value.__class__ is str:
+            values[name] = _fromisoformat(value)
+
+    # Not model_construct(); it hands `tid` to the `task_id` alias and leaves the `tid` field unset
+    te = _new(TimeEntry)
+    _setattr(te, "__dict__", values)
+    _setattr(te, "__pydantic_fields_set__", fields_set)
+    _setattr(te, "__pydantic_extra__", None)
+    _setattr(te, "__pydantic_private__", None)
+    return te
+
+
+def encode_time_entry(te: TimeEntry) -> bytes:
+    """Serializes every field of `te`, including the ones TimeEntry leaves out of API dumps (`at`, ...).
+
+    The output has the shape of an API payload so `construct_time_entry()` reads it back unchanged.
+    Used for local storage, never sent to the API.
+    """
+    values = dict(te.__dict__)
+    values["tid"] = te.task_id
+    return to_json(values)
+
+
+def decode_time_entry(
+    data: dict[str, Any], mode: DecodeMode = DecodeMode.VALIDATE
+) -> TimeEntry:
+    """Decodes a single Time Entry payload.
+
+    Args:
+        data (dict[str, Any]): One Time Entry, as decoded from the API's JSON.
+        mode (DecodeMode, optional): Defaults to DecodeMode.VALIDATE.
+
+    Returns:
+        TimeEntry: The decoded Time Entry.
+    """
+    if mode is DecodeMode.TRUSTED:
+        return construct_time_entry(data)
+    return TimeEntry(**data)
+
+
+def decode_time_entries(
+    data: Iterable[dict[str, Any]] | None, mode: DecodeMode = DecodeMode.VALIDATE
+) -> list[TimeEntry]:
+    """Decodes a list of Time Entry payloads. None decodes to an empty list.
+
+    Args:
+        data (Iterable[dict[str, Any]] | None): Time Entries, as decoded from the API's JSON.
+        mode (DecodeMode, optional): Defaults to DecodeMode.VALIDATE.
+
+    Returns:
+        list[TimeEntry]: The decoded Time Entries.
+    """
+    if not data:
+        return []
+    if mode is DecodeMode.TRUSTED:
+        return [construct_time_entry(x) for x in data]
+    return [TimeEntry(**x) for x in data]
+
+
+def decode_time_entry_json(
+    raw: bytes,
+    mode: DecodeMode = DecodeMode.VALIDATE,
+    codec: JsonCodec | None = None,
+) -> TimeEntry | None:
+    """Decodes a response body holding a single Time Entry. `null` or an empty body decodes to None.
+
+    Args:
+        raw (bytes): Response body.
+        mode (DecodeMode, optional): Defaults to DecodeMode.VALIDATE.
+        codec (JsonCodec | None, optional): Parser for DecodeMode.TRUSTED. Defaults to JsonCodec().
+
+    Returns:
+        TimeEntry | None: The decoded Time Entry.
+    """
+    if not raw or not raw.strip():
+        return None
+    if mode is DecodeMode.TRUSTED:
+        data = (codec or JsonCodec()).loads(raw)
+        return None if data is None else construct_time_entry(data)
+    return _TIME_ENTRY_ADAPTER.validate_json(raw)
+
+
+def decode_time_entries_json(
+    raw: bytes,
+    mode: DecodeMode = DecodeMode.VALIDATE,
+    codec: JsonCodec | None = None,
+) -> list[TimeEntry]:
+    """Decodes a response body holding a list of Time Entries. `null` or an empty body decodes to [].
+
+    Args:
+        raw (bytes): Response body.
+        mode (DecodeMode, optional): Defaults to DecodeMode.VALIDATE.
+        codec (JsonCodec | None, optional): Parser for DecodeMode.TRUSTED. Defaults to JsonCodec().
+
+    Returns:
+        list[TimeEntry]: The decoded Time Entries.
+    """
+    if not raw or not raw.strip():
+        return []
+    if mode is DecodeMode.TRUSTED:
+        return decode_time_entries((codec or JsonCodec()).loads(raw), mode)
+    return _TIME_ENTRIES_ADAPTER.validate_json(raw) or []
@@ -0,0 +1,357 @@
+"""Columnar storage for large numbers of Time Entries.
+
+A `TimeEntry` model is a pydantic object with ~20 fields, each a separate Python object, which
+adds up to well over a kilobyte per entry. Reporting code that loads a few years of history
+doesn't need any of that until it looks at a specific entry. `TimeEntryFrame` keeps one `array`
+per field instead: ints as 8 byte machine integers, datetimes as epoch seconds, and tags (and
+descriptions) interned so each distinct string is stored once.
+
+Rows are turned back into `TimeEntry` objects only when asked for, one at a time.
+The legacy fields (`uid`, `wid`, `pid`, `tid`, `duronly`) and `created_with`/`tag_action` are
+not kept; they are either duplicates or only matter when sending a Time Entry to the API.
+"""
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
+from typing import Any, overload
+
+from .time_entries import TimeEntry
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+# Stands in for None in the integer columns
+NULL = -(2**63)
+
+_INT_COLUMNS = (
+    "id",
+    "workspace_id",
+    "project_id",
+    "task_id",
+    "user_id",
+    "duration",
+)
+_TIME_COLUMNS = ("start", "stop", "at", "server_deleted_at")
+
+
+def _to_epoch(value: datetime | None) -> int:
+    if value is None:
+        return NULL
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
+
+
+def _from_epoch(value: int) -> datetime | None:
+    if value == NULL:
+        return None
+    return datetime.fromtimestamp(value, tz=UTC)
+
+
+class _Ragged:
+    """A list of int lists, stored flat: values of row `i` are `values[offsets[i]:offsets[i + 1]]`.
+
+    None and [] are told apart with a separate null mask.
+    """
+
+    __slots__ = ("nulls", "offsets", "values")
+
+    def __init__(self) -> None:
+        self.offsets = array("q", [0])
+        self.values = array("q")
+        self.nulls = array("b")
+
+    def append(self, items: Iterable[int] | None) -> None:
+        self.nulls.append(items is None)
+        if items is not None:
+            self.values.extend(items)
+        self.offsets.append(len(self.values))
+
+    def get(self, row: int) -> array | None:
+        if self.nulls[row]:
+            return None
+        return self.values[self.offsets[row] : self.offsets[row + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.values, self.nulls))
+
+
+class TimeEntryFrame:
+    """Column store for Time Entries. Build one with `from_entries()` or `append()`.
+
+    Indexing with an int returns a `TimeEntry`, indexing with a slice returns a new frame.
+    `column()` exposes the raw arrays for vectorized work; None is stored as `NULL` in the int
+        and datetime columns.
+    """
+
+    __slots__ = (
+        "_billable",
+        "_description_pool",
+        "_descriptions",
+        "_ints",
+        "_tag_ids",
+        "_tag_names",
+        "_tag_pool",
+        "_tags",
+        "_times",
+    )
+
+    def __init__(self) -> None:
+        self._ints: dict[str, array] = {name: array("q") for name in _INT_COLUMNS}
+        self._times: dict[str, array] = {name: array("q") for name in _TIME_COLUMNS}
+        self._billable = array("b")
+        # Descriptions repeat a lot ("Standup", "Code review"); store each one once
+        self._descriptions: list[str | None] = []
+        self._description_pool: dict[str, str] = {}
+        # Tags are kept as indexes into _tag_names
+        self._tags = _Ragged()
+        self._tag_ids = _Ragged()
+        self._tag_names: list[str] = []
+        self._tag_pool: dict[str, int] = {}
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[TimeEntry]) -> "TimeEntryFrame":
+        """Builds a frame from e.g. the result of `Toggl.get_time_entries()`.
+
+        Args:
+            entries (Iterable[TimeEntry]): Time Entries to store.
+
+        Returns:
+            TimeEntryFrame: The new frame.
+        """
+        frame = cls()
+        frame.extend(entries)
+        return frame
+
+    def append(self, te: TimeEntry) -> None:
+        """Adds one Time Entry to the end of the frame."""
+        for name, column in self._ints.items():
+            value = getattr(te, name)
+            column.append(NULL if value is None else value)
+        for name, column in self._times.items():
+            column.append(_to_epoch(getattr(te, name)))
+        self._billable.append(bool(te.billable))
+
+        description = te.description
+        if description is not None:
+            description = self._description_pool.setdefault(description, description)
+        self._descriptions.append(description)
+
+        tags = None
+        if te.tags is not None:
+            tags = [self._intern_tag(tag) for tag in te.tags]
+        self._tags.append(tags)
+        self._tag_ids.append(te.tag_ids)
+
+    def extend(self, entries: Iterable[TimeEntry]) -> None:
+        """Adds Time Entries to the end of the frame."""
+        for te in entries:
+            self.append(te)
+
+    def _intern_tag(self, tag: str) -> int:
+        index = self._tag_pool.get(tag)
+        if index is None:
+            index = len(self._tag_names)
+            self._tag_names.append(tag)
+            self._tag_pool[tag] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self._billable)
+
+    @overload
+    def __getitem__(self, key: int) -> TimeEntry: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "TimeEntryFrame": ...
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(range(len(self))[key])
+        return self.materialize(key)
+
+    def __iter__(self) -> Iterator[TimeEntry]:
+        """Yields every row as a `TimeEntry`, materializing them one at a time."""
+        for row in range(len(self)):
+            yield self.materialize(row)
+
+    @property
+    def tag_names(self) -> list[str]:
+        """Every distinct tag in the frame, in order of first appearance."""
+        return list(self._tag_names)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns. Shared strings are counted by reference only."""
+        arrays = [*self._ints.values(), *self._times.values(), self._billable]
+        size = sum(a.itemsize * len(a) for a in arrays)
+        size += self._tags.nbytes + self._tag_ids.nbytes
+        # One pointer per row for the description, plus the distinct strings themselves
+        size += 8 * len(self._descriptions)
+        size += sum(len(x) for x in self._description_pool)
+        size += sum(len(x) for x in self._tag_names)
+        return size
+
+    def column(self, name: str) -> array:
+        """Raw column by TimeEntry field name. `start`/`stop`/`at`/`server_deleted_at` are epoch seconds.
+
+        The array is the frame's own buffer; treat it as read-only.
+
+        Raises:
+            KeyError: If there is no such numeric column.
+        """
+        if name in self._ints:
+            return self._ints[name]
+        if name in self._times:
+            return self._times[name]
+        if name == "billable":
+            return self._billable
+        raise KeyError(f"No numeric column named {name}")
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Every numeric column as a NumPy array sharing the frame's memory.
+
+        Raises:
+            RuntimeError: If NumPy is not installed.
+        """
+        if numpy is None:
+            raise RuntimeError("numpy is not installed.")
+        columns = {**self._ints, **self._times, "billable": self._billable}
+        return {
+            name: numpy.frombuffer(
+                column, dtype=numpy.int64 if column.typecode == "q" else numpy.int8
+            )
+            for name, column in columns.items()
+        }
+
+    def tag_column(self) -> tuple[array, array]:
+        """Every row's tags at once: row `i` has codes `codes[offsets[i]:offsets[i + 1]]`, indexes into `tag_names`.
+
+        Rows with no tags (None or []) have an empty range. The arrays are the frame's own; treat them as read-only.
+        """
+        return self._tags.offsets, self._tags.values
+
+    def tag_codes(self, row: int) -> array | None:
+        """Tags of one row as indexes into `tag_names`. Cheaper than `tags()` in tight loops."""
+        return self._tags.get(row)
+
+    def tags(self, row: int) -> list[str] | None:
+        """Tag names of one row, without materializing the rest of it."""
+        indexes = self._tags.get(row)
+        if indexes is None:
+            return None
+        return [self._tag_names[i] for i in indexes]
+
+    def materialize(self, row: int) -> TimeEntry:
+        """Builds the `TimeEntry` for one row. Negative indexes count from the end.
+
+        Raises:
+            IndexError: If `row` is out of range.
+        """
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("TimeEntryFrame index out of range")
+
+        values: dict[str, Any] = {}
+        for name, column in self._ints.items():
+            value = column[row]
+            if value != NULL:
+                values[name] = value
+        for name, column in self._times.items():
+            value = column[row]
+            if value != NULL:
+                values[name] = _from_epoch(value)
+        values["billable"] = bool(self._billable[row])
+        if self._descriptions[row] is not None:
+            values["description"] = self._descriptions[row]
+        tags = self.tags(row)
+        if tags is not None:
+            values["tags"] = tags
+        tag_ids = self._tag_ids.get(row)
+        if tag_ids is not None:
+            values["tag_ids"] = tag_ids.tolist()
+        # Everything in the frame came from a validated model
+        return TimeEntry.model_construct(**values)
+
+    def take(self, rows: Iterable[int]) -> "TimeEntryFrame":
+        """New frame holding the given rows, in the given order. Interned strings are shared."""
+        frame = TimeEntryFrame()
+        # Copies of the lookup tables, not the strings, so appending to one frame leaves the other alone
+        frame._tag_names = list(self._tag_names)
+        frame._tag_pool = dict(self._tag_pool)
+        frame._description_pool = dict(self._description_pool)
+        for row in rows:
+            for name, column in self._ints.items():
+                frame._ints[name].append(column[row])
+            for name, column in self._times.items():
+                frame._times[name].append(column[row])
+            frame._billable.append(self._billable[row])
+            frame._descriptions.append(self._descriptions[row])
+            frame._tags.append(self._tags.get(row))
+            frame._tag_ids.append(self._tag_ids.get(row))
+        return frame
+
+    def filter(
+        self,
+        predicate: Callable[[int], bool] | None = None,
+        *,
+        workspace_id: int | None = None,
+        project_id: int | None = None,
+        billable: bool | None = None,
+        tag: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        running: bool | None = None,
+    ) -> "TimeEntryFrame":
+        """New frame with the rows matching every given criterion. Works on the columns only.
+
+        Args:
+            predicate (Callable[[int], bool] | None, optional): Called with each row index that passes the
+                other criteria. Use `column()`/`tags()` inside it rather than materializing.
+            workspace_id (int | None, optional): Keep rows in this workspace.
+            project_id (int | None, optional): Keep rows in this project.
+            billable (bool | None, optional): Keep rows with this billable flag.
+            tag (str | None, optional): Keep rows carrying this tag.
+            start (datetime | None, optional): Keep rows starting at or after this time.
+            end (datetime | None, optional): Keep rows starting before this time.
+            running (bool | None, optional): Keep only running (True) or only finished (False) rows.
+
+        Returns:
+            TimeEntryFrame: The matching rows.
+        """
+        rows: Iterable[int] = range(len(self))
+        if workspace_id is not None:
+            column = self._ints["workspace_id"]
+            rows = [i for i in rows if column[i] == workspace_id]
+        if project_id is not None:
+            column = self._ints["project_id"]
+            rows = [i for i in rows if column[i] == project_id]
+        if billable is not None:
+            rows = [i for i in rows if bool(self._billable[i]) is billable]
+        if tag is not None:
+            index = self._tag_pool.get(tag)
+            if index is None:
+                return self.take([])
+            rows = [i for i in rows if index in (self._tags.get(i) or ())]
+        if start is not None or end is not None:
+            column = self._times["start"]
+            lo = NULL + 1 if start is None else _to_epoch(start)
+            hi = None if end is None else _to_epoch(end)
+            rows = [
+                i
+                for i in rows
+                if column[i] != NULL
+                and column[i] >= lo
+                and (hi is None or column[i] < hi)
+            ]
+        if running is not None:
+            column = self._ints["duration"]
+            rows = [i for i in rows if (column[i] < 0) is running]
+        if predicate is not None:
+            rows = [i for i in rows if predicate(i)]
+        return self.take(rows)
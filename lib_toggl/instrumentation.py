@@ -0,0 +1,473 @@
+"""Where the time goes: per-request timings, decode time, retries and rate limit waits.
+
+`Toggl(instrumentation=...)` reports everything it does to an `Instrumentation`, tagged with the
+logical operation it was part of (`update_tags`, `get_time_entries`, ...). The operation is
+whichever public client method was called first; the requests it makes on the way, including the
+ones in concurrent sub-tasks, are attributed to it.
+
+- `Instrumentation`: does nothing, and costs nothing. The default.
+- `LoggingInstrumentation`: one structured log event per request, decode, retry and operation.
+- `MetricsInstrumentation`: in-process counters and totals, see `InstrumentationMetrics`.
+- `OpenTelemetryInstrumentation`: a span per operation with a child span per request. Needs the
+  `opentelemetry-api` package.
+
+Subclass `Instrumentation` and override the `on_*` methods to send events anywhere else.
+
+Request phases (DNS, connect, waiting for a free socket) come from an aiohttp `TraceConfig`.
+Sessions from a `ConnectionPool` have it already; add `timing_trace_config()` to the
+`trace_configs` of an injected session to get them there too. TLS happens as part of connecting
+and is counted in `connect`; aiohttp has no separate signal for it.
+"""
+
+import contextvars
+import functools
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import aiohttp
+from pydantic import BaseModel, Field
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - depends on the environment
+    otel_trace = None
+
+_operation: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "lib_toggl_operation", default=None
+)
+
+
+def current_operation() -> str | None:
+    """Name of the client operation the calling code is running in, if any."""
+    return _operation.get()
+
+
+##
+# Events
+##
+
+
+class OperationTiming(BaseModel):
+    """One call of a public client method."""
+
+    operation: str
+    seconds: float
+    error: str | None = Field(default=None, description="Exception type, if it raised.")
+
+
+class RequestTiming(BaseModel):
+    """One HTTP request; every retry is a request of its own. Phases are in seconds, None if they didn't happen."""
+
+    operation: str | None = None
+    method: str
+    url: str = Field(description="Without the query string.")
+    attempt: int = Field(
+        default=0, description="0 for the first try, 1 for the first retry, ..."
+    )
+    status: int | None = None
+    error: str | None = Field(
+        default=None,
+        description="Exception type, if the request failed without a response.",
+    )
+    started_at_ns: int = Field(description="Wall clock start, `time.time_ns()`.")
+    queued: float | None = Field(
+        default=None, description="Waiting for a free socket in the pool."
+    )
+    dns: float | None = None
+    connect: float | None = Field(
+        default=None, description="Opening the socket, TLS handshake included."
+    )
+    reused_connection: bool = False
+    ttfb: float | None = Field(
+        default=None, description="From sending the request to the response headers."
+    )
+    body: float | None = Field(default=None, description="Reading the response body.")
+    total: float
+    bytes: int | None = Field(default=None, description="Response body size.")
+
+
+class DecodeTiming(BaseModel):
+    """Turning one response body into models."""
+
+    operation: str | None = None
+    mode: str = Field(
+        description="DecodeMode value for models, codec name for plain JSON."
+    )
+    bytes: int
+    items: int | None = Field(
+        default=None, description="Models (or list items) produced."
+    )
+    seconds: float
+
+
+class RetryEvent(BaseModel):
+    """A failed request that is about to be sent again."""
+
+    operation: str | None = None
+    method: str
+    url: str
+    attempt: int = Field(description="The attempt that failed.")
+    reason: str = Field(description="HTTP status or exception type.")
+    delay: float = Field(description="Seconds until the next attempt.")
+
+
+class RateLimitWait(BaseModel):
+    """Time a request spent held back by the client's own rate limiter."""
+
+    operation: str | None = None
+    seconds: float
+
+
+##
+# Request phase timing
+##
+
+
+class RequestTimer:
+    """Collects the phases of one request. Passed to aiohttp as `trace_request_ctx`."""
+
+    __slots__ = (
+        "_headers_at",
+        "_marks",
+        "_started",
+        "_started_ns",
+        "attempt",
+        "method",
+        "operation",
+        "phases",
+        "reused",
+        "status",
+        "url",
+    )
+
+    def __init__(self, method: str, url: str, attempt: int) -> None:
+        self.method = method
+        self.url = url.split("?", 1)[0]
+        self.attempt = attempt
+        self.operation = _operation.get()
+        self._started = time.perf_counter()
+        self._started_ns = time.time_ns()
+        self._marks: dict[str, float] = {}
+        self.phases: dict[str, float] = {}
+        self.reused = False
+        self.status: int | None = None
+        self._headers_at: float | None = None
+
+    def start(self, phase: str) -> None:
+        self._marks[phase] = time.perf_counter()
+
+    def end(self, phase: str) -> None:
+        started = self._marks.pop(phase, None)
+        if started is not None:
+            self.phases[phase] = (
+                self.phases.get(phase, 0.0) + time.perf_counter() - started
+            )
+
+    def headers_received(self, status: int) -> None:
+        self.status = status
+        self._headers_at = time.perf_counter()
+
+    def finish(
+        self, body_bytes: int | None = None, error: BaseException | None = None
+    ) -> RequestTiming:
+        now = time.perf_counter()
+        ttfb = body = None
+        if self._headers_at is not None:
+            ttfb = self._headers_at - self._started
+            # Time spent in the pool or connecting isn't time waiting for the server
+            ttfb -= sum(self.phases.get(x, 0.0) for x in ("queued", "dns", "connect"))
+            if body_bytes is not None:
+                body = now - self._headers_at
+        return RequestTiming(
+            operation=self.operation,
+            method=self.method,
+            url=self.url,
+            attempt=self.attempt,
+            status=self.status,
+            error=None if error is None else type(error).__name__,
+            started_at_ns=self._started_ns,
+            queued=self.phases.get("queued"),
+            dns=self.phases.get("dns"),
+            connect=self.phases.get("connect"),
+            reused_connection=self.reused,
+            ttfb=ttfb,
+            body=body,
+            total=now - self._started,
+            bytes=body_bytes,
+        )
+
+
+def timing_trace_config() -> aiohttp.TraceConfig:
+    """TraceConfig that fills in the phases of requests sent with a `RequestTimer` as `trace_request_ctx`."""
+
+    def phase(name: str, end: bool):
+        async def callback(_session, ctx: SimpleNamespace, _params):
+            timer = ctx.trace_request_ctx
+            if isinstance(timer, RequestTimer):
+                if end:
+                    timer.end(name)
+                else:
+                    timer.start(name)
+
+        return callback
+
+    async def on_reuse(_session, ctx: SimpleNamespace, _params):
+        timer = ctx.trace_request_ctx
+        if isinstance(timer, RequestTimer):
+            timer.reused = True
+
+    trace = aiohttp.TraceConfig()
+    trace.on_connection_queued_start.append(phase("queued", False))
+    trace.on_connection_queued_end.append(phase("queued", True))
+    trace.on_dns_resolvehost_start.append(phase("dns", False))
+    trace.on_dns_resolvehost_end.append(phase("dns", True))
+    trace.on_connection_create_start.append(phase("connect", False))
+    trace.on_connection_create_end.append(phase("connect", True))
+    trace.on_connection_reuseconn.append(on_reuse)
+    return trace
+
+
+##
+# Sinks
+##
+
+
+class Instrumentation:
+    """Receives instrumentation events. This base class ignores them; `enabled` is False so the client doesn't even collect them."""
+
+    enabled = False
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        """Wraps one operation. Reports it to `on_operation()` when it is done."""
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            self.on_operation(
+                OperationTiming(
+                    operation=name, seconds=time.perf_counter() - started, error=error
+                )
+            )
+
+    def on_operation(self, event: OperationTiming) -> None:
+        """A client operation finished."""
+
+    def on_request(self, event: RequestTiming) -> None:
+        """A request got its response (or failed without one)."""
+
+    def on_decode(self, event: DecodeTiming) -> None:
+        """A response body was decoded."""
+
+    def on_retry(self, event: RetryEvent) -> None:
+        """A request is about to be retried."""
+
+    def on_rate_limit_wait(self, event: RateLimitWait) -> None:
+        """A request had to wait for the rate limiter."""
+
+
+class LoggingInstrumentation(Instrumentation):
+    """Logs every event, with its fields as structured data."""
+
+    enabled = True
+
+    def on_operation(self, event: OperationTiming) -> None:
+        log.info("toggl.operation", extra=event.model_dump())
+
+    def on_request(self, event: RequestTiming) -> None:
+        log.info("toggl.request", extra=event.model_dump())
+
+    def on_decode(self, event: DecodeTiming) -> None:
+        log.info("toggl.decode", extra=event.model_dump())
+
+    def on_retry(self, event: RetryEvent) -> None:
+        log.info("toggl.retry", extra=event.model_dump())
+
+    def on_rate_limit_wait(self, event: RateLimitWait) -> None:
+        log.info("toggl.rate_limit_wait", extra=event.model_dump())
+
+
+class Totals(BaseModel):
+    """Count, sum and max of a duration."""
+
+    count: int = 0
+    seconds: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Counts one more occurrence."""
+        self.count += 1
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+
+
+class InstrumentationMetrics(BaseModel):
+    """Everything `MetricsInstrumentation` has counted. Keys of the per-operation dicts are operation names; None is outside of any."""
+
+    operations: dict[str, Totals] = Field(default_factory=dict)
+    operation_errors: dict[str, int] = Field(default_factory=dict)
+    requests: dict[str | None, Totals] = Field(default_factory=dict)
+    statuses: dict[int, int] = Field(default_factory=dict)
+    phases: dict[str, Totals] = Field(
+        default_factory=dict, description="queued, dns, connect, ttfb and body."
+    )
+    decode: dict[str | None, Totals] = Field(default_factory=dict)
+    retries: dict[str, int] = Field(
+        default_factory=dict, description="Keyed by reason."
+    )
+    rate_limit_waits: Totals = Field(default_factory=Totals)
+
+
+class MetricsInstrumentation(Instrumentation):
+    """Keeps running totals in memory. Read them with `metrics`, start over with `reset()`."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._metrics = InstrumentationMetrics()
+
+    @property
+    def metrics(self) -> InstrumentationMetrics:
+        """Snapshot of the totals."""
+        return self._metrics.model_copy(deep=True)
+
+    def reset(self) -> None:
+        """Zeroes every total."""
+        self._metrics = InstrumentationMetrics()
+
+    def on_operation(self, event: OperationTiming) -> None:
+        self._metrics.operations.setdefault(event.operation, Totals()).add(
+            event.seconds
+        )
+        if event.error is not None:
+            errors = self._metrics.operation_errors
+            errors[event.operation] = errors.get(event.operation, 0) + 1
+
+    def on_request(self, event: RequestTiming) -> None:
+        metrics = self._metrics
+        metrics.requests.setdefault(event.operation, Totals()).add(event.total)
+        if event.status is not None:
+            metrics.statuses[event.status] = metrics.statuses.get(event.status, 0) + 1
+        for phase in ("queued", "dns", "connect", "ttfb", "body"):
+            seconds = getattr(event, phase)
+            if seconds is not None:
+                metrics.phases.setdefault(phase, Totals()).add(seconds)
+
+    def on_decode(self, event: DecodeTiming) -> None:
+        self._metrics.decode.setdefault(event.operation, Totals()).add(event.seconds)
+
+    def on_retry(self, event: RetryEvent) -> None:
+        retries = self._metrics.retries
+        retries[event.reason] = retries.get(event.reason, 0) + 1
+
+    def on_rate_limit_wait(self, event: RateLimitWait) -> None:
+        self._metrics.rate_limit_waits.add(event.seconds)
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """A span per operation (`toggl.<operation>`), a child span per request; decodes, retries and rate limit waits
+    are events on the current span.
+    """
+
+    enabled = True
+
+    def __init__(self, tracer_provider=None) -> None:
+        """
+        Args:
+            tracer_provider (TracerProvider | None, optional): Provider to get the tracer from. Defaults to the global one.
+
+        Raises:
+            RuntimeError: If opentelemetry-api is not installed.
+        """
+        if otel_trace is None:
+            raise RuntimeError("opentelemetry-api is not installed.")
+        self._tracer = otel_trace.get_tracer(
+            "lib_toggl", tracer_provider=tracer_provider
+        )
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        with self._tracer.start_as_current_span(f"toggl.{name}"):
+            yield
+
+    def on_request(self, event: RequestTiming) -> None:
+        attributes = {
+            "http.request.method": event.method,
+            "url.full": event.url,
+            "toggl.attempt": event.attempt,
+            "toggl.reused_connection": event.reused_connection,
+        }
+        if event.status is not None:
+            attributes["http.response.status_code"] = event.status
+        if event.error is not None:
+            attributes["error.type"] = event.error
+        if event.bytes is not None:
+            attributes["http.response.body.size"] = event.bytes
+        for phase in ("queued", "dns", "connect", "ttfb", "body"):
+            seconds = getattr(event, phase)
+            if seconds is not None:
+                attributes[f"toggl.{phase}_ms"] = seconds * 1000
+        # The request is over by the time we hear about it; back-date the span
+        span = self._tracer.start_span(
+            event.method,
+            kind=otel_trace.SpanKind.CLIENT,  # pyright: ignore[reportOptionalMemberAccess]
+            start_time=event.started_at_ns,
+            attributes=attributes,  # pyright: ignore
+        )
+        span.end(end_time=event.started_at_ns + int(event.total * 1e9))
+
+    def _event(self, name: str, event: BaseModel) -> None:
+        span = otel_trace.get_current_span()  # pyright: ignore[reportOptionalMemberAccess]
+        attributes = {k: v for k, v in event.model_dump().items() if v is not None}
+        span.add_event(name, attributes=attributes)
+
+    def on_decode(self, event: DecodeTiming) -> None:
+        self._event("toggl.decode", event)
+
+    def on_retry(self, event: RetryEvent) -> None:
+        self._event("toggl.retry", event)
+
+    def on_rate_limit_wait(self, event: RateLimitWait) -> None:
+        self._event("toggl.rate_limit_wait", event)
+
+
+def instrumented(name: str | None = None):
+    """Marks an async `Toggl` method as an operation. Only the outermost operation of a call is reported."""
+
+    def decorate(func):
+        operation = name or func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if _operation.get() is not None:
+                return await func(self, *args, **kwargs)
+            token = _operation.set(operation)
+            try:
+                instrumentation = self._instrumentation
+                if not instrumentation.enabled:
+                    return await func(self, *args, **kwargs)
+                with instrumentation.operation(operation):
+                    return await func(self, *args, **kwargs)
+            finally:
+                _operation.reset(token)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,121 @@
+"""Cheap debug logging of request and response payloads.
+
+The client used to hand whole payloads (every Time Entry of a 30 day window, say) to
+`log.debug()`, which then rendered them whether or not anybody was looking. `debug_payload()`
+does nothing unless debug logging is on for the logger, and even then only wraps the payload in
+a `LazyPayload` that is rendered, truncated, when the log line is actually formatted.
+
+    configure_payload_logging(enabled=False)        # never capture payloads
+    configure_payload_logging(max_chars=None)       # capture them whole
+    configure_payload_logging(sample_rate=0.01)     # one payload log line in a hundred
+"""
+
+import logging
+import random
+import reprlib
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from .const import LOG_PAYLOAD_MAX_CHARS
+
+
+class PayloadLogging(BaseModel):
+    """How payloads are logged."""
+
+    enabled: bool = Field(
+        default=True, description="False skips payload log lines entirely."
+    )
+
+    max_chars: int | None = Field(
+        default=LOG_PAYLOAD_MAX_CHARS,
+        ge=16,
+        description="Payloads are cut to this many characters. None keeps them whole.",
+    )
+
+    sample_rate: float = Field(
+        default=1.0,
+        ge=0,
+        le=1,
+        description="Share of payload log lines that are emitted.",
+    )
+
+
+_settings = PayloadLogging()
+
+
+def configure_payload_logging(**kwargs) -> PayloadLogging:
+    """Changes how payloads are logged, process wide. Takes the fields of `PayloadLogging`; returns the new settings."""
+    global _settings  # pylint: disable=global-statement
+    _settings = PayloadLogging(**{**_settings.model_dump(), **kwargs})
+    return _settings
+
+
+def payload_logging() -> PayloadLogging:
+    """Current settings."""
+    return _settings
+
+
+def _repr(max_chars: int) -> reprlib.Repr:
+    # Limits apply while rendering, so a 100k item list costs a handful of items, not the whole list
+    limits = reprlib.Repr()
+    limits.maxlist = limits.maxtuple = limits.maxset = limits.maxdict = 16
+    limits.maxlevel = 4
+    limits.maxstring = limits.maxother = max_chars
+    return limits
+
+
+class LazyPayload:
+    """Renders a payload when the log record is formatted, not when it is created."""
+
+    __slots__ = ("max_chars", "value")
+
+    def __init__(self, value: Any, max_chars: int | None) -> None:
+        self.value = value
+        self.max_chars = max_chars
+
+    def __repr__(self) -> str:
+        value = self.value
+        limit = self.max_chars
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            size = len(value)
+            text = bytes(value[: limit * 4] if limit else value).decode(
+                errors="replace"
+            )
+        elif isinstance(value, str):
+            size = len(value)
+            text = value[:limit] if limit else value
+        else:
+            size = None
+            text = repr(value) if limit is None else _repr(limit).repr(value)
+        if limit is not None and (
+            len(text) > limit or (size is not None and size > len(text))
+        ):
+            more = "" if size is None else f" of {size}"
+            text = f"{text[:limit]}... (truncated{more})"
+        return text
+
+    __str__ = __repr__
+
+
+def payloads_enabled(logger: Any) -> bool:
+    """True if payloads should be captured for `logger`: payload logging is on and it logs at debug level."""
+    if not _settings.enabled:
+        return False
+    # structlog spells it is_enabled_for, the logging module isEnabledFor
+    check = getattr(logger, "is_enabled_for", None) or getattr(
+        logger, "isEnabledFor", None
+    )
+    return check is None or bool(check(logging.DEBUG))
+
+
+def debug_payload(logger: Any, event: str, **payloads: Any) -> None:
+    """`logger.debug(event, extra=payloads)`, if payloads are enabled, with each payload rendered lazily."""
+    if not payloads_enabled(logger):
+        return
+    if _settings.sample_rate < 1 and random.random() >= _settings.sample_rate:
+        return
+    max_chars = _settings.max_chars
+    logger.debug(
+        event, extra={k: LazyPayload(v, max_chars) for k, v in payloads.items()}
+    )
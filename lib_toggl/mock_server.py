@@ -0,0 +1,1323 @@
+"""In-process stand-in for the Toggl v9 API, for load tests and benchmarks.
+
+`MockToggl` is an aiohttp server on localhost that implements the endpoints this library uses
+(`/me`, `/workspaces`, Tags, Projects, Clients, Tasks, Time Entries: list/since, current, by ID,
+create, edit, stop, bulk edit, delete, webhook subscriptions, and the summary, detailed and weekly
+reports) against in-memory data. Point a client at it with `base_url`:
+
+    async with MockToggl(MockConfig(latency=0.05, error_rate=0.01)) as server:
+        server.seed_time_entries(10_000)
+        async with Toggl("any-token", base_url=server.base_url) as client:
+            ...
+
+On top of the fake data it can get in the way like the real thing does, per API token:
+
+- `latency`/`latency_jitter`: delay every response.
+- `error_rate`: answer a share of requests with `error_status` (503 by default) before handling them.
+- `rate_limit`/`rate_limit_burst`: leaky bucket, 429 with `Retry-After` when it overflows.
+- `quota`/`quota_window`: hourly quota, reported in the `X-Toggl-Quota-*` headers, 402 once used up.
+
+Webhook subscriptions are validated against their callback URL like the real thing, and Time
+Entry and Tag changes made through the API are delivered to them, signed with their secret.
+
+It can also record a session against the real API (`record=`) and serve it back later
+(`replay=`) instead of the built-in fake. Recordings are JSON; `api_token` values are scrubbed,
+the Authorization header is never stored.
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import secrets
+import time
+from collections import defaultdict, deque
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import web
+from pydantic import BaseModel, Field, TypeAdapter
+
+from .const import (
+    BASE,
+    QUOTA_REMAINING_HEADER,
+    QUOTA_RESETS_IN_HEADER,
+    REPORTS_BASE,
+    REPORTS_NEXT_ID_HEADER,
+    REPORTS_NEXT_ROW_NUMBER_HEADER,
+    REPORTS_NEXT_TIMESTAMP_HEADER,
+    WEBHOOKS_BASE,
+)
+from .webhooks import ENTITY_MODELS, build_event, signed_request
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+# "/api/v9"; everything the server answers lives under it
+PREFIX = urlsplit(BASE).path
+WEBHOOKS_PREFIX = urlsplit(WEBHOOKS_BASE).path
+REPORTS_PREFIX = urlsplit(REPORTS_BASE).path
+
+# Headers worth keeping in a recording
+_RECORDED_HEADERS = ("Content-Type", QUOTA_REMAINING_HEADER, QUOTA_RESETS_IN_HEADER)
+
+# Fields of a Time Entry and the legacy names the API still returns them under
+_LEGACY_FIELDS = {
+    "workspace_id": "wid",
+    "project_id": "pid",
+    "task_id": "tid",
+    "user_id": "uid",
+}
+
+
+class MockConfig(BaseModel):
+    """How `MockToggl` misbehaves. The defaults answer everything instantly and never fail."""
+
+    latency: float = Field(
+        default=0.0, ge=0, description="Seconds added to every response."
+    )
+
+    latency_jitter: float = Field(
+        default=0.0,
+        ge=0,
+        description="Up to this many extra seconds, picked at random per response.",
+    )
+
+    error_rate: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="Share of requests answered with `error_status` without being handled.",
+    )
+
+    error_status: int = Field(
+        default=503, ge=400, le=599, description="Status used for injected errors."
+    )
+
+    rate_limit: float | None = Field(
+        default=None,
+        gt=0,
+        description="Requests per second per token before 429s. None disables the limit.",
+    )
+
+    rate_limit_burst: int = Field(
+        default=1, ge=1, description="Requests a token can send back-to-back."
+    )
+
+    quota: int | None = Field(
+        default=None,
+        ge=0,
+        description="Requests per token per `quota_window` before 402s. None disables the quota.",
+    )
+
+    quota_window: float = Field(
+        default=60 * 60, gt=0, description="Seconds until a used-up quota resets."
+    )
+
+    related_data: bool = Field(
+        default=True,
+        description="Honour /me?with_related_data=true. False answers it like a plain /me.",
+    )
+
+    seed: int | None = Field(
+        default=None,
+        description="Seeds the random number generator, for repeatable runs.",
+    )
+
+
+class MockStats(BaseModel):
+    """What the server has seen since it started or was last `reset()`."""
+
+    requests: int = 0
+    by_status: dict[int, int] = Field(default_factory=dict)
+    by_route: dict[str, int] = Field(
+        default_factory=dict, description='Keyed by "METHOD /path pattern".'
+    )
+
+    def reset(self) -> None:
+        """Zeroes every counter."""
+        self.requests = 0
+        self.by_status.clear()
+        self.by_route.clear()
+
+
+class RecordedExchange(BaseModel):
+    """One request and the response the server gave it."""
+
+    method: str
+    path: str = Field(
+        description="Path relative to the API root, e.g. /me/time_entries."
+    )
+    query: str = Field(
+        default="", description="Query string with the parameters sorted."
+    )
+    status: int
+    headers: dict[str, str] = Field(default_factory=dict)
+    body: str = ""
+
+
+_RECORDING = TypeAdapter(list[RecordedExchange])
+
+
+def load_recording(path: str | os.PathLike) -> list[RecordedExchange]:
+    """Reads a recording written by `MockToggl(record=...)`."""
+    with open(path, "rb") as f:
+        return _RECORDING.validate_json(f.read())
+
+
+def save_recording(path: str | os.PathLike, exchanges: list[RecordedExchange]) -> None:
+    """Writes a recording `MockToggl(replay=...)` can serve."""
+    with open(path, "wb") as f:
+        f.write(_RECORDING.dump_json(exchanges, indent=2))
+
+
+def _canonical_query(request: web.Request) -> str:
+    return "&".join(f"{k}={v}" for k, v in sorted(request.query.items()))
+
+
+def _scrub(obj: Any) -> Any:
+    """Replaces every `api_token` in a decoded JSON document."""
+    if isinstance(obj, dict):
+        return {
+            k: "redacted" if k == "api_token" else _scrub(v) for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_scrub(x) for x in obj]
+    return obj
+
+
+def _iso(dt: datetime | None) -> str | None:
+    return None if dt is None else dt.isoformat()
+
+
+def _parse_time(value: Any) -> datetime | None:
+    if value is None:
+        return None
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=UTC)
+
+
+def _error(status: int, message: str) -> web.Response:
+    # Toggl answers errors with a JSON encoded string
+    return web.json_response(message, status=status)
+
+
+class _TokenLimits:
+    """Rate limit and quota bookkeeping for one API token."""
+
+    __slots__ = ("allowance", "last", "quota_reset_at", "quota_used")
+
+    def __init__(self, burst: int) -> None:
+        self.allowance = float(burst)
+        self.last = time.monotonic()
+        self.quota_used = 0
+        self.quota_reset_at = 0.0
+
+
+class MockToggl:
+    """Fake Toggl v9 API server. Use as an async context manager, or call `start()` and `close()`."""
+
+    def __init__(
+        self,
+        config: MockConfig | None = None,
+        replay: str | os.PathLike | None = None,
+        record: str | os.PathLike | None = None,
+        upstream: str = BASE,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Args:
+            config (MockConfig | None, optional): Latency, errors and limits. Defaults to MockConfig().
+            replay (str | os.PathLike | None, optional): Serve this recording instead of the fake data.
+                Each request gets the next recorded response for the same method, path and query; the last one
+                is repeated once they run out. Defaults to None.
+            record (str | os.PathLike | None, optional): Forward every request to `upstream` and write what
+                happened to this file on `close()`. Defaults to None.
+            upstream (str, optional): API root requests are forwarded to when recording. Defaults to the real API.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on. Defaults to 0, any free port.
+        """
+        if replay is not None and record is not None:
+            raise ValueError("Pass either replay or record, not both.")
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self._random = random.Random(self.config.seed)
+        self._limits: dict[str, _TokenLimits] = {}
+        self._host = host
+        self._port = port
+        self._runner: web.AppRunner | None = None
+
+        self._record_path = record
+        self._upstream = upstream.rstrip("/")
+        self._upstream_session: aiohttp.ClientSession | None = None
+        self.recording: list[RecordedExchange] = []
+        self._replay: dict[tuple[str, str, str], deque[RecordedExchange]] = defaultdict(
+            deque
+        )
+        if replay is not None:
+            for exchange in load_recording(replay):
+                self._replay[(exchange.method, exchange.path, exchange.query)].append(
+                    exchange
+                )
+
+        now = datetime.now(UTC)
+        self.user_id = 1
+        self.account: dict[str, Any] = {
+            "id": self.user_id,
+            "api_token": "mock-api-token",
+            "email": "mock@example.com",
+            "fullname": "Mock User",
+            "timezone": "UTC",
+            "toggl_accounts_id": "mock",
+            "default_workspace_id": 1,
+            "beginning_of_week": 1,
+            "image_url": "https://example.com/avatar.png",
+            "created_at": _iso(now),
+            "updated_at": _iso(now),
+            "openid_email": None,
+            "openid_enabled": False,
+            "country_id": None,
+            "has_password": True,
+            "at": _iso(now),
+        }
+        self.workspaces: dict[int, dict[str, Any]] = {}
+        self.tags: dict[int, dict[int, dict[str, Any]]] = {}
+        self.time_entries: dict[int, dict[str, Any]] = {}
+        self.projects: dict[int, dict[str, Any]] = {}
+        self.clients: dict[int, dict[str, Any]] = {}
+        self.tasks: dict[int, dict[str, Any]] = {}
+        self.subscriptions: dict[int, dict[str, Any]] = {}
+        self._deliveries: set[asyncio.Task] = set()
+        self._webhook_session: aiohttp.ClientSession | None = None
+        self._next_id = 1000
+        self.add_workspace(1, "Mock Workspace")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *excinfo):
+        await self.close()
+
+    @property
+    def base_url(self) -> str:
+        """API root to pass to `Toggl(base_url=...)`."""
+        if self._runner is None:
+            raise RuntimeError("The server is not running.")
+        return f"http://{self._host}:{self._port}{PREFIX}"
+
+    async def start(self) -> None:
+        """Starts listening."""
+        app = web.Application(middlewares=[self._middleware])
+        if self._record_path is not None:
+            app.router.add_route("*", PREFIX + "/{tail:.*}", self._forward)
+        elif self._replay:
+            app.router.add_route("*", PREFIX + "/{tail:.*}", self._serve_recorded)
+        else:
+            self._add_routes(app.router)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+        # Port 0 means the OS picked one
+        self._port = self._runner.addresses[0][1]
+        log.debug("mock Toggl listening on %s", self.base_url)
+
+    async def close(self) -> None:
+        """Stops the server and, when recording, writes the recording."""
+        await self.drain_webhooks()
+        if self._webhook_session is not None:
+            await self._webhook_session.close()
+            self._webhook_session = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._upstream_session is not None:
+            await self._upstream_session.close()
+            self._upstream_session = None
+        if self._record_path is not None:
+            save_recording(self._record_path, self.recording)
+
+    ##
+    # Fake data
+    ##
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def add_workspace(self, workspace_id: int, name: str, **fields) -> dict[str, Any]:
+        """Adds (or replaces) a workspace. Extra `fields` are returned as-is."""
+        workspace = {
+            "id": workspace_id,
+            "name": name,
+            "api_token": "mock-api-token",
+            "admin": True,
+            "business_ws": False,
+            "only_admins_may_create_projects": False,
+            "only_admins_may_create_tags": False,
+            "only_admins_see_billable_rates": False,
+            "only_admins_see_team_dashboard": False,
+            "organization_id": 1,
+            "rounding": 1,
+            "rounding_minutes": 0,
+            "at": _iso(datetime.now(UTC)),
+            **fields,
+        }
+        self.workspaces[workspace_id] = workspace
+        self.tags.setdefault(workspace_id, {})
+        return workspace
+
+    def add_tag(self, workspace_id: int, name: str) -> dict[str, Any]:
+        """Adds a Tag, or returns the existing one with that name."""
+        tags = self.tags.setdefault(workspace_id, {})
+        for tag in tags.values():
+            if tag["name"] == name:
+                return tag
+        tag = {
+            "id": self._new_id(),
+            "name": name,
+            "workspace_id": workspace_id,
+            "creator_id": self.user_id,
+            "at": _iso(datetime.now(UTC)),
+            "deleted_at": None,
+        }
+        tags[tag["id"]] = tag
+        self.publish("tag", "created", tag, workspace_id)
+        return tag
+
+    def add_client(self, workspace_id: int, name: str, **fields) -> dict[str, Any]:
+        """Adds a Client. Like the API, it carries `wid` rather than `workspace_id`."""
+        client = {
+            "id": self._new_id(),
+            "wid": workspace_id,
+            "name": name,
+            "archived": False,
+            "creator_id": self.user_id,
+            "notes": None,
+            "at": _iso(datetime.now(UTC)),
+            **fields,
+        }
+        self.clients[client["id"]] = client
+        return client
+
+    def add_project(
+        self, workspace_id: int, name: str, client_id: int | None = None, **fields
+    ) -> dict[str, Any]:
+        """Adds a Project, optionally for a Client."""
+        project = {
+            "id": self._new_id(),
+            "workspace_id": workspace_id,
+            "client_id": client_id,
+            "name": name,
+            "active": True,
+            "is_private": False,
+            "billable": False,
+            "color": "#06aaf5",
+            "at": _iso(datetime.now(UTC)),
+            "server_deleted_at": None,
+            **fields,
+        }
+        self.projects[project["id"]] = project
+        return project
+
+    def add_task(self, project_id: int, name: str, **fields) -> dict[str, Any]:
+        """Adds a Task to a Project."""
+        task = {
+            "id": self._new_id(),
+            "workspace_id": self.projects[project_id]["workspace_id"],
+            "project_id": project_id,
+            "name": name,
+            "active": True,
+            "user_id": None,
+            "estimated_seconds": None,
+            "tracked_seconds": 0,
+            "at": _iso(datetime.now(UTC)),
+            "server_deleted_at": None,
+            **fields,
+        }
+        self.tasks[task["id"]] = task
+        return task
+
+    def add_time_entry(self, workspace_id: int = 1, **fields) -> dict[str, Any]:
+        """Adds a Time Entry. `start`/`stop` may be datetimes or RFC3339 strings."""
+        now = datetime.now(UTC)
+        te: dict[str, Any] = {
+            "id": self._new_id(),
+            "workspace_id": workspace_id,
+            "project_id": None,
+            "task_id": None,
+            "user_id": self.user_id,
+            "billable": False,
+            "description": None,
+            "tags": [],
+            "tag_ids": [],
+            "duration": -1,
+            "start": now,
+            "stop": None,
+            "at": now,
+            "server_deleted_at": None,
+        }
+        for key, value in fields.items():
+            if key in ("start", "stop") and isinstance(value, str):
+                value = _parse_time(value)
+            te[key] = value
+        self._reconcile(te)
+        self.time_entries[te["id"]] = te
+        return te
+
+    def seed_time_entries(
+        self,
+        count: int,
+        start: datetime | None = None,
+        spacing: timedelta = timedelta(hours=1),
+        duration: timedelta = timedelta(minutes=45),
+        workspace_id: int = 1,
+        tags: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Adds `count` finished Time Entries, `spacing` apart, ending before now unless `start` says otherwise.
+
+        Tags are cycled through, one per entry; descriptions cycle through a handful of values.
+        """
+        if start is None:
+            start = datetime.now(UTC) - spacing * count
+        tags = tags or ["dev", "meeting", "review"]
+        descriptions = ["Standup", "Code review", "Planning", "Support", "Writing"]
+        return [
+            self.add_time_entry(
+                workspace_id,
+                start=start + spacing * i,
+                stop=start + spacing * i + duration,
+                duration=int(duration.total_seconds()),
+                description=descriptions[i % len(descriptions)],
+                tags=[tags[i % len(tags)]],
+            )
+            for i in range(count)
+        ]
+
+    def _reconcile(self, te: dict[str, Any]) -> None:
+        """Keeps tags and tag_ids, and stop and duration, consistent the way the API does."""
+        workspace_id = te["workspace_id"]
+        if te.get("tags"):
+            te["tags"] = list(dict.fromkeys(te["tags"]))
+            te["tag_ids"] = [
+                self.add_tag(workspace_id, name)["id"] for name in te["tags"]
+            ]
+        elif te.get("tag_ids"):
+            known = self.tags.get(workspace_id, {})
+            te["tag_ids"] = [x for x in dict.fromkeys(te["tag_ids"]) if x in known]
+            te["tags"] = [known[x]["name"] for x in te["tag_ids"]]
+        else:
+            te["tags"], te["tag_ids"] = [], []
+        if te["stop"] is not None and te["start"] is not None:
+            te["duration"] = int((te["stop"] - te["start"]).total_seconds())
+        elif te["duration"] >= 0 and te["start"] is not None:
+            te["stop"] = te["start"] + timedelta(seconds=te["duration"])
+
+    def render_time_entry(self, te: dict[str, Any]) -> dict[str, Any]:
+        """A Time Entry as the API returns it."""
+        out = dict(te)
+        for key in ("start", "stop", "at", "server_deleted_at"):
+            out[key] = _iso(te[key])
+        for field, legacy in _LEGACY_FIELDS.items():
+            out[legacy] = te[field]
+        out["duronly"] = True
+        return out
+
+    def _running(self) -> dict[str, Any] | None:
+        for te in self.time_entries.values():
+            if te["duration"] < 0 and te["server_deleted_at"] is None:
+                return te
+        return None
+
+    def _stop(self, te: dict[str, Any], at: datetime) -> None:
+        te["stop"] = at
+        te["duration"] = int((at - te["start"]).total_seconds())
+        te["at"] = at
+
+    ##
+    # Webhooks
+    ##
+
+    def publish(
+        self, model: str, action: str, entity: dict[str, Any], workspace_id: int
+    ) -> None:
+        """Delivers an event to every validated, enabled subscription of the workspace that wants it.
+
+        Changes made through the API publish themselves; this is for everything else.
+        """
+        for subscription in self.subscriptions.values():
+            if (
+                subscription["workspace_id"] != workspace_id
+                or not subscription["enabled"]
+                or subscription["validated_at"] is None
+                or not any(
+                    f["entity"] in (model, "*") and f["action"] in (action, "*")
+                    for f in subscription["event_filters"]
+                )
+            ):
+                continue
+            event = build_event(
+                entity,
+                action,
+                model=model,
+                workspace_id=workspace_id,
+                subscription_id=subscription["subscription_id"],
+            )
+            event["creator_id"] = self.user_id
+            event["url_callback"] = subscription["url_callback"]
+            self._deliver(subscription, event)
+
+    async def drain_webhooks(self) -> None:
+        """Waits until every delivery made so far has been answered."""
+        while self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    def _deliver(self, subscription: dict[str, Any], event: dict[str, Any]) -> None:
+        task = asyncio.ensure_future(self._post_event(subscription, event))
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def _post_event(
+        self, subscription: dict[str, Any], event: dict[str, Any]
+    ) -> None:
+        if self._webhook_session is None:
+            self._webhook_session = aiohttp.ClientSession()
+        body, headers = signed_request(subscription["secret"], event)
+        try:
+            async with self._webhook_session.post(
+                subscription["url_callback"], data=body, headers=headers
+            ) as resp:
+                answer = await resp.read()
+                status = resp.status
+        except aiohttp.ClientError as exc:
+            log.debug("webhook delivery failed", exc_info=exc)
+            return
+        code = event.get("validation_code")
+        if code is not None and status == 200:
+            try:
+                echoed = json.loads(answer).get("validation_code")
+            except (ValueError, AttributeError):
+                echoed = None
+            if echoed == code:
+                subscription["validated_at"] = _iso(datetime.now(UTC))
+
+    def _publish_time_entry(self, action: str, te: dict[str, Any]) -> None:
+        self.publish(
+            "time_entry", action, self.render_time_entry(te), te["workspace_id"]
+        )
+
+    def _render_subscription(self, subscription: dict[str, Any]) -> dict[str, Any]:
+        return {k: v for k, v in subscription.items() if not k.startswith("_")}
+
+    def _subscription(self, request: web.Request) -> dict[str, Any]:
+        subscription = self.subscriptions.get(
+            int(request.match_info["subscription_id"])
+        )
+        if subscription is None or subscription["workspace_id"] != int(
+            request.match_info["workspace_id"]
+        ):
+            raise web.HTTPNotFound(
+                text=json.dumps("Subscription not found"),
+                content_type="application/json",
+            )
+        return subscription
+
+    async def _get_event_filters(self, _request: web.Request) -> web.Response:
+        actions = ["created", "updated", "deleted"]
+        return web.json_response({model: actions for model in ENTITY_MODELS})
+
+    async def _get_subscriptions(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        return web.json_response(
+            [
+                self._render_subscription(x)
+                for x in self.subscriptions.values()
+                if x["workspace_id"] == workspace_id
+            ]
+        )
+
+    def _subscription_fields(
+        self, subscription: dict[str, Any], body: Any
+    ) -> web.Response | None:
+        if not isinstance(body, dict) or not body.get("url_callback"):
+            return _error(400, "url_callback must be set")
+        if not body.get("event_filters"):
+            return _error(400, "event_filters must be set")
+        if subscription.get("url_callback") != body["url_callback"]:
+            # A new URL has to be validated again
+            subscription["validated_at"] = None
+        for key in (
+            "url_callback",
+            "event_filters",
+            "description",
+            "enabled",
+            "secret",
+        ):
+            if key in body:
+                subscription[key] = body[key]
+        subscription["updated_at"] = _iso(datetime.now(UTC))
+        return None
+
+    async def _create_subscription(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        now = _iso(datetime.now(UTC))
+        subscription: dict[str, Any] = {
+            "subscription_id": self._new_id(),
+            "workspace_id": workspace_id,
+            "user_id": self.user_id,
+            "description": "",
+            "enabled": True,
+            "secret": secrets.token_hex(16),
+            "validated_at": None,
+            "has_pending_events": False,
+            "created_at": now,
+        }
+        error = self._subscription_fields(subscription, await self._json_body(request))
+        if error is not None:
+            return error
+        self.subscriptions[subscription["subscription_id"]] = subscription
+        self._request_validation(subscription)
+        return web.json_response(self._render_subscription(subscription))
+
+    def _request_validation(self, subscription: dict[str, Any]) -> None:
+        code = secrets.token_hex(8)
+        subscription["_validation_code"] = code
+        event = build_event(
+            None,
+            subscription_id=subscription["subscription_id"],
+            validation_code=code,
+        )
+        event["validation_code_url"] = (
+            f"{WEBHOOKS_BASE}/validate/{subscription['workspace_id']}/"
+            f"{subscription['subscription_id']}/{code}"
+        )
+        self._deliver(subscription, event)
+
+    async def _update_subscription(self, request: web.Request) -> web.Response:
+        subscription = self._subscription(request)
+        error = self._subscription_fields(subscription, await self._json_body(request))
+        if error is not None:
+            return error
+        if subscription["validated_at"] is None:
+            self._request_validation(subscription)
+        return web.json_response(self._render_subscription(subscription))
+
+    async def _patch_subscription(self, request: web.Request) -> web.Response:
+        subscription = self._subscription(request)
+        body = await self._json_body(request)
+        if not isinstance(body, dict) or not isinstance(body.get("enabled"), bool):
+            return _error(400, "enabled must be set")
+        subscription["enabled"] = body["enabled"]
+        return web.json_response(self._render_subscription(subscription))
+
+    async def _delete_subscription(self, request: web.Request) -> web.Response:
+        subscription = self._subscription(request)
+        del self.subscriptions[subscription["subscription_id"]]
+        return web.Response(status=200)
+
+    async def _ping_subscription(self, request: web.Request) -> web.Response:
+        subscription = self._subscription(request)
+        self._deliver(
+            subscription,
+            build_event(None, subscription_id=subscription["subscription_id"]),
+        )
+        return web.Response(status=200)
+
+    async def _validate_subscription(self, request: web.Request) -> web.Response:
+        subscription = self._subscription(request)
+        if request.match_info["code"] != subscription.get("_validation_code"):
+            return _error(400, "Invalid validation code")
+        subscription["validated_at"] = _iso(datetime.now(UTC))
+        return web.Response(status=200)
+
+    ##
+    # Middleware: auth, injected faults, limits, stats
+    ##
+
+    def _check_limits(self, token: str) -> tuple[web.Response | None, dict[str, str]]:
+        """Spends one request of `token`'s allowance. Returns the response to send instead, if any, and headers."""
+        config = self.config
+        limits = self._limits.get(token)
+        if limits is None:
+            limits = self._limits[token] = _TokenLimits(config.rate_limit_burst)
+        now = time.monotonic()
+        headers: dict[str, str] = {}
+
+        if config.quota is not None:
+            if now >= limits.quota_reset_at:
+                limits.quota_used = 0
+                limits.quota_reset_at = now + config.quota_window
+            resets_in = math.ceil(limits.quota_reset_at - now)
+            if limits.quota_used >= config.quota:
+                headers = {
+                    QUOTA_REMAINING_HEADER: "0",
+                    QUOTA_RESETS_IN_HEADER: str(resets_in),
+                }
+                return _error(402, "Quota exceeded"), headers
+            limits.quota_used += 1
+            headers = {
+                QUOTA_REMAINING_HEADER: str(config.quota - limits.quota_used),
+                QUOTA_RESETS_IN_HEADER: str(resets_in),
+            }
+
+        if config.rate_limit is not None:
+            limits.allowance = min(
+                float(config.rate_limit_burst),
+                limits.allowance + (now - limits.last) * config.rate_limit,
+            )
+            limits.last = now
+            if limits.allowance < 1:
+                retry_after = (1 - limits.allowance) / config.rate_limit
+                # Fractional seconds; the client accepts them and it keeps fast load tests fast
+                headers["Retry-After"] = f"{retry_after:.3f}"
+                return _error(429, "Too Many Requests"), headers
+            limits.allowance -= 1
+
+        return None, headers
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        config = self.config
+        if config.latency or config.latency_jitter:
+            await asyncio.sleep(
+                config.latency + self._random.uniform(0, config.latency_jitter)
+            )
+
+        response: web.StreamResponse | None = None
+        headers: dict[str, str] = {}
+        try:
+            auth = aiohttp.BasicAuth.decode(request.headers.get("Authorization", ""))
+        except ValueError:
+            auth = None
+        if auth is None or not auth.login:
+            response = _error(403, "Incorrect username and/or password")
+        else:
+            response, headers = self._check_limits(auth.login)
+        if response is None and self._random.random() < config.error_rate:
+            response = _error(config.error_status, "Injected failure")
+        if response is None:
+            try:
+                response = await handler(request)
+            except web.HTTPException as exc:
+                response = exc
+        response.headers.update(headers)
+
+        route = request.match_info.route.resource
+        pattern = route.canonical if route is not None else request.path
+        key = f"{request.method} {pattern.removeprefix(PREFIX)}"
+        self.stats.requests += 1
+        self.stats.by_status[response.status] = (
+            self.stats.by_status.get(response.status, 0) + 1
+        )
+        self.stats.by_route[key] = self.stats.by_route.get(key, 0) + 1
+        return response
+
+    ##
+    # Record / replay
+    ##
+
+    async def _forward(self, request: web.Request) -> web.Response:
+        if self._upstream_session is None:
+            self._upstream_session = aiohttp.ClientSession()
+        path = "/" + request.match_info["tail"]
+        headers = {
+            k: v
+            for k, v in request.headers.items()
+            if k.lower() in ("authorization", "content-type")
+        }
+        async with self._upstream_session.request(
+            request.method,
+            self._upstream + path,
+            params=request.query,
+            data=await request.read(),
+            headers=headers,
+        ) as resp:
+            body = await resp.read()
+            kept = {k: resp.headers[k] for k in _RECORDED_HEADERS if k in resp.headers}
+            status = resp.status
+        text = body.decode()
+        with contextlib.suppress(ValueError):
+            text = json.dumps(_scrub(json.loads(text))) if text.strip() else text
+        self.recording.append(
+            RecordedExchange(
+                method=request.method,
+                path=path,
+                query=_canonical_query(request),
+                status=status,
+                headers=kept,
+                body=text,
+            )
+        )
+        return web.Response(status=status, body=body, headers=kept)
+
+    async def _serve_recorded(self, request: web.Request) -> web.Response:
+        key = (
+            request.method,
+            "/" + request.match_info["tail"],
+            _canonical_query(request),
+        )
+        queue = self._replay.get(key)
+        if not queue:
+            return _error(404, f"No recorded response for {key[0]} {key[1]}?{key[2]}")
+        exchange = queue.popleft() if len(queue) > 1 else queue[0]
+        return web.Response(
+            status=exchange.status, text=exchange.body, headers=exchange.headers
+        )
+
+    ##
+    # Fake endpoints
+    ##
+
+    def _add_routes(self, router: web.UrlDispatcher) -> None:
+        ws = PREFIX + r"/workspaces/{workspace_id:\d+}"
+        router.add_get(PREFIX + "/me", self._get_me)
+        router.add_get(PREFIX + "/workspaces", self._get_workspaces)
+        router.add_get(ws + "/tags", self._get_tags)
+        router.add_post(ws + "/tags", self._create_tag)
+        router.add_get(ws + "/projects", self._get_projects)
+        router.add_get(ws + "/clients", self._get_clients)
+        router.add_get(ws + "/tasks", self._get_tasks)
+        router.add_get(PREFIX + "/me/time_entries", self._list_time_entries)
+        router.add_get(PREFIX + "/me/time_entries/current", self._current_time_entry)
+        router.add_get(
+            PREFIX + r"/me/time_entries/{time_entry_id:\d+}", self._get_time_entry
+        )
+        router.add_post(ws + "/time_entries", self._create_time_entry)
+        router.add_put(
+            ws + r"/time_entries/{time_entry_id:\d+}", self._update_time_entry
+        )
+        router.add_delete(
+            ws + r"/time_entries/{time_entry_id:\d+}", self._delete_time_entry
+        )
+        router.add_patch(
+            ws + r"/time_entries/{time_entry_id:\d+}/stop", self._stop_time_entry
+        )
+        router.add_patch(ws + r"/time_entries/{time_entry_ids:[\d,]+}", self._bulk_edit)
+
+        hooks = WEBHOOKS_PREFIX + r"/subscriptions/{workspace_id:\d+}"
+        hook = hooks + r"/{subscription_id:\d+}"
+        router.add_get(WEBHOOKS_PREFIX + "/event_filters", self._get_event_filters)
+        router.add_get(hooks, self._get_subscriptions)
+        router.add_post(hooks, self._create_subscription)
+        router.add_put(hook, self._update_subscription)
+        router.add_patch(hook, self._patch_subscription)
+        router.add_delete(hook, self._delete_subscription)
+        router.add_post(
+            WEBHOOKS_PREFIX + r"/ping/{workspace_id:\d+}/{subscription_id:\d+}",
+            self._ping_subscription,
+        )
+        router.add_get(
+            WEBHOOKS_PREFIX
+            + r"/validate/{workspace_id:\d+}/{subscription_id:\d+}/{code}",
+            self._validate_subscription,
+        )
+
+        reports = REPORTS_PREFIX + r"/workspace/{workspace_id:\d+}"
+        router.add_post(reports + "/summary/time_entries", self._summary_report)
+        router.add_post(reports + "/search/time_entries", self._detailed_report)
+        router.add_post(reports + "/weekly/time_entries", self._weekly_report)
+
+    def _workspace(self, request: web.Request) -> int:
+        workspace_id = int(request.match_info["workspace_id"])
+        if workspace_id not in self.workspaces:
+            raise web.HTTPForbidden(
+                text=json.dumps("Incorrect workspace"), content_type="application/json"
+            )
+        return workspace_id
+
+    def _time_entry(
+        self, request: web.Request, workspace_id: int | None = None
+    ) -> dict[str, Any]:
+        te = self.time_entries.get(int(request.match_info["time_entry_id"]))
+        if (
+            te is None
+            or te["server_deleted_at"] is not None
+            or (workspace_id is not None and te["workspace_id"] != workspace_id)
+        ):
+            raise web.HTTPNotFound(
+                text=json.dumps("Time entry not found"), content_type="application/json"
+            )
+        return te
+
+    async def _json_body(self, request: web.Request) -> Any:
+        try:
+            return await request.json()
+        except ValueError as exc:
+            raise web.HTTPBadRequest(
+                text=json.dumps("Invalid JSON"), content_type="application/json"
+            ) from exc
+
+    async def _get_me(self, request: web.Request) -> web.Response:
+        if not (
+            self.config.related_data
+            and request.query.get("with_related_data") == "true"
+        ):
+            return web.json_response(self.account)
+        live = [
+            te for te in self.time_entries.values() if te["server_deleted_at"] is None
+        ]
+        live.sort(key=lambda te: te["start"], reverse=True)
+        return web.json_response(
+            {
+                **self.account,
+                "workspaces": list(self.workspaces.values()),
+                "tags": [tag for tags in self.tags.values() for tag in tags.values()],
+                "time_entries": [self.render_time_entry(te) for te in live],
+                "projects": list(self.projects.values()),
+                "clients": list(self.clients.values()),
+                "tasks": list(self.tasks.values()),
+            }
+        )
+
+    async def _get_workspaces(self, _request: web.Request) -> web.Response:
+        return web.json_response(list(self.workspaces.values()))
+
+    async def _get_tags(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self.tags[self._workspace(request)].values()))
+
+    async def _create_tag(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        body = await self._json_body(request)
+        name = (body or {}).get("name")
+        if not name:
+            return _error(400, "Tag name must be set")
+        if any(tag["name"] == name for tag in self.tags[workspace_id].values()):
+            return _error(400, "Tag already exists")
+        return web.json_response(self.add_tag(workspace_id, name))
+
+    def _page(
+        self, request: web.Request, items: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], int, int]:
+        page = int(request.query.get("page", 1))
+        per_page = min(int(request.query.get("per_page", 151)), 200)
+        return items[(page - 1) * per_page : page * per_page], page, per_page
+
+    async def _get_projects(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        projects = [
+            x for x in self.projects.values() if x["workspace_id"] == workspace_id
+        ]
+        return web.json_response(self._page(request, projects)[0])
+
+    async def _get_clients(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        return web.json_response(
+            [x for x in self.clients.values() if x["wid"] == workspace_id]
+        )
+
+    async def _get_tasks(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        tasks = [x for x in self.tasks.values() if x["workspace_id"] == workspace_id]
+        data, page, per_page = self._page(request, tasks)
+        # Unlike projects, this listing comes wrapped
+        return web.json_response(
+            {
+                "data": data,
+                "page": page,
+                "per_page": per_page,
+                "total_count": len(tasks),
+            }
+        )
+
+    async def _list_time_entries(self, request: web.Request) -> web.Response:
+        query = request.query
+        entries = self.time_entries.values()
+        if "since" in query:
+            since = datetime.fromtimestamp(int(query["since"]), UTC)
+            selected = [te for te in entries if te["at"] >= since]
+        else:
+            start = _parse_time(query.get("start_date"))
+            end = _parse_time(query.get("end_date"))
+            if (start is None) != (end is None):
+                return _error(400, "start_date and end_date must be given together")
+            selected = [
+                te
+                for te in entries
+                if te["server_deleted_at"] is None
+                and (start is None or start <= te["start"] < end)  # pyright: ignore
+            ]
+        selected.sort(key=lambda te: te["start"], reverse=True)
+        return web.json_response([self.render_time_entry(te) for te in selected])
+
+    async def _current_time_entry(self, _request: web.Request) -> web.Response:
+        te = self._running()
+        return web.json_response(None if te is None else self.render_time_entry(te))
+
+    async def _get_time_entry(self, request: web.Request) -> web.Response:
+        return web.json_response(self.render_time_entry(self._time_entry(request)))
+
+    async def _create_time_entry(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        body = await self._json_body(request)
+        if not isinstance(body, dict) or not body.get("start"):
+            return _error(400, "start must be set")
+        if not body.get("created_with"):
+            return _error(400, "created_with needs to be provided a valid value")
+        fields = {
+            k: v
+            for k, v in body.items()
+            if k
+            in (
+                "project_id",
+                "task_id",
+                "billable",
+                "description",
+                "tags",
+                "tag_ids",
+                "duration",
+                "start",
+                "stop",
+            )
+        }
+        if fields.get("duration", -1) < 0 and fields.get("stop") is None:
+            # Only one Time Entry runs at a time; starting one stops the other
+            running = self._running()
+            if running is not None:
+                self._stop(running, datetime.now(UTC))
+                self._publish_time_entry("updated", running)
+        te = self.add_time_entry(workspace_id, **fields)
+        self._publish_time_entry("created", te)
+        return web.json_response(self.render_time_entry(te))
+
+    async def _update_time_entry(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        te = self._time_entry(request, workspace_id)
+        body = await self._json_body(request)
+        if not isinstance(body, dict):
+            return _error(400, "Invalid body")
+        for key in ("project_id", "task_id", "billable", "description", "duration"):
+            if key in body:
+                te[key] = body[key]
+        for key in ("start", "stop"):
+            if key in body:
+                te[key] = _parse_time(body[key])
+        if "stop" in body and body["stop"] is None and "duration" not in body:
+            te["duration"] = -1
+        if "tags" in body:
+            action = body.get("tag_action")
+            if action == "add":
+                te["tags"] = [*te["tags"], *(body["tags"] or [])]
+            elif action == "delete":
+                te["tags"] = [x for x in te["tags"] if x not in (body["tags"] or [])]
+            else:
+                te["tags"] = body["tags"] or []
+        elif "tag_ids" in body:
+            te["tags"], te["tag_ids"] = [], body["tag_ids"] or []
+        te["at"] = datetime.now(UTC)
+        self._reconcile(te)
+        self._publish_time_entry("updated", te)
+        return web.json_response(self.render_time_entry(te))
+
+    async def _delete_time_entry(self, request: web.Request) -> web.Response:
+        te = self._time_entry(request, self._workspace(request))
+        te["server_deleted_at"] = te["at"] = datetime.now(UTC)
+        self._publish_time_entry("deleted", te)
+        return web.Response(status=200)
+
+    async def _stop_time_entry(self, request: web.Request) -> web.Response:
+        te = self._time_entry(request, self._workspace(request))
+        if te["duration"] >= 0:
+            return _error(409, "Time entry already stopped")
+        self._stop(te, datetime.now(UTC))
+        self._publish_time_entry("updated", te)
+        return web.json_response(self.render_time_entry(te))
+
+    async def _bulk_edit(self, request: web.Request) -> web.Response:
+        workspace_id = self._workspace(request)
+        body = await self._json_body(request)
+        if not isinstance(body, list):
+            return _error(400, "Body must be a list of operations")
+        success: list[int] = []
+        failure: list[dict[str, Any]] = []
+        for raw_id in request.match_info["time_entry_ids"].split(","):
+            time_entry_id = int(raw_id)
+            te = self.time_entries.get(time_entry_id)
+            if (
+                te is None
+                or te["workspace_id"] != workspace_id
+                or te["server_deleted_at"] is not None
+            ):
+                failure.append({"id": time_entry_id, "message": "Time entry not found"})
+                continue
+            for op in body:
+                field = str(op.get("path", "")).strip("/")
+                if field not in te or field in ("id", "workspace_id", "user_id", "at"):
+                    continue
+                value = op.get("value")
+                if field in ("start", "stop"):
+                    value = _parse_time(value)
+                if op.get("op") == "replace":
+                    te[field] = value
+                elif op.get("op") == "add" and isinstance(te[field], list):
+                    te[field] = [*te[field], *(value or [])]
+                elif op.get("op") == "remove" and isinstance(te[field], list):
+                    te[field] = [x for x in te[field] if x not in (value or [])]
+                if field == "tag_ids":
+                    te["tags"] = []
+            te["at"] = datetime.now(UTC)
+            self._reconcile(te)
+            self._publish_time_entry("updated", te)
+            success.append(time_entry_id)
+        return web.json_response({"success": success, "failure": failure})
+
+    ##
+    # Reports
+    ##
+
+    async def _report_entries(
+        self, request: web.Request, days: int | None = None
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """The request body and the finished Time Entries it covers. `days` overrides end_date."""
+        workspace_id = self._workspace(request)
+        body = await self._json_body(request) or {}
+        if "start_date" not in body:
+            raise web.HTTPBadRequest(
+                text=json.dumps("start_date is required"),
+                content_type="application/json",
+            )
+        first = date.fromisoformat(body["start_date"])
+        last = (
+            first + timedelta(days=days - 1)
+            if days is not None
+            else date.fromisoformat(body["end_date"])
+            if body.get("end_date")
+            else None
+        )
+        filters = {
+            "user_ids": "user_id",
+            "project_ids": "project_id",
+            "task_ids": "task_id",
+        }
+        selected = []
+        for te in self.time_entries.values():
+            if (
+                te["workspace_id"] != workspace_id
+                or te["server_deleted_at"] is not None
+                or te["duration"] < 0
+                or te["start"].date() < first
+                or (last is not None and te["start"].date() > last)
+            ):
+                continue
+            if any(
+                body.get(key) is not None and te[field] not in body[key]
+                for key, field in filters.items()
+            ):
+                continue
+            if body.get("client_ids") is not None and (
+                self._client_id(te) not in body["client_ids"]
+            ):
+                continue
+            if body.get("tag_ids") is not None and not set(te["tag_ids"]) & set(
+                body["tag_ids"]
+            ):
+                continue
+            if body.get("billable") is not None and te["billable"] != body["billable"]:
+                continue
+            if body.get("description") and body["description"] not in (
+                te["description"] or ""
+            ):
+                continue
+            selected.append(te)
+        return body, selected
+
+    def _client_id(self, te: dict[str, Any]) -> int | None:
+        project = self.projects.get(te["project_id"])
+        return None if project is None else project["client_id"]
+
+    async def _summary_report(self, request: web.Request) -> web.Response:
+        body, entries = await self._report_entries(request)
+        keys = {
+            "projects": lambda te: te["project_id"],
+            "clients": self._client_id,
+            "users": lambda te: te["user_id"],
+            "tasks": lambda te: te["task_id"],
+        }
+        grouping = body.get("grouping", "projects")
+        sub_grouping = body.get("sub_grouping", "time_entries")
+        if grouping not in keys or sub_grouping not in (*keys, "time_entries"):
+            return _error(400, "Invalid grouping")
+        groups: dict[Any, dict[Any, dict[str, Any]]] = defaultdict(dict)
+        for te in entries:
+            if sub_grouping == "time_entries":
+                sub_id, title = None, te["description"]
+            else:
+                sub_id, title = keys[sub_grouping](te), None
+            sub = groups[keys[grouping](te)].setdefault(
+                (sub_id, title), {"id": sub_id, "title": title, "seconds": 0}
+            )
+            sub["seconds"] += te["duration"]
+        return web.json_response(
+            {
+                "groups": [
+                    {"id": group_id, "sub_groups": list(subs.values())}
+                    for group_id, subs in groups.items()
+                ]
+            }
+        )
+
+    async def _detailed_report(self, request: web.Request) -> web.Response:
+        body, entries = await self._report_entries(request)
+        entries.sort(key=lambda te: (te["start"], te["id"]), reverse=True)
+        page_size = int(body.get("page_size") or 50)
+        # Row numbers count from 1; the cursor points at the first row of the next page
+        offset = int(body.get("first_row_number") or 1) - 1
+        page = entries[offset : offset + page_size]
+        rows = [
+            {
+                "user_id": te["user_id"],
+                "username": "mock",
+                "project_id": te["project_id"],
+                "task_id": te["task_id"],
+                "billable": te["billable"],
+                "description": te["description"],
+                "tag_ids": te["tag_ids"],
+                "row_number": offset + i + 1,
+                "time_entries": [
+                    {
+                        "id": te["id"],
+                        "seconds": te["duration"],
+                        "start": _iso(te["start"]),
+                        "stop": _iso(te["stop"]),
+                        "at": _iso(te["at"]),
+                    }
+                ],
+            }
+            for i, te in enumerate(page)
+        ]
+        headers = {}
+        if offset + page_size < len(entries):
+            following = entries[offset + page_size]
+            headers = {
+                REPORTS_NEXT_ID_HEADER: str(following["id"]),
+                REPORTS_NEXT_ROW_NUMBER_HEADER: str(offset + page_size + 1),
+                REPORTS_NEXT_TIMESTAMP_HEADER: str(int(following["start"].timestamp())),
+            }
+        return web.json_response(rows, headers=headers)
+
+    async def _weekly_report(self, request: web.Request) -> web.Response:
+        body, entries = await self._report_entries(request, days=7)
+        first = date.fromisoformat(body["start_date"])
+        rows: dict[tuple[int, int | None], list[int]] = {}
+        for te in entries:
+            seconds = rows.setdefault((te["user_id"], te["project_id"]), [0] * 7)
+            seconds[(te["start"].date() - first).days] += te["duration"]
+        return web.json_response(
+            [
+                {"user_id": user_id, "project_id": project_id, "seconds": seconds}
+                for (user_id, project_id), seconds in rows.items()
+            ]
+        )
@@ -0,0 +1,226 @@
+"""Runs the same call against many Toggl accounts at once.
+
+Each API token gets its own `Toggl` client (and with it, its own rate limit bucket) but all of
+them share one connection pool. Calls run with bounded concurrency and results are handed back
+as each account finishes so a slow or failing account never holds up the others.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .client import Toggl
+from .const import DEFAULT_FANOUT_CONCURRENCY
+from .decode import DecodeMode
+from .instrumentation import Instrumentation
+from .pool import ConnectionPool
+from .ratelimit import RetryPolicy
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+
+class TenantResult(BaseModel):
+    """Outcome of running a call for one API token."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    # Kept out of repr() so results can be logged without leaking tokens
+    api_key: str = Field(repr=False, description="API token the call ran as.")
+
+    result: Any = Field(default=None, description="Return value, if the call worked.")
+
+    error: BaseException | None = Field(
+        default=None, description="Exception raised by the call, if any."
+    )
+
+    elapsed: float = Field(default=0.0, description="Wall clock seconds for the call.")
+
+    @property
+    def ok(self) -> bool:
+        """True if the call finished without raising."""
+        return self.error is None
+
+
+class MultiToggl:
+    """Fan-out client for many API tokens.
+
+    Example:
+        async with MultiToggl(tokens, concurrency=20, timeout=10) as multi:
+            async for res in multi.fan_out("get_current_time_entry"):
+                ...
+    """
+
+    def __init__(
+        self,
+        api_keys: Iterable[str],
+        concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+        timeout: float | None = None,
+        pool: ConnectionPool | None = None,
+        retry_policy: RetryPolicy | None = None,
+        decode_mode: DecodeMode = DecodeMode.VALIDATE,
+        base_url: str | None = None,
+        instrumentation: Instrumentation | None = None,
+    ) -> None:
+        """
+        Args:
+            api_keys (Iterable[str]): Tokens to run calls for. Duplicates are ignored.
+            concurrency (int, optional): Max calls in flight across all tokens.
+            timeout (float | None, optional): Seconds before a single token's call is abandoned. Defaults to None.
+            pool (ConnectionPool | None, optional): Pool shared by every client. One is created (and closed with
+                this object) if not given.
+            retry_policy (RetryPolicy | None, optional): Passed on to every client.
+            decode_mode (DecodeMode, optional): Passed on to every client.
+            base_url (str | None, optional): Passed on to every client.
+            instrumentation (Instrumentation | None, optional): Shared by every client.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._retry_policy = retry_policy
+        self._decode_mode = decode_mode
+        self._base_url = base_url
+        self._instrumentation = instrumentation
+        self._owns_pool = pool is None
+        self._pool = pool or ConnectionPool()
+        self._clients: dict[str, Toggl] = {}
+        for api_key in api_keys:
+            self.add(api_key)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excinfo):
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @property
+    def api_keys(self) -> list[str]:
+        """Tokens currently being managed."""
+        return list(self._clients)
+
+    def add(self, api_key: str) -> Toggl:
+        """Starts managing `api_key`, returning its client."""
+        if api_key not in self._clients:
+            self._clients[api_key] = Toggl(
+                api_key,
+                retry_policy=self._retry_policy,
+                pool=self._pool,
+                decode_mode=self._decode_mode,
+                base_url=self._base_url,
+                instrumentation=self._instrumentation,
+            )
+        return self._clients[api_key]
+
+    def remove(self, api_key: str) -> None:
+        """Stops managing `api_key`. Its client shares our pool so there is nothing to close."""
+        self._clients.pop(api_key, None)
+
+    def client(self, api_key: str) -> Toggl:
+        """Client for a managed token."""
+        return self._clients[api_key]
+
+    async def close(self) -> None:
+        """Closes the shared pool, if we created it."""
+        if self._owns_pool:
+            await self._pool.close()
+
+    async def _run_one(
+        self,
+        api_key: str,
+        call: Callable[[Toggl], Awaitable[Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> TenantResult:
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                if self.timeout is None:
+                    result = await call(self._clients[api_key])
+                else:
+                    result = await asyncio.wait_for(
+                        call(self._clients[api_key]), self.timeout
+                    )
+            # One account failing must not take the rest down with it
+            # pylint: disable-next=broad-except
+            except Exception as exc:
+                log.debug("fan_out call failed", exc_info=exc)
+                return TenantResult(
+                    api_key=api_key, error=exc, elapsed=time.monotonic() - started
+                )
+            return TenantResult(
+                api_key=api_key, result=result, elapsed=time.monotonic() - started
+            )
+
+    async def fan_out(
+        self,
+        call: str | Callable[[Toggl], Awaitable[Any]],
+        *args: Any,
+        api_keys: Iterable[str] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[TenantResult]:
+        """Runs `call` for every token and yields results in completion order.
+
+        Args:
+            call (str | Callable[[Toggl], Awaitable[Any]]): Name of a `Toggl` method, called with `*args`
+                and `**kwargs`, or a coroutine function that takes the client.
+            api_keys (Iterable[str] | None, optional): Subset of managed tokens to run for. Defaults to all of them.
+
+        Yields:
+            TenantResult: One per token, as soon as that token's call finishes.
+        """
+        if isinstance(call, str):
+            method_name = call
+
+            async def runner(client: Toggl) -> Any:
+                return await getattr(client, method_name)(*args, **kwargs)
+
+        elif args or kwargs:
+            raise TypeError(
+                "args/kwargs are only supported when call is a method name."
+            )
+        else:
+            runner = call
+
+        keys = list(self._clients) if api_keys is None else list(api_keys)
+        for api_key in keys:
+            self.add(api_key)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [
+            asyncio.create_task(self._run_one(api_key, runner, semaphore))
+            for api_key in keys
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early (or was cancelled); don't leave work running behind its back
+            for task in tasks:
+                task.cancel()
+
+    async def gather(
+        self,
+        call: str | Callable[[Toggl], Awaitable[Any]],
+        *args: Any,
+        api_keys: Iterable[str] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, TenantResult]:
+        """Like `fan_out()` but waits for every token and returns results keyed by token."""
+        return {
+            res.api_key: res
+            async for res in self.fan_out(call, *args, api_keys=api_keys, **kwargs)
+        }
@@ -0,0 +1,442 @@
+"""Durable, offline-first queue for Time Entry writes.
+
+`Outbox.enqueue_*()` records the write in SQLite and returns straight away with the Time Entry
+as it will look once the write lands. A background worker sends queued writes to the API,
+several at a time, and keeps retrying through network outages (and process restarts) until the
+server either accepts or rejects them.
+
+- Writes for the same Time Entry are sent one at a time, in the order they were queued.
+  Writes for different Time Entries go out concurrently, up to `concurrency`.
+- A queued write that hasn't been sent yet absorbs the ones after it: editing (or stopping) an
+  entry that is still waiting to be created or updated just changes what will be sent, so
+  "create, edit, stop" while offline is a single POST once back online.
+- New Time Entries get a negative temporary ID. Queue further writes against that ID; once the
+  create goes through, they are re-pointed at the server's ID. `resolve()` does the same lookup.
+- The server rejecting a write (a 4xx other than 408/429) is final: the write, and any queued
+  after it for the same entry, end up in `failed()` instead of being retried forever.
+
+Delivery is at-least-once. A process that dies after the server accepted a write but before the
+outbox recorded that will send it again on restart; for a create that means a duplicate entry.
+"""
+
+import asyncio
+import contextlib
+import os
+import sqlite3
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import aiohttp
+from pydantic import BaseModel, Field, ValidationError
+
+from .codec import JsonCodec, default_codec
+from .decode import construct_time_entry, encode_time_entry
+from .ratelimit import RetryPolicy
+from .time_entries import TimeEntry
+
+if TYPE_CHECKING:
+    from .client import Toggl
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    time_entry_id INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_entry ON outbox (time_entry_id, seq);
+
+-- Temporary (negative) ID -> ID the server gave the entry
+CREATE TABLE IF NOT EXISTS id_map (
+    temp_id INTEGER PRIMARY KEY,
+    server_id INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+CREATE = "create"
+UPDATE = "update"
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+FAILED = "failed"
+
+
+class FailedWrite(BaseModel):
+    """A queued write the server rejected."""
+
+    seq: int = Field(description="Position in the queue.")
+    kind: str = Field(description="`create` or `update`.")
+    time_entry: TimeEntry = Field(description="What was going to be sent.")
+    error: str = Field(description="Why it failed.")
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Naive datetimes are taken to be UTC, as when Time Entries are serialized (`accept_naive`)."""
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
+
+
+class MissingIdError(ValueError):
+    """A create was accepted but the response didn't say which ID the new entry got."""
+
+
+def _is_permanent(exc: BaseException) -> bool:
+    """True if sending the same request again can't succeed."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return 400 <= exc.status < 500 and exc.status not in (408, 429)
+    return not isinstance(exc, (aiohttp.ClientError, TimeoutError))
+
+
+class Outbox:
+    """Queue of Time Entry writes for `client`, stored at `path` (":memory:" keeps it in memory only)."""
+
+    def __init__(
+        self,
+        client: "Toggl",
+        path: str | os.PathLike = ":memory:",
+        concurrency: int = 4,
+        retry_policy: RetryPolicy | None = None,
+        codec: JsonCodec | None = None,
+    ) -> None:
+        """
+        Args:
+            client (Toggl): Client the writes are sent with.
+            path (str | os.PathLike, optional): SQLite database file. Defaults to ":memory:".
+            concurrency (int, optional): Writes in flight at once. Defaults to 4.
+            retry_policy (RetryPolicy | None, optional): Backoff between attempts. Only `backoff()` is used;
+                transient failures are retried until they succeed. Defaults to RetryPolicy().
+            codec (JsonCodec | None, optional): Decodes stored payloads. Defaults to default_codec().
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.client = client
+        self.concurrency = concurrency
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._codec = codec or default_codec()
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        with self._db:
+            # Whatever was in flight when the last process stopped never got an answer
+            self._db.execute(
+                "UPDATE outbox SET state = ? WHERE state = ?", (PENDING, IN_FLIGHT)
+            )
+        self._in_flight: dict[int, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *excinfo):
+        await self.close()
+
+    ##
+    # Queueing
+    ##
+
+    def _next_temp_id(self) -> int:
+        row = self._db.execute(
+            "SELECT value FROM counters WHERE name = 'temp_id'"
+        ).fetchone()
+        temp_id = (row[0] if row else 0) - 1
+        self._db.execute(
+            "INSERT OR REPLACE INTO counters (name, value) VALUES ('temp_id', ?)",
+            (temp_id,),
+        )
+        return temp_id
+
+    def resolve(self, time_entry_id: int) -> int | None:
+        """Server ID for a temporary ID; None while the create is still queued. Other IDs are returned as-is."""
+        if time_entry_id > 0:
+            return time_entry_id
+        row = self._db.execute(
+            "SELECT server_id FROM id_map WHERE temp_id = ?", (time_entry_id,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _queued(self) -> None:
+        self._drained.clear()
+        self._wakeup.set()
+
+    def enqueue_create(self, te: TimeEntry) -> TimeEntry:
+        """Queues a new Time Entry. Returns it with a temporary (negative) ID to queue further writes against."""
+        if te.start is None:
+            te = te.model_copy(update={"start": datetime.now(UTC)})
+        with self._db:
+            temp_id = self._next_temp_id()
+            queued = te.model_copy(update={"id": temp_id})
+            self._db.execute(
+                "INSERT INTO outbox (kind, time_entry_id, payload) VALUES (?, ?, ?)",
+                (CREATE, temp_id, encode_time_entry(queued)),
+            )
+        self._queued()
+        return queued
+
+    def enqueue_update(self, te: TimeEntry) -> TimeEntry:
+        """Queues a full update (PUT) of an existing or queued Time Entry. Returns the entry as queued.
+
+        Raises:
+            ValueError: If `te` has no ID, or its queued create was rejected.
+        """
+        if te.id is None:
+            raise ValueError(
+                "time entry must have an id, queue it with enqueue_create()"
+            )
+        time_entry_id = self.resolve(te.id) or te.id
+        te = te.model_copy(update={"id": time_entry_id})
+        with self._db:
+            last = self._db.execute(
+                "SELECT seq, kind, state FROM outbox WHERE time_entry_id = ? AND state != ? "
+                "ORDER BY seq DESC LIMIT 1",
+                (time_entry_id, FAILED),
+            ).fetchone()
+            if last is None and time_entry_id < 0:
+                raise ValueError(
+                    f"time entry {time_entry_id} was never created, see failed()"
+                )
+            if last is not None and last[2] == PENDING:
+                # Not sent yet; send the new state instead, keeping a create a create
+                self._db.execute(
+                    "UPDATE outbox SET payload = ? WHERE seq = ?",
+                    (encode_time_entry(te), last[0]),
+                )
+                log.debug("outbox coalesced write", extra={"id": time_entry_id})
+            else:
+                self._db.execute(
+                    "INSERT INTO outbox (kind, time_entry_id, payload) VALUES (?, ?, ?)",
+                    (UPDATE, time_entry_id, encode_time_entry(te)),
+                )
+        self._queued()
+        return te
+
+    def enqueue_stop(self, te: TimeEntry, at: datetime | None = None) -> TimeEntry:
+        """Queues stopping a running Time Entry at `at` (defaults to now), not at whenever the write is sent.
+
+        Raises:
+            ValueError: If `te` has no ID or no start time.
+        """
+        if te.start is None:
+            raise ValueError("time entry must have a start time to be stopped")
+        at = _as_utc(at or datetime.now(UTC))
+        duration = int((at - _as_utc(te.start)).total_seconds())
+        return self.enqueue_update(
+            te.model_copy(update={"stop": at, "duration": max(0, duration)})
+        )
+
+    ##
+    # Inspection
+    ##
+
+    def __len__(self) -> int:
+        """Writes not yet accepted by the server, failed ones excluded."""
+        row = self._db.execute(
+            "SELECT COUNT(*) FROM outbox WHERE state != ?", (FAILED,)
+        ).fetchone()
+        return row[0]
+
+    def failed(self) -> list[FailedWrite]:
+        """Writes the server rejected, oldest first."""
+        rows = self._db.execute(
+            "SELECT seq, kind, payload, last_error FROM outbox WHERE state = ? ORDER BY seq",
+            (FAILED,),
+        )
+        return [
+            FailedWrite(
+                seq=seq,
+                kind=kind,
+                time_entry=construct_time_entry(self._codec.loads(payload)),
+                error=error or "",
+            )
+            for seq, kind, payload, error in rows
+        ]
+
+    def discard_failed(self) -> None:
+        """Forgets every failed write."""
+        with self._db:
+            self._db.execute("DELETE FROM outbox WHERE state = ?", (FAILED,))
+
+    ##
+    # Worker
+    ##
+
+    def start(self) -> None:
+        """Starts the background worker. Must be called from a running event loop."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stops the worker. Unsent writes stay queued on disk for the next run."""
+        tasks = list(self._in_flight.values())
+        if self._worker is not None:
+            self._worker.cancel()
+            tasks.append(self._worker)
+        for task in self._in_flight.values():
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+        self._db.close()
+
+    async def flush(self, timeout: float | None = None) -> None:
+        """Waits until every queued write has been accepted or rejected by the server.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait at most. Defaults to waiting for as
+                long as it takes, which is forever while offline.
+
+        Raises:
+            TimeoutError: If writes are still queued after `timeout` seconds. They stay queued.
+        """
+        self.start()
+        if len(self) == 0:
+            return
+        self._drained.clear()
+        self._wakeup.set()
+        async with asyncio.timeout(timeout):
+            await self._drained.wait()
+
+    def _ready(self) -> tuple[list[tuple], float | None]:
+        """Writes that can be sent now, and when the next held-back one becomes ready."""
+        now = time.time()
+        blocked = set(self._in_flight)
+        ready = []
+        next_at = None
+        for seq, kind, time_entry_id, payload, state, not_before in self._db.execute(
+            "SELECT seq, kind, time_entry_id, payload, state, not_before FROM outbox "
+            "WHERE state != ? ORDER BY seq",
+            (FAILED,),
+        ):
+            # Only the oldest write of each Time Entry is a candidate
+            if time_entry_id in blocked:
+                continue
+            blocked.add(time_entry_id)
+            if state != PENDING:
+                continue
+            if not_before > now:
+                next_at = not_before if next_at is None else min(next_at, not_before)
+                continue
+            ready.append((seq, kind, time_entry_id, payload))
+        return ready, next_at
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            ready, next_at = self._ready()
+            for seq, kind, time_entry_id, payload in ready:
+                if len(self._in_flight) >= self.concurrency:
+                    break
+                with self._db:
+                    self._db.execute(
+                        "UPDATE outbox SET state = ? WHERE seq = ?", (IN_FLIGHT, seq)
+                    )
+                task = asyncio.create_task(self._send(seq, kind, payload))
+                self._in_flight[time_entry_id] = task
+                task.add_done_callback(
+                    lambda _t, key=time_entry_id: self._send_done(key)
+                )
+
+            if not self._in_flight and not ready and next_at is None:
+                self._drained.set()
+            timeout = None if next_at is None else max(0.0, next_at - time.time())
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(timeout):
+                    await self._wakeup.wait()
+
+    def _send_done(self, time_entry_id: int) -> None:
+        self._in_flight.pop(time_entry_id, None)
+        self._wakeup.set()
+
+    async def _send(self, seq: int, kind: str, payload: bytes) -> None:
+        te = construct_time_entry(self._codec.loads(payload))
+        try:
+            if kind == CREATE:
+                temp_id = te.id
+                created = await self.client.create_new_time_entry(
+                    te.model_copy(update={"id": None})
+                )
+                if created is None or created.id is None:
+                    # Writes queued against the temporary ID could never be sent
+                    raise MissingIdError(
+                        "the server did not return the created entry's ID"
+                    )
+                self._map_id(temp_id, created.id)  # pyright: ignore reportArgumentType
+            else:
+                await self.client.update_time_entry(te)
+        except (
+            aiohttp.ClientError,
+            TimeoutError,
+            ValidationError,
+            MissingIdError,
+        ) as exc:
+            self._sent_with_error(seq, te, exc)
+            return
+        with self._db:
+            self._db.execute("DELETE FROM outbox WHERE seq = ?", (seq,))
+
+    def _map_id(self, temp_id: int, server_id: int) -> None:
+        """Re-points everything queued against `temp_id` at the ID the server gave the entry."""
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO id_map (temp_id, server_id) VALUES (?, ?)",
+                (temp_id, server_id),
+            )
+            self._db.execute(
+                "UPDATE outbox SET time_entry_id = ? WHERE time_entry_id = ?",
+                (server_id, temp_id),
+            )
+            for seq, payload in self._db.execute(
+                "SELECT seq, payload FROM outbox WHERE time_entry_id = ?", (server_id,)
+            ).fetchall():
+                te = construct_time_entry(self._codec.loads(payload))
+                if te.id == temp_id:
+                    self._db.execute(
+                        "UPDATE outbox SET payload = ? WHERE seq = ?",
+                        (
+                            encode_time_entry(te.model_copy(update={"id": server_id})),
+                            seq,
+                        ),
+                    )
+
+    def _sent_with_error(self, seq: int, te: TimeEntry, exc: Exception) -> None:
+        if _is_permanent(exc):
+            log.warning("outbox write rejected", exc_info=exc)
+            with self._db:
+                # Later writes to the same entry build on this one; they can't succeed either
+                self._db.execute(
+                    "UPDATE outbox SET state = ?, last_error = ? "
+                    "WHERE time_entry_id = ? AND seq >= ?",
+                    (FAILED, str(exc), te.id, seq),
+                )
+            return
+        attempts = self._db.execute(
+            "SELECT attempts FROM outbox WHERE seq = ?", (seq,)
+        ).fetchone()[0]
+        delay = self._retry_policy.backoff(attempts)
+        log.info("outbox write failed (%s), retrying in %.2fs", exc, delay)
+        with self._db:
+            self._db.execute(
+                "UPDATE outbox SET state = ?, attempts = attempts + 1, not_before = ?, "
+                "last_error = ? WHERE seq = ?",
+                (PENDING, time.time() + delay, str(exc), seq),
+            )
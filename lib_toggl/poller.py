@@ -0,0 +1,394 @@
+"""Adaptive polling of the running Time Entry for one or many accounts.
+
+Polling `get_current_time_entry()` on a fixed timer mostly fetches the same entry again. A
+`CurrentTimeEntryPoller` instead keeps one interval per account:
+
+- it starts at `PollPolicy.min_interval` and grows by `backoff` every time nothing changed, up to
+    `max_interval`;
+- it drops back to `min_interval` as soon as something did change;
+- a write made through the client (creating, stopping, editing an entry) publishes the change
+    right away and brings the next poll forward to `after_write` seconds, to pick up whatever the
+    server did as a consequence;
+- first polls are spread evenly-at-random over `min_interval` and every later one is jittered, so
+    thousands of accounts don't all poll in the same second.
+
+Changes are published as `TimeEntryChange` events, only when the entry actually differs by id,
+`at` or `stop`.
+
+    async with CurrentTimeEntryPoller.for_multi(multi) as poller:
+        async for change in poller.events():
+            ...
+"""
+
+import asyncio
+import contextlib
+import heapq
+import random
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING, Literal
+
+import aiohttp
+from pydantic import BaseModel, Field, model_validator
+
+from .const import (
+    DEFAULT_FANOUT_CONCURRENCY,
+    DEFAULT_POLL_AFTER_WRITE_SECONDS,
+    DEFAULT_POLL_BACKOFF,
+    DEFAULT_POLL_JITTER,
+    DEFAULT_POLL_MAX_INTERVAL_SECONDS,
+    DEFAULT_POLL_MIN_INTERVAL_SECONDS,
+)
+from .time_entries import TimeEntry
+
+if TYPE_CHECKING:
+    from .client import Toggl
+    from .multi import MultiToggl
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+
+class PollPolicy(BaseModel):
+    """How often the running Time Entry is polled."""
+
+    min_interval: float = Field(
+        default=DEFAULT_POLL_MIN_INTERVAL_SECONDS,
+        gt=0,
+        description="Seconds between polls right after a change.",
+    )
+
+    max_interval: float = Field(
+        default=DEFAULT_POLL_MAX_INTERVAL_SECONDS,
+        gt=0,
+        description="Longest the interval grows to while nothing changes.",
+    )
+
+    backoff: float = Field(
+        default=DEFAULT_POLL_BACKOFF,
+        ge=1,
+        description="The interval is multiplied by this after every poll without a change.",
+    )
+
+    jitter: float = Field(
+        default=DEFAULT_POLL_JITTER,
+        ge=0,
+        lt=1,
+        description="Each delay is randomly moved by up to this share of itself.",
+    )
+
+    after_write: float = Field(
+        default=DEFAULT_POLL_AFTER_WRITE_SECONDS,
+        ge=0,
+        description="Seconds until the next poll after a write made through the client.",
+    )
+
+    @model_validator(mode="after")
+    def _check_intervals(self) -> "PollPolicy":
+        if self.max_interval < self.min_interval:
+            raise ValueError("max_interval must not be less than min_interval.")
+        return self
+
+    def next_interval(self, interval: float, changed: bool) -> float:
+        """Interval after a poll that found a change (or not)."""
+        if changed:
+            return self.min_interval
+        return min(self.max_interval, interval * self.backoff)
+
+
+class TimeEntryChange(BaseModel):
+    """The running Time Entry of one account is not what it was."""
+
+    # Usually the API token; kept out of repr() so events can be logged
+    key: str = Field(repr=False, description="Account the change was seen for.")
+
+    previous: TimeEntry | None = Field(description="What was running before.")
+
+    current: TimeEntry | None = Field(description="What is running now.")
+
+    source: Literal["poll", "write"] = Field(
+        description="Seen by polling, or by a write made through the client."
+    )
+
+    @property
+    def kind(self) -> Literal["started", "stopped", "updated"]:
+        """What happened, in short."""
+        if self.current is None:
+            return "stopped"
+        if self.previous is None or self.previous.id != self.current.id:
+            return "started"
+        return "updated"
+
+
+def differs(a: TimeEntry | None, b: TimeEntry | None) -> bool:
+    """True if `a` and `b` are not the same version of the same entry, going by id, `at` and `stop`."""
+    if a is None or b is None:
+        return a is not b
+    return (a.id, a.at, a.stop) != (b.id, b.at, b.stop)
+
+
+class _Target:
+    """Polling state of one account."""
+
+    __slots__ = (
+        "client",
+        "generation",
+        "interval",
+        "key",
+        "last",
+        "next_at",
+        "remove_listener",
+        "task",
+    )
+
+    def __init__(self, key: str, client: "Toggl", interval: float) -> None:
+        self.key = key
+        self.client = client
+        self.interval = interval
+        self.next_at = 0.0
+        self.last: TimeEntry | None = None
+        self.task: asyncio.Task | None = None
+        # Bumped by every write, so a poll that was in flight during one can tell it is stale
+        self.generation = 0
+        self.remove_listener: Callable[[], None] | None = None
+
+
+class CurrentTimeEntryPoller:
+    """Polls the running Time Entry of any number of clients, each on its own adaptive interval."""
+
+    def __init__(
+        self,
+        policy: PollPolicy | None = None,
+        concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+        on_change: Callable[[TimeEntryChange], None] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            policy (PollPolicy | None, optional): Intervals and backoff. Defaults to PollPolicy().
+            concurrency (int, optional): Polls in flight at once, across all clients.
+            on_change (Callable[[TimeEntryChange], None] | None, optional): Called with every change, in
+                addition to `events()`. Must not block. Defaults to None.
+            seed (int | None, optional): Seeds the jitter, for repeatable schedules. Defaults to None.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.policy = policy or PollPolicy()
+        self._on_change = on_change
+        self._random = random.Random(seed)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._targets: dict[str, _Target] = {}
+        # (next_at, counter, key); entries whose next_at no longer matches the target are stale
+        self._schedule: list[tuple[float, int, str]] = []
+        self._counter = 0
+        self._subscribers: list[asyncio.Queue] = []
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+
+    @classmethod
+    def for_multi(cls, multi: "MultiToggl", **kwargs) -> "CurrentTimeEntryPoller":
+        """A poller for every account of `multi`, keyed by API token. Takes the same arguments as the constructor."""
+        poller = cls(**kwargs)
+        for api_key in multi.api_keys:
+            poller.add(api_key, multi.client(api_key))
+        return poller
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *excinfo):
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    ##
+    # Accounts
+    ##
+
+    def add(self, key: str, client: "Toggl") -> None:
+        """Starts polling `client`. Its first poll comes at a random point within `min_interval`.
+
+        Nothing is assumed to be running beforehand, so if something is, the first poll publishes it.
+        """
+        if key in self._targets:
+            return
+        target = _Target(key, client, self.policy.min_interval)
+        target.remove_listener = client.add_write_listener(
+            lambda current, key=key: self._written(key, current)
+        )
+        self._targets[key] = target
+        self._schedule_at(target, self._random.uniform(0, self.policy.min_interval))
+
+    def remove(self, key: str) -> None:
+        """Stops polling the client added as `key`."""
+        target = self._targets.pop(key, None)
+        if target is None:
+            return
+        if target.remove_listener is not None:
+            target.remove_listener()
+        if target.task is not None:
+            target.task.cancel()
+
+    def interval(self, key: str) -> float:
+        """Current polling interval for `key`, in seconds."""
+        return self._targets[key].interval
+
+    def _schedule_at(self, target: _Target, delay: float) -> None:
+        target.next_at = time.monotonic() + delay
+        self._counter += 1
+        heapq.heappush(self._schedule, (target.next_at, self._counter, target.key))
+        self._wakeup.set()
+
+    def _jittered(self, delay: float) -> float:
+        jitter = self.policy.jitter
+        return delay * (1 + self._random.uniform(-jitter, jitter))
+
+    ##
+    # Changes
+    ##
+
+    def events(self) -> AsyncIterator[TimeEntryChange]:
+        """Every change seen from now on, as an async iterator.
+
+        Changes are collected from the moment this is called; `aclose()` the iterator to stop.
+        """
+        queue: asyncio.Queue[TimeEntryChange] = asyncio.Queue()
+        self._subscribers.append(queue)
+        return self._iterate(queue)
+
+    async def _iterate(self, queue: asyncio.Queue) -> AsyncIterator[TimeEntryChange]:
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
+
+    def _observe(
+        self,
+        target: _Target,
+        current: TimeEntry | None,
+        source: Literal["poll", "write"],
+    ) -> bool:
+        """Publishes a change if `current` differs from what was last seen. Returns True if it did."""
+        if not differs(target.last, current):
+            return False
+        change = TimeEntryChange(
+            key=target.key, previous=target.last, current=current, source=source
+        )
+        target.last = current
+        log.debug(
+            "running Time Entry changed", extra={"kind": change.kind, "source": source}
+        )
+        if self._on_change is not None:
+            self._on_change(change)
+        for queue in self._subscribers:
+            queue.put_nowait(change)
+        return True
+
+    def _written(self, key: str, current: TimeEntry | None) -> None:
+        target = self._targets.get(key)
+        if target is None:
+            return
+        target.generation += 1
+        if current is not None and (current.stop is not None or current.duration >= 0):
+            # The client doesn't know what runs and passed the entry it stopped: nothing runs if
+            #   that was the running one, otherwise what ran before still does
+            last = target.last
+            current = None if last is not None and last.id == current.id else last
+        self._observe(target, current, "write")
+        target.interval = self.policy.min_interval
+        delay = self.policy.after_write
+        if target.task is None and target.next_at > time.monotonic() + delay:
+            self._schedule_at(target, delay)
+
+    ##
+    # Worker
+    ##
+
+    def start(self) -> None:
+        """Starts polling. Must be called from a running event loop."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stops polling. Clients are left open and the poller can be started again."""
+        tasks = [t.task for t in self._targets.values() if t.task is not None]
+        if self._worker is not None:
+            self._worker.cancel()
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+
+    async def poll(self, key: str) -> bool:
+        """Polls `key` right now, outside of the schedule. Returns True if the entry changed."""
+        target = self._targets[key]
+        generation = target.generation
+        current = await target.client.get_current_time_entry()
+        if target.generation != generation:
+            # Written to in the meantime; the write knows better
+            return False
+        return self._observe(target, current, "poll")
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            while self._schedule and self._schedule[0][0] <= now:
+                next_at, _, key = heapq.heappop(self._schedule)
+                target = self._targets.get(key)
+                # Dropped, rescheduled since, or still busy with the last poll
+                if (
+                    target is None
+                    or target.next_at != next_at
+                    or target.task is not None
+                ):
+                    continue
+                target.task = asyncio.create_task(self._poll(target))
+            timeout = None
+            if self._schedule:
+                timeout = max(0.0, self._schedule[0][0] - time.monotonic())
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(timeout):
+                    await self._wakeup.wait()
+
+    async def _poll(self, target: _Target) -> None:
+        generation = target.generation
+        changed = cancelled = False
+        try:
+            async with self._semaphore:
+                current = await target.client.get_current_time_entry()
+            if target.generation == generation:
+                changed = self._observe(target, current, "poll")
+        except (aiohttp.ClientError, TimeoutError) as exc:
+            # Treated like a poll that saw nothing new, so a struggling API gets polled less
+            log.warning("polling the running Time Entry failed", exc_info=exc)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            target.task = None
+            # Anything else still propagates, but polling carries on
+            if not cancelled and self._targets.get(target.key) is target:
+                self._schedule_next(
+                    target, stale=target.generation != generation, changed=changed
+                )
+
+    def _schedule_next(self, target: _Target, stale: bool, changed: bool) -> None:
+        if stale:
+            # Written to while the poll was in flight, which dropped its result; look again soon
+            self._schedule_at(target, self.policy.after_write)
+            return
+        target.interval = self.policy.next_interval(target.interval, changed)
+        self._schedule_at(target, self._jittered(target.interval))
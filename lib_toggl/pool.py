@@ -0,0 +1,206 @@
+"""Shared, tunable aiohttp connection pool.
+
+Every `Toggl` client talks to the same host so there's no reason for each one to have its own
+pool of sockets. A `ConnectionPool` can be handed to any number of clients; they then share
+keep-alive connections (and with them the TLS sessions), the DNS cache and the socket limits.
+"""
+
+import ssl
+import time
+from types import SimpleNamespace
+
+import aiohttp
+import certifi
+from pydantic import BaseModel, Field
+
+from .instrumentation import timing_trace_config
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+
+class PoolOptions(BaseModel):
+    """Tuning knobs for the underlying `aiohttp.TCPConnector`."""
+
+    limit: int = Field(
+        default=100, ge=0, description="Max open sockets in total. 0 is unlimited."
+    )
+
+    limit_per_host: int = Field(
+        default=20,
+        ge=0,
+        description="Max open sockets per (host, port, ssl) triple. 0 is unlimited.",
+    )
+
+    keepalive_timeout: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds an idle connection is kept around for re-use.",
+    )
+
+    ttl_dns_cache: int | None = Field(
+        default=300,
+        description="Seconds a resolved address is cached. None caches forever.",
+    )
+
+    use_aiodns: bool = Field(
+        default=True,
+        description="Resolve with aiodns instead of the threaded getaddrinfo() resolver.",
+    )
+
+
+class PoolMetrics(BaseModel):
+    """Counters collected from aiohttp's tracing signals."""
+
+    requests: int = Field(default=0, description="Requests started.")
+    in_flight: int = Field(default=0, description="Requests currently running.")
+    connections_created: int = Field(
+        default=0, description="New sockets opened, each one costing a TLS handshake."
+    )
+    connections_reused: int = Field(
+        default=0, description="Requests served from an idle keep-alive socket."
+    )
+    queued: int = Field(
+        default=0, description="Requests that had to wait for a free socket."
+    )
+    queued_seconds: float = Field(
+        default=0.0, description="Total time spent waiting for a free socket."
+    )
+    dns_cache_hits: int = Field(default=0)
+    dns_cache_misses: int = Field(default=0)
+
+
+def create_ssl_context() -> ssl.SSLContext:
+    """One verified context for every connection in the pool, using the certifi CA bundle."""
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+class ConnectionPool:
+    """Owns one `aiohttp.ClientSession` (and its connector) that many clients can share.
+
+    The session is created lazily, on first use, because aiohttp wants a running event loop.
+    Pass an existing `connector` to share it with code outside of lib-toggl; it will not be
+        closed with the pool.
+    """
+
+    def __init__(
+        self,
+        options: PoolOptions | None = None,
+        connector: aiohttp.BaseConnector | None = None,
+    ) -> None:
+        self.options = options or PoolOptions()
+        self._connector = connector
+        self._owns_connector = connector is None
+        self._session: aiohttp.ClientSession | None = None
+        self._metrics = PoolMetrics()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excinfo):
+        await self.close()
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        """Snapshot of the pool counters."""
+        return self._metrics.model_copy()
+
+    @property
+    def closed(self) -> bool:
+        """True if there is no open session to hand out right now."""
+        return self._session is None or self._session.closed
+
+    def _build_connector(self) -> aiohttp.TCPConnector:
+        if self._ssl_context is None:
+            self._ssl_context = create_ssl_context()
+
+        resolver = None
+        if self.options.use_aiodns:
+            try:
+                resolver = aiohttp.AsyncResolver()
+            except RuntimeError:
+                log.warning("aiodns is not available, using the threaded resolver")
+
+        return aiohttp.TCPConnector(
+            limit=self.options.limit,
+            limit_per_host=self.options.limit_per_host,
+            keepalive_timeout=self.options.keepalive_timeout,
+            ttl_dns_cache=self.options.ttl_dns_cache,
+            use_dns_cache=True,
+            resolver=resolver,
+            ssl=self._ssl_context,
+        )
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        metrics = self._metrics
+
+        async def on_request_start(_session, _ctx, _params):
+            metrics.requests += 1
+            metrics.in_flight += 1
+
+        async def on_request_done(_session, _ctx, _params):
+            metrics.in_flight -= 1
+
+        async def on_connection_create_end(_session, _ctx, _params):
+            metrics.connections_created += 1
+
+        async def on_connection_reuseconn(_session, _ctx, _params):
+            metrics.connections_reused += 1
+
+        async def on_connection_queued_start(_session, ctx: SimpleNamespace, _params):
+            metrics.queued += 1
+            ctx.queued_at = time.monotonic()
+
+        async def on_connection_queued_end(_session, ctx: SimpleNamespace, _params):
+            metrics.queued_seconds += time.monotonic() - ctx.queued_at
+
+        async def on_dns_cache_hit(_session, _ctx, _params):
+            metrics.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(_session, _ctx, _params):
+            metrics.dns_cache_misses += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_done)
+        trace.on_request_exception.append(on_request_done)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_connection_queued_start.append(on_connection_queued_start)
+        trace.on_connection_queued_end.append(on_connection_queued_end)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared session, (re)creating it if needed.
+
+        Must be called from a running event loop.
+        """
+        if self._session is None or self._session.closed:
+            if self._owns_connector and (
+                self._connector is None or self._connector.closed
+            ):
+                self._connector = self._build_connector()
+            log.debug("creating pooled aiohttp session")
+            self._session = aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=self._owns_connector,
+                trace_configs=[self._build_trace_config(), timing_trace_config()],
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Closes the shared session. Clients using the pool will get a new one on next use."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,47 @@
+"""Paged downloads that fetch the next page while the current one is consumed.
+
+Used by `Toggl.iter_time_entries()` (one page per date window) and the Reports API client (one
+page per cursor). Each fetch returns its page along with whatever the next fetch needs, so the
+next request can go out before the caller has looked at the current page.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+
+async def prefetched_pages[S, P](
+    fetch: Callable[[S], Awaitable[tuple[P, S | None]]],
+    first: S,
+    prefetch: bool = True,
+) -> AsyncIterator[P]:
+    """Yields the page of `fetch(first)`, then of every following fetch, until one says there are no more.
+
+    Stopping early (or a failed fetch) cancels the page in flight and waits for it, so nothing is
+        left running or holding an exception nobody retrieves.
+
+    Args:
+        fetch (Callable[[S], Awaitable[tuple[P, S | None]]]): Fetches one page. Returns it and the
+            argument for the next fetch, or None after the last page.
+        first (S): Argument for the first fetch.
+        prefetch (bool, optional): Start the next fetch before yielding the current page.
+            Defaults to True.
+
+    Yields:
+        P: Pages, in order.
+    """
+    pending: asyncio.Task | None = asyncio.ensure_future(fetch(first))
+    try:
+        while pending is not None:
+            page, following = await pending
+            pending = None
+            if following is not None and prefetch:
+                pending = asyncio.ensure_future(fetch(following))
+            yield page
+            # Drop our reference so the page can be garbage collected before the next one lands
+            del page
+            if following is not None and not prefetch:
+                pending = asyncio.ensure_future(fetch(following))
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
@@ -0,0 +1,55 @@
+"""Represents a Toggl Project object."""
+
+import logging
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from .const import BASE
+from .time_entries import validate_workspace_id
+
+log = logging.getLogger(__name__)
+
+
+@staticmethod
+# pylint: disable=invalid-name
+def PROJECTS_ENDPOINT(workspace_id: int) -> str:
+    """Returns the endpoint for listing the Projects in a particular workspace."""
+    validate_workspace_id(workspace_id)
+    return f"{BASE}/workspaces/{workspace_id}/projects"
+
+
+class Project(BaseModel):  # pyright: ignore[reportGeneralTypeIssues]
+    """Class representing Project object.
+    See: https://engineering.toggl.com/docs/api/projects
+    """
+
+    id: int = Field(description="Project ID.")
+
+    workspace_id: int = Field(description="Workspace ID the project belongs to.")
+
+    name: str = Field(description="Project name.")
+
+    client_id: int | None = Field(
+        default=None, description="Client ID, null if the project has no client."
+    )
+
+    active: bool = Field(default=True, description="False once archived.")
+
+    is_private: bool | None = Field(default=None)
+
+    billable: bool | None = Field(default=None)
+
+    color: str | None = Field(default=None, description="Hex color, e.g. #06aaf5.")
+
+    estimated_hours: int | None = Field(default=None)
+
+    actual_hours: int | None = Field(default=None)
+
+    at: datetime | None = Field(
+        default=None, exclude=True, repr=False, description="When last updated."
+    )
+
+    server_deleted_at: datetime | None = Field(
+        default=None, exclude=True, repr=False, description="When deleted, if deleted."
+    )
@@ -0,0 +1,137 @@
+"""Client side rate limiting and retry policy for the Toggl API.
+
+Toggl throttles per API token with a leaky bucket and answers with a 429 when it overflows.
+Every `Toggl` instance that uses the same token shares one `LeakyBucket` so concurrent
+coroutines spend a single budget instead of each one discovering the limit on its own.
+See: https://engineering.toggl.com/docs/#leaky-bucket
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from pydantic import BaseModel, Field
+
+from .const import (
+    DEFAULT_BACKOFF_BASE_SECONDS,
+    DEFAULT_BACKOFF_MAX_SECONDS,
+    DEFAULT_MAX_RETRIES,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+)
+
+# One bucket per API token. Weak values so a bucket goes away with the last client using it.
+_BUCKETS: "weakref.WeakValueDictionary[str, LeakyBucket]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+class LeakyBucket:
+    """Leaky bucket (GCRA flavor) that paces requests to `rate` per second.
+
+    Up to `capacity` requests go out back-to-back, after that each request waits for the
+    bucket to drain. Reservations are made synchronously so no lock is needed; the first
+    coroutine to ask gets the first slot.
+    """
+
+    def __init__(
+        self, rate: float = RATE_LIMIT_PER_SECOND, capacity: int = RATE_LIMIT_BURST
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.rate = rate
+        self.capacity = capacity
+        # Theoretical arrival time of the next request, in time.monotonic() seconds
+        self._tat = 0.0
+        self._paused_until = 0.0
+
+    @property
+    def _interval(self) -> float:
+        return 1.0 / self.rate
+
+    def reserve(self) -> float:
+        """Claims the next slot and returns how many seconds the caller must wait for it."""
+        now = time.monotonic()
+        burst = (self.capacity - 1) * self._interval
+        earliest = max(now, self._paused_until, self._tat - burst)
+        self._tat = max(self._tat, earliest) + self._interval
+        return earliest - now
+
+    async def acquire(self) -> float:
+        """Waits until a request may be sent. Returns the time spent waiting, in seconds."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def pause_for(self, seconds: float) -> None:
+        """Holds back every request using this bucket for `seconds`.
+
+        Used when the server tells us to back off (Retry-After, exhausted quota) so the
+        other coroutines sharing the token don't keep hitting the API in the meantime.
+        """
+        if seconds <= 0:
+            return
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def bucket_for_token(api_key: str) -> LeakyBucket:
+    """Returns the shared bucket for `api_key`, creating it with the default limits if needed."""
+    bucket = _BUCKETS.get(api_key)
+    if bucket is None:
+        bucket = LeakyBucket()
+        _BUCKETS[api_key] = bucket
+    return bucket
+
+
+class RetryPolicy(BaseModel):
+    """How the client retries requests that failed for transient reasons."""
+
+    max_retries: int = Field(
+        default=DEFAULT_MAX_RETRIES,
+        ge=0,
+        description="Retries after the first attempt. 0 disables retrying.",
+    )
+
+    backoff_base: float = Field(
+        default=DEFAULT_BACKOFF_BASE_SECONDS,
+        ge=0,
+        description="Upper bound of the first backoff delay, doubled on every attempt.",
+    )
+
+    backoff_max: float = Field(
+        default=DEFAULT_BACKOFF_MAX_SECONDS,
+        ge=0,
+        description="Longest delay we are willing to sleep, including server requested ones.",
+    )
+
+    retry_statuses: frozenset[int] = Field(
+        default=frozenset({429, 500, 502, 503, 504}),
+        description="HTTP status codes that are worth retrying.",
+    )
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given (zero based) attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a `Retry-After` header which is either delay-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
@@ -0,0 +1,286 @@
+"""Toggl Reports API v3: totals computed by Toggl instead of by summing every Time Entry locally.
+
+Three reports, each handed out as an async iterator of rows:
+
+- `Reports.summary()`: seconds per group (Project, Client, User, ...) and sub group.
+- `Reports.detailed()`: one row per Time Entry, with just the fields reports need.
+- `Reports.weekly()`: seconds per day of one week, per User and Project.
+
+Long reports come in pages. The cursor for the next page comes back in the `X-Next-ID` and
+`X-Next-Row-Number` headers; it is followed until there are no more pages, and the next page is
+requested as soon as the current one arrives, so it downloads while the current one is consumed.
+
+Rows are decoded straight from the response into `NamedTuple`s rather than validated into
+pydantic models, which keeps large reports quick to decode and small in memory.
+
+    reports = Reports(client)
+    filters = ReportFilters(start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+    async for row in reports.summary(workspace_id, filters, grouping="users"):
+        ...
+
+See: https://engineering.toggl.com/docs/reports_start
+"""
+
+import json
+from collections.abc import AsyncIterator, Iterable, Mapping
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+from pydantic import BaseModel, Field
+
+from .const import (
+    DEFAULT_REPORT_PAGE_SIZE,
+    REPORTS_BASE,
+    REPORTS_NEXT_ID_HEADER,
+    REPORTS_NEXT_ROW_NUMBER_HEADER,
+    REPORTS_NEXT_TIMESTAMP_HEADER,
+)
+from .prefetch import prefetched_pages
+from .time_entries import validate_workspace_id
+
+if TYPE_CHECKING:
+    from .client import Toggl
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+Grouping = Literal["projects", "clients", "users"]
+SubGrouping = Literal["time_entries", "tasks", "projects", "clients", "users"]
+
+
+@staticmethod
+# pylint: disable=invalid-name
+def REPORT_ENDPOINT(
+    workspace_id: int, report: Literal["summary", "search", "weekly"]
+) -> str:
+    """Returns the endpoint for one of the Time Entry reports of a workspace."""
+    validate_workspace_id(workspace_id)
+    return f"{REPORTS_BASE}/workspace/{workspace_id}/{report}/time_entries"
+
+
+class ReportFilters(BaseModel):
+    """Which Time Entries a report covers. Unset filters don't narrow anything down."""
+
+    start_date: date = Field(description="First day covered.")
+
+    end_date: date | None = Field(
+        default=None, description="Last day covered, inclusive."
+    )
+
+    user_ids: list[int] | None = Field(default=None)
+    project_ids: list[int] | None = Field(default=None)
+    client_ids: list[int] | None = Field(default=None)
+    tag_ids: list[int] | None = Field(default=None)
+    task_ids: list[int] | None = Field(default=None)
+    billable: bool | None = Field(default=None)
+
+    description: str | None = Field(
+        default=None, description="Only entries whose description contains this."
+    )
+
+    def body(self) -> dict[str, Any]:
+        """The filters as a request body."""
+        return self.model_dump(mode="json", exclude_none=True)
+
+
+class SummaryRow(NamedTuple):
+    """Seconds tracked in one sub group of a group of the summary report."""
+
+    group_id: int | None
+    sub_group_id: int | None
+    # Set for sub groups without an ID, e.g. the description when sub grouping by Time Entries
+    title: str | None
+    seconds: int
+
+
+class DetailedRow(NamedTuple):
+    """One Time Entry of the detailed report."""
+
+    id: int
+    user_id: int
+    project_id: int | None
+    task_id: int | None
+    description: str | None
+    billable: bool
+    tag_ids: tuple[int, ...]
+    start: datetime
+    stop: datetime | None
+    seconds: int
+
+
+class WeeklyRow(NamedTuple):
+    """Seconds tracked by one User on one Project on each day of the week."""
+
+    user_id: int
+    project_id: int | None
+    seconds: tuple[int, ...]
+
+    @property
+    def total(self) -> int:
+        """Seconds tracked over the whole week."""
+        return sum(self.seconds)
+
+
+def decode_summary(data: Mapping[str, Any] | None) -> Iterable[SummaryRow]:
+    """Flattens a page of the summary report into one row per sub group."""
+    for group in (data or {}).get("groups") or ():
+        for sub in group.get("sub_groups") or ():
+            yield SummaryRow(
+                group["id"], sub.get("id"), sub.get("title"), sub["seconds"]
+            )
+
+
+def decode_detailed(data: Iterable[Mapping[str, Any]] | None) -> Iterable[DetailedRow]:
+    """Flattens a page of the detailed report into one row per Time Entry."""
+    for row in data or ():
+        tag_ids = tuple(row.get("tag_ids") or ())
+        for te in row["time_entries"]:
+            stop = te.get("stop")
+            yield DetailedRow(
+                te["id"],
+                row["user_id"],
+                row.get("project_id"),
+                row.get("task_id"),
+                row.get("description"),
+                row.get("billable", False),
+                tag_ids,
+                datetime.fromisoformat(te["start"]),
+                None if stop is None else datetime.fromisoformat(stop),
+                te["seconds"],
+            )
+
+
+def decode_weekly(data: Iterable[Mapping[str, Any]] | None) -> Iterable[WeeklyRow]:
+    """Decodes a page of the weekly report."""
+    for row in data or ():
+        yield WeeklyRow(row["user_id"], row.get("project_id"), tuple(row["seconds"]))
+
+
+def next_cursor(headers: Mapping[str, str]) -> dict[str, int] | None:
+    """The request fields that ask for the page after the one `headers` came with, or None if it was the last."""
+    headers = {k.lower(): v for k, v in headers.items()}
+    next_id = headers.get(REPORTS_NEXT_ID_HEADER.lower())
+    next_row = headers.get(REPORTS_NEXT_ROW_NUMBER_HEADER.lower())
+    if not next_id or not next_row:
+        return None
+    cursor = {"first_id": int(next_id), "first_row_number": int(next_row)}
+    timestamp = headers.get(REPORTS_NEXT_TIMESTAMP_HEADER.lower())
+    if timestamp:
+        cursor["first_timestamp"] = int(timestamp)
+    return cursor
+
+
+class Reports:
+    """Reports API v3 requests, sent through `client` (and its rate limiter)."""
+
+    def __init__(self, client: "Toggl") -> None:
+        self.client = client
+
+    async def summary(
+        self,
+        workspace_id: int,
+        filters: ReportFilters,
+        grouping: Grouping = "projects",
+        sub_grouping: SubGrouping = "time_entries",
+        prefetch: bool = True,
+    ) -> AsyncIterator[SummaryRow]:
+        """Seconds tracked per group and sub group.
+
+        Args:
+            workspace_id (int): Workspace to report on.
+            filters (ReportFilters): Time Entries to cover.
+            grouping (Grouping, optional): What rows are grouped by. Defaults to "projects".
+            sub_grouping (SubGrouping, optional): What groups are split by. Defaults to "time_entries",
+                which splits by description.
+            prefetch (bool, optional): Request the next page while the current one is consumed.
+
+        Returns:
+            AsyncIterator[SummaryRow]: One row per sub group.
+        """
+        body = {**filters.body(), "grouping": grouping, "sub_grouping": sub_grouping}
+        url = REPORT_ENDPOINT(workspace_id, "summary")
+        async for page in self._pages(url, body, prefetch):
+            for row in decode_summary(page):
+                yield row
+
+    async def detailed(
+        self,
+        workspace_id: int,
+        filters: ReportFilters,
+        page_size: int = DEFAULT_REPORT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[DetailedRow]:
+        """Every Time Entry covered by `filters`, newest first.
+
+        Args:
+            workspace_id (int): Workspace to report on.
+            filters (ReportFilters): Time Entries to cover.
+            page_size (int, optional): Rows per request. Defaults to DEFAULT_REPORT_PAGE_SIZE.
+            prefetch (bool, optional): Request the next page while the current one is consumed.
+
+        Returns:
+            AsyncIterator[DetailedRow]: One row per Time Entry.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        body = {**filters.body(), "page_size": page_size}
+        url = REPORT_ENDPOINT(workspace_id, "search")
+        async for page in self._pages(url, body, prefetch):
+            for row in decode_detailed(page):
+                yield row
+
+    async def weekly(
+        self,
+        workspace_id: int,
+        filters: ReportFilters,
+        prefetch: bool = True,
+    ) -> AsyncIterator[WeeklyRow]:
+        """Seconds per day of the week starting on `filters.start_date`, per User and Project.
+
+        Args:
+            workspace_id (int): Workspace to report on.
+            filters (ReportFilters): Time Entries to cover. Only the week from `start_date` is reported.
+            prefetch (bool, optional): Request the next page while the current one is consumed.
+
+        Returns:
+            AsyncIterator[WeeklyRow]: One row per User and Project.
+        """
+        url = REPORT_ENDPOINT(workspace_id, "weekly")
+        async for page in self._pages(url, filters.body(), prefetch):
+            for row in decode_weekly(page):
+                yield row
+
+    async def _pages(
+        self, url: str, body: dict[str, Any], prefetch: bool
+    ) -> AsyncIterator[Any]:
+        """Every page of a report, following the cursor until the last one."""
+
+        async def fetch(cursor: dict[str, int]) -> tuple[Any, dict[str, int] | None]:
+            return await self._page(url, {**body, **cursor})
+
+        async for page in prefetched_pages(fetch, {}, prefetch):
+            yield page
+
+    async def _page(
+        self, url: str, body: dict[str, Any]
+    ) -> tuple[Any, dict[str, int] | None]:
+        headers: dict[str, str] = {}
+        # Reports are requested with POST but only read, so they are safe to retry
+        data = await self.client.do_request(
+            "POST",
+            url,
+            data=json.dumps(body),
+            response_headers=headers,
+            idempotent=True,
+        )
+        cursor = next_cursor(headers)
+        log.debug("report page", extra={"url": url, "more": cursor is not None})
+        return data, cursor
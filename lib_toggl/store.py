@@ -0,0 +1,372 @@
+"""Local SQLite mirror of Time Entries, Tags and Workspaces.
+
+Hand a `LocalStore` to `Toggl(store=...)` and the client will:
+
+- write every Time Entry, Tag and Workspace it fetches or writes into the store,
+- answer `get_time_entries()` for a date range it has fetched before from the store,
+- persist incremental sync state so `sync_time_entries()` picks up where the last process left off,
+- seed its Workspace and Tag caches from the store on a cold start.
+
+A range is only served locally once it has been fetched in full; what happens on the server
+after that (edits made in the Toggl app, another device) reaches the store through
+`sync_time_entries()`, so call it periodically for every workspace you read from the store.
+
+Time Entries are stored as JSON next to a few indexed columns (workspace, project, start) so
+range queries are an index scan plus the trusted decode path. Everything runs on the event
+loop thread; a query is well under a millisecond so there is nothing to gain from a thread pool.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from .codec import JsonCodec, default_codec
+from .decode import construct_time_entry, encode_time_entry
+from .sync import SyncState
+from .tags import Tag
+from .time_entries import TimeEntry
+from .workspace import Workspace
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS time_entries (
+    id INTEGER PRIMARY KEY,
+    workspace_id INTEGER NOT NULL,
+    project_id INTEGER,
+    start REAL,
+    at REAL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS time_entries_workspace_start ON time_entries (workspace_id, start);
+CREATE INDEX IF NOT EXISTS time_entries_project_start ON time_entries (project_id, start);
+CREATE INDEX IF NOT EXISTS time_entries_start ON time_entries (start);
+
+-- [start, end) ranges of entry start times that have been fetched in full
+CREATE TABLE IF NOT EXISTS coverage (
+    start REAL NOT NULL,
+    end REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY,
+    workspace_id INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_workspace ON tags (workspace_id);
+
+CREATE TABLE IF NOT EXISTS workspaces (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
+-- When a full listing was last fetched; keys are "workspaces" and "tags:<workspace_id>"
+CREATE TABLE IF NOT EXISTS fetched (
+    key TEXT PRIMARY KEY,
+    at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    workspace_id INTEGER PRIMARY KEY,
+    since REAL
+);
+"""
+
+
+def _epoch(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class LocalStore:
+    """SQLite backed mirror. `path` is a file, or ":memory:" for a store that lives as long as the object."""
+
+    def __init__(
+        self, path: str | os.PathLike = ":memory:", codec: JsonCodec | None = None
+    ) -> None:
+        self.path = path
+        self._codec = codec or default_codec()
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        elif version != SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{path} has schema version {version}, expected {SCHEMA_VERSION}."
+            )
+        # A mirror can always be rebuilt from the API; trade durability for write speed
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excinfo):
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._db.close()
+
+    ##
+    # Time Entries
+    ##
+
+    def put_time_entries(self, entries: Iterable[TimeEntry]) -> None:
+        """Inserts or updates Time Entries. Deleted entries are removed.
+
+        A row is only replaced by an entry at least as new (by `at`) as the one stored, so
+            an old response landing late can't undo a newer write.
+        """
+        upserts = []
+        deletes = []
+        for te in entries:
+            if te.id is None:
+                continue
+            if te.server_deleted_at is not None:
+                deletes.append((te.id,))
+                continue
+            upserts.append(
+                (
+                    te.id,
+                    te.workspace_id,
+                    te.project_id,
+                    _epoch(te.start),
+                    _epoch(te.at),
+                    encode_time_entry(te),
+                )
+            )
+        with self._db:
+            self._db.executemany(
+                """
+                INSERT INTO time_entries (id, workspace_id, project_id, start, at, data)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    workspace_id = excluded.workspace_id,
+                    project_id = excluded.project_id,
+                    start = excluded.start,
+                    at = excluded.at,
+                    data = excluded.data
+                WHERE excluded.at IS NULL OR time_entries.at IS NULL OR excluded.at >= time_entries.at
+                """,
+                upserts,
+            )
+            self._db.executemany("DELETE FROM time_entries WHERE id = ?", deletes)
+
+    def delete_time_entries(self, time_entry_ids: Iterable[int]) -> None:
+        """Removes Time Entries."""
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM time_entries WHERE id = ?",
+                [(x,) for x in time_entry_ids],
+            )
+
+    def forget_time_entries(self, time_entry_ids: Iterable[int]) -> None:
+        """Removes Time Entries whose stored state is known to be out of date.
+
+        The ranges they were in are no longer complete, so the coverage around them is dropped too
+            and the next query for those dates goes to the API.
+        """
+        ids = [(x,) for x in time_entry_ids]
+        with self._db:
+            for (time_entry_id,) in ids:
+                row = self._db.execute(
+                    "SELECT start FROM time_entries WHERE id = ?", (time_entry_id,)
+                ).fetchone()
+                if row is not None and row[0] is not None:
+                    self._db.execute(
+                        "DELETE FROM coverage WHERE start <= ? AND ? < end",
+                        (row[0], row[0]),
+                    )
+            self._db.executemany("DELETE FROM time_entries WHERE id = ?", ids)
+
+    def _decode_rows(self, rows: Iterable[tuple[Any]]) -> list[TimeEntry]:
+        loads = self._codec.loads
+        return [construct_time_entry(loads(data)) for (data,) in rows]
+
+    def get_time_entry(self, time_entry_id: int) -> TimeEntry | None:
+        """A single stored Time Entry."""
+        entries = self._decode_rows(
+            self._db.execute(
+                "SELECT data FROM time_entries WHERE id = ?", (time_entry_id,)
+            )
+        )
+        return entries[0] if entries else None
+
+    def time_entries(
+        self,
+        start: datetime,
+        end: datetime,
+        workspace_id: int | None = None,
+        project_id: int | None = None,
+    ) -> list[TimeEntry]:
+        """Stored Time Entries that started in [start, end), oldest first.
+
+        Args:
+            start (datetime): Earliest start time.
+            end (datetime): Start times must be before this.
+            workspace_id (int | None, optional): Only this workspace.
+            project_id (int | None, optional): Only this project.
+
+        Returns:
+            list[TimeEntry]: Matching entries.
+        """
+        query = "SELECT data FROM time_entries WHERE start >= ? AND start < ?"
+        params: list[Any] = [_epoch(start), _epoch(end)]
+        if workspace_id is not None:
+            query += " AND workspace_id = ?"
+            params.append(workspace_id)
+        if project_id is not None:
+            query += " AND project_id = ?"
+            params.append(project_id)
+        query += " ORDER BY start, id"
+        return self._decode_rows(self._db.execute(query, params))
+
+    def known_time_entries(self, workspace_id: int) -> dict[int, datetime | None]:
+        """ID -> `at` of every stored entry in a workspace, the shape `SyncState.known` uses."""
+        rows = self._db.execute(
+            "SELECT id, at FROM time_entries WHERE workspace_id = ?", (workspace_id,)
+        )
+        return {
+            te_id: None if at is None else datetime.fromtimestamp(at, tz=UTC)
+            for te_id, at in rows
+        }
+
+    ##
+    # Coverage
+    ##
+
+    def add_coverage(self, start: datetime, end: datetime) -> None:
+        """Records that every entry starting in [start, end) has been fetched. Overlapping ranges are merged."""
+        lo, hi = _epoch(start), _epoch(end)
+        if lo is None or hi is None or hi <= lo:
+            return
+        with self._db:
+            for row_start, row_end in self._db.execute(
+                "SELECT start, end FROM coverage WHERE start <= ? AND end >= ?",
+                (hi, lo),
+            ).fetchall():
+                lo, hi = min(lo, row_start), max(hi, row_end)
+            self._db.execute(
+                "DELETE FROM coverage WHERE start >= ? AND end <= ?", (lo, hi)
+            )
+            self._db.execute(
+                "INSERT INTO coverage (start, end) VALUES (?, ?)", (lo, hi)
+            )
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """True if every entry starting in [start, end) is in the store."""
+        row = self._db.execute(
+            "SELECT 1 FROM coverage WHERE start <= ? AND end >= ? LIMIT 1",
+            (_epoch(start), _epoch(end)),
+        ).fetchone()
+        return row is not None
+
+    ##
+    # Tags and Workspaces
+    ##
+
+    def _fetched_age(self, key: str) -> float | None:
+        row = self._db.execute(
+            "SELECT at FROM fetched WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else max(0.0, time.time() - row[0])
+
+    def _mark_fetched(self, key: str) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO fetched (key, at) VALUES (?, ?)", (key, time.time())
+        )
+
+    def put_tags(self, workspace_id: int, tags: Iterable[Tag]) -> None:
+        """Replaces the stored Tags of a workspace with a full listing."""
+        with self._db:
+            self._db.execute("DELETE FROM tags WHERE workspace_id = ?", (workspace_id,))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO tags (id, workspace_id, data) VALUES (?, ?, ?)",
+                [
+                    (tag.id, workspace_id, tag.model_dump_json(exclude_unset=True))
+                    for tag in tags
+                    if tag.id is not None
+                ],
+            )
+            self._mark_fetched(f"tags:{workspace_id}")
+
+    def put_tag(self, tag: Tag) -> None:
+        """Inserts or updates a single Tag, e.g. one that was just created."""
+        if tag.id is None:
+            return
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO tags (id, workspace_id, data) VALUES (?, ?, ?)",
+                (tag.id, tag.workspace_id, tag.model_dump_json(exclude_unset=True)),
+            )
+
+    def tags(self, workspace_id: int) -> tuple[list[Tag], float] | None:
+        """Stored Tags of a workspace and the age of that listing in seconds, None if never stored."""
+        age = self._fetched_age(f"tags:{workspace_id}")
+        if age is None:
+            return None
+        rows = self._db.execute(
+            "SELECT data FROM tags WHERE workspace_id = ? ORDER BY id", (workspace_id,)
+        )
+        return [Tag.model_validate_json(data) for (data,) in rows], age
+
+    def put_workspaces(self, workspaces: Iterable[Workspace]) -> None:
+        """Replaces the stored Workspaces with a full listing. API tokens are never written."""
+        with self._db:
+            self._db.execute("DELETE FROM workspaces")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO workspaces (id, data) VALUES (?, ?)",
+                [
+                    # api_token is excluded from dumps by the model
+                    (ws.id, ws.model_dump_json(exclude_unset=True))
+                    for ws in workspaces
+                    if ws.id is not None
+                ],
+            )
+            self._mark_fetched("workspaces")
+
+    def workspaces(self) -> tuple[list[Workspace], float] | None:
+        """Stored Workspaces and the age of that listing in seconds, None if never stored."""
+        age = self._fetched_age("workspaces")
+        if age is None:
+            return None
+        rows = self._db.execute("SELECT data FROM workspaces ORDER BY id")
+        return [
+            Workspace.model_validate({**json.loads(data), "api_token": None})
+            for (data,) in rows
+        ], age
+
+    ##
+    # Sync state
+    ##
+
+    def save_sync_state(self, state: SyncState) -> None:
+        """Stores a workspace's high-water mark. `known` is rebuilt from the stored entries."""
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state (workspace_id, since) VALUES (?, ?)",
+                (state.workspace_id, _epoch(state.since)),
+            )
+
+    def load_sync_state(self, workspace_id: int) -> SyncState | None:
+        """Sync state saved by `save_sync_state()`, None if there is none."""
+        row = self._db.execute(
+            "SELECT since FROM sync_state WHERE workspace_id = ?", (workspace_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        since = None if row[0] is None else datetime.fromtimestamp(row[0], tz=UTC)
+        return SyncState(
+            workspace_id=workspace_id,
+            since=since,
+            known=self.known_time_entries(workspace_id),
+        )
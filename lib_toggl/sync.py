@@ -0,0 +1,90 @@
+"""Incremental sync of Time Entries.
+
+The v9 `/me/time_entries` endpoint takes a `since` UNIX timestamp and returns everything modified
+after it, deleted entries included. Each entry carries an `at` (last modified) timestamp so we
+keep a per-workspace high-water mark and only ever ask for what changed since the last sync.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from .time_entries import TimeEntry
+
+
+class SyncState(BaseModel):
+    """What a client knows about one workspace between syncs."""
+
+    workspace_id: int
+
+    since: datetime | None = Field(
+        default=None,
+        description="High-water mark: the newest `at` seen so far. None until the first sync.",
+    )
+
+    known: dict[int, datetime | None] = Field(
+        default_factory=dict,
+        description="Time Entry ID -> `at` of every live entry seen so far.",
+    )
+
+
+class TimeEntryChanges(BaseModel):
+    """Result of one incremental sync for a workspace."""
+
+    workspace_id: int
+
+    since: datetime | None = Field(
+        default=None, description="High-water mark the sync started from."
+    )
+
+    until: datetime | None = Field(
+        default=None, description="High-water mark after the sync."
+    )
+
+    inserted: list[TimeEntry] = Field(default_factory=list)
+    updated: list[TimeEntry] = Field(default_factory=list)
+    deleted: list[TimeEntry] = Field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+def apply_changes(
+    state: SyncState, entries: list[TimeEntry], fallback_until: datetime
+) -> TimeEntryChanges:
+    """Sorts fetched entries into inserted/updated/deleted and advances `state`.
+
+    `since` is inclusive (second resolution) so entries we already have at the same `at`
+        come back again; those are dropped rather than reported as updates.
+
+    Args:
+        state (SyncState): State to diff against, updated in place.
+        entries (list[TimeEntry]): Entries the server returned. Other workspaces are ignored.
+        fallback_until (datetime): New high-water mark if nothing came back on the first sync.
+
+    Returns:
+        TimeEntryChanges: What changed.
+    """
+    changes = TimeEntryChanges(workspace_id=state.workspace_id, since=state.since)
+    newest = state.since
+
+    for te in entries:
+        if te.workspace_id != state.workspace_id or te.id is None:
+            continue
+        if te.at is not None and (newest is None or te.at > newest):
+            newest = te.at
+
+        if te.server_deleted_at is not None:
+            state.known.pop(te.id, None)
+            changes.deleted.append(te)
+            continue
+
+        if te.id not in state.known:
+            changes.inserted.append(te)
+        elif state.known[te.id] != te.at or te.at is None:
+            changes.updated.append(te)
+        state.known[te.id] = te.at
+
+    state.since = newest or fallback_until
+    changes.until = state.since
+    return changes
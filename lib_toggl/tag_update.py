@@ -0,0 +1,79 @@
+"""Plans the API calls needed to move a Time Entry from its current tags to a desired set.
+
+See `Toggl.update_tags()` for why this takes more than one call. Planning is kept separate from
+doing so callers can inspect (or skip) the work before any request is sent.
+"""
+
+from pydantic import BaseModel, Field
+
+from .cache import TagIndex
+from .time_entries import TimeEntry
+
+
+class TagUpdatePlan(BaseModel):
+    """The minimal set of calls to give a Time Entry exactly the `desired` tags."""
+
+    workspace_id: int
+    time_entry_id: int
+
+    desired: list[str] = Field(description="Tags the Time Entry should end up with.")
+
+    to_create: list[str] = Field(
+        default_factory=list,
+        description="Tags that don't exist in the workspace yet. Created concurrently.",
+    )
+
+    to_add: list[str] = Field(
+        default_factory=list, description="Tags to attach; sent in one PUT."
+    )
+
+    to_remove: list[str] = Field(
+        default_factory=list, description="Tags to detach; sent in one PUT."
+    )
+
+    unresolved: list[str] = Field(
+        default_factory=list,
+        description="Tags to detach that the workspace doesn't know; they can't be removed by ID.",
+    )
+
+    @property
+    def put_count(self) -> int:
+        """PUT requests needed. The API takes one `tag_action` per request so add + remove is two."""
+        return int(bool(self.to_add)) + int(bool(self.to_remove))
+
+    @property
+    def call_count(self) -> int:
+        """Total requests `Toggl.apply_tag_update()` will send."""
+        return len(self.to_create) + self.put_count
+
+    def __bool__(self) -> bool:
+        # Tags that can't be removed still mean the entry doesn't have the desired tags
+        return self.call_count > 0 or bool(self.unresolved)
+
+
+def plan_tag_update(
+    te: TimeEntry, new_tags: list[str], index: TagIndex
+) -> TagUpdatePlan:
+    """Diffs the tags on `te` against `new_tags` using the workspace's tag index.
+
+    Args:
+        te (TimeEntry): Time Entry as the server knows it.
+        new_tags (list[str]): Tags it should have.
+        index (TagIndex): Tags that exist in the workspace.
+
+    Returns:
+        TagUpdatePlan: What needs to happen.
+    """
+    current = list(dict.fromkeys(te.tags or []))
+    desired = list(dict.fromkeys(new_tags))
+
+    to_remove = [tag for tag in current if tag not in desired]
+    return TagUpdatePlan(
+        workspace_id=te.workspace_id,
+        time_entry_id=te.id,  # pyright: ignore reportArgumentType
+        desired=desired,
+        to_create=[tag for tag in desired if tag not in index.by_name],
+        to_add=[tag for tag in desired if tag not in current],
+        to_remove=[tag for tag in to_remove if tag in index.by_name],
+        unresolved=[tag for tag in to_remove if tag not in index.by_name],
+    )
@@ -0,0 +1,49 @@
+"""Represents a Toggl Task object. Tasks belong to a Project."""
+
+import logging
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from .const import BASE
+from .time_entries import validate_workspace_id
+
+log = logging.getLogger(__name__)
+
+
+@staticmethod
+# pylint: disable=invalid-name
+def TASKS_ENDPOINT(workspace_id: int) -> str:
+    """Returns the endpoint for listing the Tasks in a particular workspace."""
+    validate_workspace_id(workspace_id)
+    return f"{BASE}/workspaces/{workspace_id}/tasks"
+
+
+class Task(BaseModel):  # pyright: ignore[reportGeneralTypeIssues]
+    """Class representing Task object.
+    See: https://engineering.toggl.com/docs/api/tasks
+    """
+
+    id: int = Field(description="Task ID.")
+
+    workspace_id: int = Field(description="Workspace ID the task belongs to.")
+
+    project_id: int = Field(description="Project ID the task belongs to.")
+
+    name: str = Field(description="Task name.")
+
+    active: bool = Field(default=True)
+
+    user_id: int | None = Field(default=None, description="Assignee, if any.")
+
+    estimated_seconds: int | None = Field(default=None)
+
+    tracked_seconds: int | None = Field(default=None)
+
+    at: datetime | None = Field(
+        default=None, exclude=True, repr=False, description="When last updated."
+    )
+
+    server_deleted_at: datetime | None = Field(
+        default=None, exclude=True, repr=False, description="When deleted, if deleted."
+    )
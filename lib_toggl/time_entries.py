@@ -68,6 +68,19 @@ def EDIT_ENDPOINT(workspace_id: int, time_entry_id: int) -> str:
     return f"{BASE}/workspaces/{workspace_id}/time_entries/{time_entry_id}"
 
 
+@staticmethod
+# pylint: disable=invalid-name
+def BULK_EDIT_ENDPOINT(workspace_id: int, time_entry_ids: list[int]) -> str:
+    """Returns the endpoint for patching several time entries in the specified workspace at once"""
+    validate_workspace_id(workspace_id)
+    if not time_entry_ids:
+        raise ValueError("time_entry_ids must not be empty")
+    for time_entry_id in time_entry_ids:
+        validate_time_entry_id(time_entry_id)
+    _ids = ",".join(str(x) for x in time_entry_ids)
+    return f"{BASE}/workspaces/{workspace_id}/time_entries/{_ids}"
+
+
 @staticmethod
 # pylint: disable=invalid-name
 def EXPLICIT_ENDPOINT(time_entry_id: int) -> str:
@@ -229,3 +242,34 @@ class TimeEntry(BaseModel):  # pyright: ignore[reportGeneralTypeIssues]
             _type_: _description_
         """
         return generate(dt, utc=True, accept_naive=True)
+
+
+class PatchOperation(BaseModel):  # pyright: ignore[reportGeneralTypeIssues]
+    """A single JSON Patch (RFC 6902) operation for the bulk edit endpoint.
+    See: https://engineering.toggl.com/docs/api/time_entries#patch-bulk-editing-time-entries
+    """
+
+    op: str = Field(pattern=r"^(add|remove|replace)$", description="Operation")
+
+    path: str = Field(description="Field to operate on, e.g. `/description`.")
+
+    value: Any = Field(default=None, description="New value, not used by `remove`.")
+
+
+class BulkEditFailure(BaseModel):  # pyright: ignore[reportGeneralTypeIssues]
+    """A Time Entry the server refused to patch."""
+
+    id: int
+    message: str = Field(default="", description="Why the server refused.")
+
+
+class BulkEditResult(BaseModel):  # pyright: ignore[reportGeneralTypeIssues]
+    """Per-entry outcome of one or more bulk edit requests."""
+
+    success: list[int] = Field(default_factory=list)
+    failure: list[BulkEditFailure] = Field(default_factory=list)
+
+    def merge(self, other: "BulkEditResult") -> None:
+        """Folds `other` into this result."""
+        self.success.extend(other.success)
+        self.failure.extend(other.failure)
@@ -0,0 +1,527 @@
+"""Toggl Webhooks: push notifications instead of polling.
+
+Three parts:
+
+- `Webhooks` manages subscriptions through the Webhooks API (a sibling of /api/v9).
+- `WebhookReceiver` is an aiohttp app that checks the `X-Webhook-Signature-256` HMAC of each
+    delivery, answers the validation handshake, decodes events into the usual models, applies them
+    to a `Toggl` client's caches and hands them out through `events()`.
+- `build_event()` and `signed_request()` produce deliveries exactly like Toggl's, so a receiver can
+    be exercised locally without a public URL.
+
+    receiver = WebhookReceiver(secret, client=client)
+    await receiver.start(port=8080)
+    subscription = await Webhooks(client).create_subscription(
+        workspace_id, "https://example.com/toggl/webhook", [EventFilter(entity="time_entry", action="*")],
+        secret=secret,
+    )
+    async for event in receiver.events():
+        ...
+
+See: https://engineering.toggl.com/docs/webhooks_start
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from aiohttp import web
+from pydantic import BaseModel, ConfigDict, Field, SecretStr, ValidationError
+
+from .clients import Client
+from .const import WEBHOOK_DEDUPE_SIZE, WEBHOOK_SIGNATURE_HEADER, WEBHOOKS_BASE
+from .projects import Project
+from .tags import Tag
+from .tasks import Task
+from .time_entries import TimeEntry, validate_workspace_id
+
+if TYPE_CHECKING:
+    from .client import Toggl
+
+# Try structlog (available in dev context), fall back to stdlib logging
+try:
+    import structlog
+
+    log = structlog.get_logger()
+
+except ImportError:
+    import logging
+
+    log = logging.getLogger(__name__)
+
+# What `WebhookEvent.entity()` decodes the payload of each kind of event into
+ENTITY_MODELS: dict[str, type[BaseModel]] = {
+    "time_entry": TimeEntry,
+    "tag": Tag,
+    "project": Project,
+    "client": Client,
+    "task": Task,
+}
+
+EVENT_FILTERS_ENDPOINT = f"{WEBHOOKS_BASE}/event_filters"
+
+
+@staticmethod
+# pylint: disable=invalid-name
+def SUBSCRIPTIONS_ENDPOINT(
+    workspace_id: int, subscription_id: int | None = None
+) -> str:
+    """Returns the endpoint for the webhook subscriptions of a workspace, or one of them."""
+    validate_workspace_id(workspace_id)
+    url = f"{WEBHOOKS_BASE}/subscriptions/{workspace_id}"
+    return url if subscription_id is None else f"{url}/{subscription_id}"
+
+
+class EventFilter(BaseModel):
+    """Which events a subscription receives. "*" matches every entity or action."""
+
+    entity: str = Field(description='e.g. "time_entry", "project" or "*".')
+    action: str = Field(description='"created", "updated", "deleted" or "*".')
+
+
+class Subscription(BaseModel):
+    """A webhook subscription.
+    See: https://engineering.toggl.com/docs/webhooks/subscriptions
+    """
+
+    subscription_id: int | None = Field(default=None)
+    workspace_id: int
+    user_id: int | None = Field(default=None)
+    url_callback: str = Field(description="Where events are POSTed.")
+    description: str = Field(default="")
+    event_filters: list[EventFilter] = Field(default_factory=list)
+    enabled: bool = Field(default=True)
+    secret: SecretStr | None = Field(
+        default=None, description="Key of the HMAC that signs each delivery."
+    )
+    validated_at: datetime | None = Field(
+        default=None, description="Null until the callback URL passed validation."
+    )
+    has_pending_events: bool | None = Field(default=None)
+    created_at: datetime | None = Field(default=None, repr=False)
+    updated_at: datetime | None = Field(default=None, repr=False)
+
+
+class EventMetadata(BaseModel):
+    """What happened. The API adds more keys depending on the entity; they are kept."""
+
+    model_config = ConfigDict(extra="allow")
+
+    action: str = Field(description='"created", "updated" or "deleted".')
+    model: str = Field(description='Kind of entity, e.g. "time_entry".')
+    workspace_id: int | None = Field(default=None)
+    event_user_id: int | None = Field(default=None)
+    request_type: str | None = Field(default=None)
+    path: str | None = Field(default=None)
+
+
+class WebhookEvent(BaseModel):
+    """One delivery."""
+
+    event_id: int
+    subscription_id: int
+    created_at: datetime | None = Field(default=None)
+    creator_id: int | None = Field(default=None)
+    metadata: EventMetadata | None = Field(default=None)
+    payload: Any = Field(description='The entity as the API returns it, or "ping".')
+    timestamp: datetime | None = Field(default=None)
+    url_callback: str | None = Field(default=None, repr=False)
+    validation_code: str | None = Field(default=None, repr=False)
+    validation_code_url: str | None = Field(default=None, repr=False)
+
+    @property
+    def is_ping(self) -> bool:
+        """True for pings and validation requests, which carry no entity."""
+        return self.payload == "ping" or self.metadata is None
+
+    @property
+    def action(self) -> str | None:
+        """What was done to the entity: "created", "updated" or "deleted"."""
+        return None if self.metadata is None else self.metadata.action
+
+    @property
+    def model(self) -> str | None:
+        """Kind of entity, e.g. "time_entry"."""
+        return None if self.metadata is None else self.metadata.model
+
+    @property
+    def entity_id(self) -> int | None:
+        """ID of the entity the event is about."""
+        if isinstance(self.payload, dict) and self.payload.get("id") is not None:
+            return int(self.payload["id"])
+        return None
+
+    def entity(self) -> BaseModel | None:
+        """The payload decoded into its model (`TimeEntry`, `Tag`, `Project`, `Client` or `Task`).
+
+        Raises:
+            pydantic.ValidationError: If the payload doesn't fit the model.
+
+        Returns:
+            BaseModel | None: None for pings and for kinds of entity without a model.
+        """
+        model = ENTITY_MODELS.get(self.model or "")
+        if self.is_ping or model is None or not isinstance(self.payload, dict):
+            return None
+        return model.model_validate(self.payload)
+
+
+##
+# Signatures and test deliveries
+##
+
+
+def sign(secret: str, body: bytes) -> str:
+    """Value of the signature header for `body`, as Toggl computes it."""
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """True if `signature` (the header value) is the HMAC of `body` keyed by `secret`."""
+    if not signature:
+        return False
+    return hmac.compare_digest(sign(secret, body), signature.strip())
+
+
+def build_event(
+    entity: BaseModel | Mapping[str, Any] | None,
+    action: str = "updated",
+    model: str | None = None,
+    workspace_id: int | None = None,
+    subscription_id: int = 1,
+    event_id: int | None = None,
+    validation_code: str | None = None,
+) -> dict[str, Any]:
+    """A delivery body as Toggl sends it. Pass `entity=None` for a ping.
+
+    Args:
+        entity (BaseModel | Mapping[str, Any] | None): The entity the event is about.
+        action (str, optional): "created", "updated" or "deleted". Defaults to "updated".
+        model (str | None, optional): Kind of entity. Worked out from the type of `entity` if not given.
+        workspace_id (int | None, optional): Taken from the entity if not given.
+        subscription_id (int, optional): Defaults to 1.
+        event_id (int | None, optional): Random if not given.
+        validation_code (str | None, optional): Makes it a validation request. Defaults to None.
+
+    Returns:
+        dict[str, Any]: JSON-able event.
+    """
+    now = datetime.now(UTC).isoformat()
+    event: dict[str, Any] = {
+        "event_id": event_id if event_id is not None else uuid.uuid4().int >> 80,
+        "subscription_id": subscription_id,
+        "created_at": now,
+        "timestamp": now,
+        "payload": "ping",
+        "metadata": None,
+    }
+    if validation_code is not None:
+        event["validation_code"] = validation_code
+    if entity is None:
+        return event
+
+    if isinstance(entity, BaseModel):
+        if model is None:
+            model = next(k for k, v in ENTITY_MODELS.items() if isinstance(entity, v))
+        payload = entity.model_dump(mode="json", by_alias=True)
+    else:
+        payload = dict(entity)
+    if workspace_id is None:
+        workspace_id = payload.get("workspace_id", payload.get("wid"))
+    if model is None:
+        raise ValueError("model must be given for a plain dict entity.")
+    event["payload"] = payload
+    event["metadata"] = {
+        "action": action,
+        "model": model,
+        "workspace_id": workspace_id,
+        f"{model}_id": payload.get("id"),
+    }
+    return event
+
+
+def signed_request(
+    secret: str, event: Mapping[str, Any]
+) -> tuple[bytes, dict[str, str]]:
+    """Body and headers of a delivery of `event`, signed with `secret`."""
+    body = json.dumps(event).encode()
+    return body, {
+        "Content-Type": "application/json",
+        WEBHOOK_SIGNATURE_HEADER: sign(secret, body),
+    }
+
+
+##
+# Subscription management
+##
+
+
+class Webhooks:
+    """Webhook subscription management, sent through `client` (and its rate limiter)."""
+
+    def __init__(self, client: "Toggl") -> None:
+        self.client = client
+
+    async def get_event_filters(self) -> dict[str, list[str]]:
+        """Entities and actions that can be subscribed to."""
+        return await self.client.do_get_request(EVENT_FILTERS_ENDPOINT) or {}
+
+    async def get_subscriptions(self, workspace_id: int) -> list[Subscription]:
+        """Subscriptions of the workspace made by this user."""
+        data = await self.client.do_get_request(SUBSCRIPTIONS_ENDPOINT(workspace_id))
+        return [Subscription.model_validate(x) for x in data or ()]
+
+    async def create_subscription(
+        self,
+        workspace_id: int,
+        url_callback: str,
+        event_filters: list[EventFilter],
+        description: str = "lib-toggl",
+        secret: str | None = None,
+        enabled: bool = True,
+    ) -> Subscription:
+        """Subscribes `url_callback` to events. Toggl then sends it a validation request.
+
+        Args:
+            workspace_id (int): Workspace to receive events for.
+            url_callback (str): Where events are POSTed.
+            event_filters (list[EventFilter]): Events to receive.
+            description (str, optional): Must be unique per workspace. Defaults to "lib-toggl".
+            secret (str | None, optional): HMAC key. Toggl generates one if not given.
+            enabled (bool, optional): Defaults to True.
+
+        Returns:
+            Subscription: The new subscription, including its secret.
+        """
+        body: dict[str, Any] = {
+            "url_callback": url_callback,
+            "event_filters": [x.model_dump() for x in event_filters],
+            "description": description,
+            "enabled": enabled,
+        }
+        if secret is not None:
+            body["secret"] = secret
+        data = await self.client.do_post_request(
+            SUBSCRIPTIONS_ENDPOINT(workspace_id),
+            data_as_json_str=json.dumps(body),
+        )
+        return Subscription.model_validate(data)
+
+    async def update_subscription(self, subscription: Subscription) -> Subscription:
+        """Replaces the URL, filters, description and enabled flag of a subscription."""
+        body = {
+            "url_callback": subscription.url_callback,
+            "event_filters": [x.model_dump() for x in subscription.event_filters],
+            "description": subscription.description,
+            "enabled": subscription.enabled,
+        }
+        if subscription.secret is not None:
+            body["secret"] = subscription.secret.get_secret_value()
+        data = await self.client.do_put_request(
+            SUBSCRIPTIONS_ENDPOINT(
+                subscription.workspace_id, subscription.subscription_id
+            ),
+            data_as_json_str=json.dumps(body),
+        )
+        return Subscription.model_validate(data)
+
+    async def set_subscription_enabled(
+        self, workspace_id: int, subscription_id: int, enabled: bool
+    ) -> Subscription:
+        """Pauses or resumes deliveries."""
+        data = await self.client.do_patch_request(
+            SUBSCRIPTIONS_ENDPOINT(workspace_id, subscription_id),
+            data={"enabled": enabled},
+        )
+        return Subscription.model_validate(data)
+
+    async def delete_subscription(
+        self, workspace_id: int, subscription_id: int
+    ) -> None:
+        """Removes a subscription."""
+        await self.client.do_request(
+            "DELETE", SUBSCRIPTIONS_ENDPOINT(workspace_id, subscription_id), raw=True
+        )
+
+    async def ping_subscription(self, workspace_id: int, subscription_id: int) -> None:
+        """Asks Toggl to send a ping event to the callback URL."""
+        await self.client.do_post_request(
+            f"{WEBHOOKS_BASE}/ping/{workspace_id}/{subscription_id}",
+            data_as_json_str=b"",
+            raw=True,
+        )
+
+    async def validate_subscription(
+        self, workspace_id: int, subscription_id: int, validation_code: str
+    ) -> None:
+        """Validates the callback URL out of band, for receivers that can't echo the code."""
+        await self.client.do_get_request(
+            f"{WEBHOOKS_BASE}/validate/{workspace_id}/{subscription_id}/{validation_code}",
+            raw=True,
+        )
+
+
+##
+# Receiver
+##
+
+
+class WebhookReceiver:
+    """aiohttp app receiving webhook deliveries.
+
+    Deliveries with a bad or missing signature get a 401, bodies that don't decode a 400.
+    Validation requests are answered by echoing their `validation_code`. Redelivered events
+        (same `event_id`) are acknowledged but not handled again.
+    """
+
+    def __init__(
+        self,
+        secret: str | Mapping[int, str],
+        client: "Toggl | None" = None,
+        path: str = "/toggl/webhook",
+        dedupe_size: int = WEBHOOK_DEDUPE_SIZE,
+    ) -> None:
+        """
+        Args:
+            secret (str | Mapping[int, str]): Subscription secret, or secrets keyed by subscription ID.
+            client (Toggl | None, optional): Client whose caches events are applied to. Defaults to None.
+            path (str, optional): Path deliveries are POSTed to. Defaults to "/toggl/webhook".
+            dedupe_size (int, optional): Event IDs remembered to drop redeliveries.
+        """
+        self._secrets = secret
+        self.client = client
+        self.path = path
+        self._dedupe_size = dedupe_size
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._subscribers: list[asyncio.Queue] = []
+        self._app: web.Application | None = None
+        self._runner: web.AppRunner | None = None
+        self._url: str | None = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *excinfo):
+        await self.close()
+
+    @property
+    def app(self) -> web.Application:
+        """The aiohttp app, e.g. to mount into an existing one with `add_subapp()`."""
+        if self._app is None:
+            self._app = web.Application()
+            self._app.router.add_post(self.path, self.handle)
+        return self._app
+
+    @property
+    def url(self) -> str:
+        """Callback URL of the running receiver."""
+        if self._url is None:
+            raise RuntimeError("The receiver is not running.")
+        return self._url
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Serves the app on its own. Port 0 picks a free one, see `url`."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self._url = f"http://{host}:{port}{self.path}"
+        log.debug("webhook receiver listening", extra={"url": self._url})
+
+    async def close(self) -> None:
+        """Stops serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self._url = None
+
+    def events(self) -> AsyncIterator[WebhookEvent]:
+        """Every event (not pings) received from now on, as an async iterator.
+
+        Events are collected from the moment this is called; `aclose()` the iterator to stop.
+        """
+        queue: asyncio.Queue[WebhookEvent] = asyncio.Queue()
+        self._subscribers.append(queue)
+        return self._iterate(queue)
+
+    async def _iterate(self, queue: asyncio.Queue) -> AsyncIterator[WebhookEvent]:
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
+
+    def _secret(self, subscription_id: Any) -> str | None:
+        if isinstance(self._secrets, str):
+            return self._secrets
+        try:
+            return self._secrets.get(int(subscription_id))
+        except (TypeError, ValueError):
+            return None
+
+    def _remember(self, event_id: int) -> None:
+        self._seen[event_id] = None
+        while len(self._seen) > self._dedupe_size:
+            self._seen.popitem(last=False)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Handles one delivery."""
+        body = await request.read()
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return web.Response(status=400, text="Invalid JSON")
+        if not isinstance(data, dict):
+            return web.Response(status=400, text="Invalid event")
+        secret = self._secret(data.get("subscription_id"))
+        if secret is None or not verify_signature(
+            secret, body, request.headers.get(WEBHOOK_SIGNATURE_HEADER)
+        ):
+            log.warning("dropping webhook delivery with a bad signature")
+            return web.Response(status=401, text="Invalid signature")
+
+        if data.get("validation_code"):
+            return web.json_response({"validation_code": data["validation_code"]})
+        try:
+            event = WebhookEvent.model_validate(data)
+        except ValidationError:
+            return web.Response(status=400, text="Invalid event")
+        if event.is_ping:
+            return web.Response(status=200)
+        if self.client is not None and event.model == "time_entry":
+            # Tells the client's own Time Entries from other users'; cached after the first event
+            await self.client.account
+        if event.event_id in self._seen:
+            return web.Response(status=200)
+
+        if self.client is not None:
+            try:
+                self.client.apply_webhook_event(event)
+            except ValidationError as exc:
+                # Still acknowledged; Toggl would only send the same payload again
+                log.warning("could not decode webhook payload", exc_info=exc)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+        # Only now: an event that failed before this point is handled again when Toggl redelivers it
+        self._remember(event.event_id)
+        return web.Response(status=200)
+
+
+async def deliver(
+    url: str, secret: str, event: Mapping[str, Any], session: aiohttp.ClientSession
+) -> aiohttp.ClientResponse:
+    """POSTs a signed `event` to `url` like Toggl would. Handy against a local receiver."""
+    body, headers = signed_request(secret, event)
+    async with session.post(url, data=body, headers=headers) as resp:
+        await resp.read()
+        return resp
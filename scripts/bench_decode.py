@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compare the Time Entry decode paths, starting from the raw response body.
+No API key needed; decodes a synthetic payload shaped like /me/time_entries.
+
+    python scripts/bench_decode.py --entries 5000 --repeat 5
+"""
+
+import argparse
+import json
+import timeit
+from datetime import UTC, datetime, timedelta
+
+from lib_toggl.codec import default_codec
+from lib_toggl.decode import DecodeMode, decode_time_entries, decode_time_entries_json
+
+
+def make_payload(count: int) -> bytes:
+    """Builds a response body holding `count` Time Entries."""
+    start = datetime(2024, 1, 1, 9, tzinfo=UTC)
+    entries = []
+    for i in range(count):
+        began = start + timedelta(hours=i)
+        entries.append(
+            {
+                "id": 100_000 + i,
+                "workspace_id": 1,
+                "project_id": 2,
+                "task_id": None,
+                "billable": bool(i % 2),
+                "start": began.isoformat(),
+                "stop": (began + timedelta(minutes=45)).isoformat(),
+                "duration": 45 * 60,
+                "description": f"Entry {i}",
+                "tags": ["alpha", "beta"],
+                "tag_ids": [1, 2],
+                "duronly": True,
+                "at": (began + timedelta(minutes=46)).isoformat(),
+                "server_deleted_at": None,
+                "user_id": 3,
+                "uid": 3,
+                "wid": 1,
+                "pid": 2,
+                "tid": None,
+                "permissions": None,
+            }
+        )
+    return json.dumps(entries).encode()
+
+
+def main():
+    """Does the needful"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = make_payload(args.entries)
+    codec = default_codec()
+    paths = {
+        # What the client did before reading bytes: resp.json() then TimeEntry(**x)
+        "json + validate": lambda: decode_time_entries(json.loads(raw)),
+        "bytes validate": lambda: decode_time_entries_json(raw),
+        f"bytes trusted ({codec.name})": lambda: decode_time_entries_json(
+            raw, DecodeMode.TRUSTED, codec
+        ),
+    }
+    expected = decode_time_entries(json.loads(raw))
+    assert all(decode() == expected for decode in paths.values())
+
+    baseline = None
+    for name, decode in paths.items():
+        best = min(timeit.repeat(decode, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(
+            f"{name:>24}: {best * 1000:8.2f} ms "
+            f"({best / args.entries * 1e6:6.2f} us/entry, {baseline / best:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
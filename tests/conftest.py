@@ -0,0 +1,60 @@
+"""Fixtures shared by the tests"""
+
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import pytest
+import pytest_asyncio
+
+from lib_toggl.client import Toggl
+from lib_toggl.mock_server import MockToggl
+from lib_toggl.ratelimit import LeakyBucket
+
+ClientFactory = Callable[..., Toggl]
+
+
+@pytest.fixture
+def client_options() -> dict[str, Any]:
+    """Extra `Toggl` arguments for every client a test builds. Override it in a module to change them."""
+    return {}
+
+
+@pytest.fixture
+def make_client(client_options: dict[str, Any]) -> ClientFactory:
+    """Builds clients whose rate limiter never gets in the way of a test.
+
+    Call it with a `MockToggl` to point the client at it; other keyword arguments go to `Toggl`
+        and take precedence over `client_options`.
+    """
+
+    def make(server: MockToggl | None = None, **kwargs) -> Toggl:
+        kwargs = {**client_options, **kwargs}
+        kwargs.setdefault("rate_limiter", LeakyBucket(rate=1000, capacity=1000))
+        if server is not None:
+            kwargs.setdefault("base_url", server.base_url)
+        return Toggl(kwargs.pop("api_key", "fake_api_key"), **kwargs)
+
+    return make
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def mock_server() -> AsyncIterator[MockToggl]:
+    """A running `MockToggl` with the default config."""
+    async with MockToggl() as server:
+        yield server
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def client(make_client: ClientFactory) -> AsyncIterator[Toggl]:
+    """A client talking to the real API URLs, for tests that mock them with aioresponses."""
+    async with make_client() as toggl:
+        yield toggl
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def mock_client(
+    make_client: ClientFactory, mock_server: MockToggl
+) -> AsyncIterator[Toggl]:
+    """A client talking to `mock_server`."""
+    async with make_client(mock_server) as toggl:
+        yield toggl
@@ -0,0 +1,98 @@
+"""Tests for duration aggregation"""
+
+# pylint: disable=missing-function-docstring
+
+from datetime import UTC, date, datetime, timedelta, timezone
+
+import pytest
+
+from lib_toggl.aggregate import Rounding, effective_durations, summarize
+from lib_toggl.frame import TimeEntryFrame
+from lib_toggl.time_entries import TimeEntry
+from lib_toggl.workspace import Workspace
+
+# A Wednesday
+T0 = datetime(2024, 1, 3, 9, tzinfo=UTC)
+
+
+def _te(te_id: int, start: datetime, minutes: int, **kwargs) -> TimeEntry:
+    return TimeEntry(
+        id=te_id,
+        workspace_id=1,
+        start=start,
+        stop=start + timedelta(minutes=minutes),
+        duration=minutes * 60,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    ("direction", "expected"), [(-1, 15 * 60), (0, 15 * 60), (1, 30 * 60)]
+)
+def test_rounding(direction: int, expected: int):
+    assert Rounding(minutes=15, direction=direction).apply(22 * 60) == expected
+    assert Rounding().apply(22 * 60) == 22 * 60
+
+
+def test_rounding_from_workspace():
+    ws = Workspace.model_construct(rounding=1, rounding_minutes=6)
+    assert Rounding.from_workspace(ws) == Rounding(minutes=6, direction=1)
+    assert Rounding.from_workspace(Workspace.model_construct()) == Rounding()
+
+
+def test_running_entries_count_up_to_now():
+    running = TimeEntry(id=1, workspace_id=1, start=T0, duration=-1)
+    frame = TimeEntryFrame.from_entries([running])
+    now = int((T0 + timedelta(minutes=10)).timestamp())
+    assert list(effective_durations(frame, now=now)) == [600]
+
+
+def test_summarize_groups():
+    entries = [
+        _te(1, T0, 60, project_id=5, billable=True, tags=["dev"]),
+        _te(2, T0 + timedelta(hours=2), 30, tags=["dev", "meeting"]),
+        _te(3, T0 + timedelta(days=1), 45, project_id=5),
+        _te(4, T0, 15, server_deleted_at=T0),
+    ]
+    summary = summarize(entries)
+    assert summary.entries == 3
+    assert summary.total == (60 + 30 + 45) * 60
+    assert summary.billable == 60 * 60
+    assert summary.by_project == {5: 105 * 60, None: 30 * 60}
+    assert summary.by_tag == {"dev": 90 * 60, "meeting": 30 * 60, None: 45 * 60}
+    assert summary.by_day == {date(2024, 1, 3): 90 * 60, date(2024, 1, 4): 45 * 60}
+    assert summary.by_week == {date(2024, 1, 1): 135 * 60}
+    # Weeks starting on Sunday
+    assert summarize(entries, beginning_of_week=0).by_week == {
+        date(2023, 12, 31): 135 * 60
+    }
+
+
+def test_summarize_splits_across_midnight():
+    late = datetime(2024, 1, 3, 23, 30, tzinfo=UTC)
+    summary = summarize([_te(1, late, 60)])
+    assert summary.by_day == {date(2024, 1, 3): 30 * 60, date(2024, 1, 4): 30 * 60}
+
+    # Midnight is somewhere else for somebody in UTC-05:00
+    summary = summarize([_te(1, late, 60)], tz=timezone(timedelta(hours=-5)))
+    assert summary.by_day == {date(2024, 1, 3): 60 * 60}
+
+
+def test_summarize_splits_across_midnight_with_dst_zone():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        tz = zoneinfo.ZoneInfo("Europe/Amsterdam")
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip("no tz database")
+    # 23:30 local
+    start = datetime(2024, 7, 1, 21, 30, tzinfo=UTC)
+    summary = summarize([_te(1, start, 60)], tz=tz)
+    assert summary.by_day == {date(2024, 7, 1): 30 * 60, date(2024, 7, 2): 30 * 60}
+
+
+def test_rounded_split_adds_up():
+    late = datetime(2024, 1, 3, 23, 50, tzinfo=UTC)
+    summary = summarize([_te(1, late, 20)], rounding=Rounding(minutes=60, direction=1))
+    assert summary.total == 60 * 60
+    assert sum(summary.by_day.values()) == 60 * 60
+    assert all(seconds >= 0 for seconds in summary.by_day.values())
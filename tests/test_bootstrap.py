@@ -0,0 +1,73 @@
+"""Tests for warming every cache from /me?with_related_data=true"""
+
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from lib_toggl.bootstrap import parse_related_data
+from lib_toggl.client import Toggl
+from lib_toggl.decode import DecodeMode
+from lib_toggl.mock_server import MockConfig, MockToggl
+from lib_toggl.time_entries import TimeEntry
+
+
+def _seed(server: MockToggl) -> dict:
+    server.add_workspace(2, "Second")
+    server.add_tag(1, "a")
+    server.add_tag(2, "b")
+    server.add_time_entry(1, duration=60)
+    return server.add_time_entry(2, description="running")
+
+
+async def _assert_warm(server: MockToggl, client: Toggl, running: dict) -> None:
+    seen = server.stats.requests
+    assert (await client.account).id == server.user_id  # pyright: ignore
+    assert sorted(ws.id for ws in await client.workspaces) == [1, 2]  # pyright: ignore
+    assert (await client.current_time_entry).id == running["id"]  # pyright: ignore
+    assert "b" in (await client.tag_index(2)).by_name
+    assert server.stats.requests == seen
+
+
+@pytest.mark.parametrize("related_data", [True, False])
+async def test_bootstrap(related_data, make_client):
+    async with MockToggl(MockConfig(related_data=related_data)) as server:
+        running = _seed(server)
+        async with make_client(server) as client:
+            result = await client.bootstrap()
+            assert result.related_data is related_data
+            assert [t.name for t in result.tags[1]] == ["a"]
+            await _assert_warm(server, client, running)
+        # One request, or /me followed by workspaces, current and tags for both workspaces
+        assert server.stats.requests == (1 if related_data else 5)
+
+
+async def test_bootstrap_without_trying_related_data(mock_server, mock_client):
+    running = _seed(mock_server)
+    result = await mock_client.bootstrap(related_data=False)
+    assert not result.related_data
+    await _assert_warm(mock_server, mock_client, running)
+
+
+async def test_related_data_without_time_entries_leaves_current_unknown(
+    mock_server, mock_client
+):
+    running = _seed(mock_server)
+    body = {**mock_server.account, "workspaces": list(mock_server.workspaces.values())}
+    result = parse_related_data(body)
+    assert result is not None and not result.has_time_entries
+
+    mock_client._apply_bootstrap(result)  # pylint: disable=protected-access
+    seen = mock_server.stats.requests
+    # Fetched rather than taken to mean nothing runs
+    assert (await mock_client.current_time_entry).id == running["id"]  # pyright: ignore
+    assert mock_server.stats.requests == seen + 1
+
+
+@pytest.mark.parametrize("mode", list(DecodeMode))
+def test_related_data_decodes_time_entries_in_the_client_mode(mode):
+    server = MockToggl()
+    running = server.render_time_entry(server.add_time_entry(1))
+    body = {**server.account, "workspaces": [], "time_entries": [running]}
+    result = parse_related_data(body, mode)
+    assert result is not None and result.has_time_entries
+    assert result.current_time_entry == TimeEntry.model_validate(running)
@@ -0,0 +1,95 @@
+"""Tests for bulk Time Entry edits"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+import re
+
+import pytest
+from aioresponses import CallbackResult, aioresponses
+
+from lib_toggl.const import BASE
+from lib_toggl.ratelimit import RetryPolicy
+from lib_toggl.time_entries import BULK_EDIT_ENDPOINT, PatchOperation, TimeEntry
+
+BULK = re.compile(rf"^{re.escape(BASE)}/workspaces/(\d+)/time_entries/([\d,]+)$")
+
+
+@pytest.fixture
+def client_options():
+    return {"retry_policy": RetryPolicy(max_retries=0)}
+
+
+def test_bulk_edit_endpoint():
+    assert BULK_EDIT_ENDPOINT(1, [2, 3]) == f"{BASE}/workspaces/1/time_entries/2,3"
+
+
+async def test_bulk_edit_groups_and_chunks(client):
+    calls = []
+
+    def respond(url, **kwargs):
+        ids = [int(x) for x in str(url).rsplit("/", 1)[1].split(",")]
+        ops = json.loads(kwargs["data"])
+        calls.append((ids, ops))
+        # Pretend the server refuses entry 7
+        return CallbackResult(
+            payload={
+                "success": [x for x in ids if x != 7],
+                "failure": [{"id": 7, "message": "nope"}] if 7 in ids else [],
+            }
+        )
+
+    retagged = [
+        TimeEntry(id=i, workspace_id=1, tags=["renamed"]) for i in range(1, 151)
+    ]
+    other = [TimeEntry(id=1000, workspace_id=1, tags=["other"])]
+
+    with aioresponses() as m:
+        m.patch(BULK, callback=respond, repeat=True)
+        result = await client.bulk_edit_time_entries(retagged + other, {"tags"})
+
+    # 150 identical edits -> 100 + 50, plus one request for the odd one out
+    assert sorted(len(ids) for ids, _ in calls) == [1, 50, 100]
+    for ids, ops in calls:
+        tag = "other" if ids == [1000] else "renamed"
+        assert ops == [{"op": "replace", "path": "/tags", "value": [tag]}]
+    assert len(result.success) == 150
+    assert [(x.id, x.message) for x in result.failure] == [(7, "nope")]
+
+
+async def test_bulk_edit_failed_request_marks_every_entry(client):
+    with aioresponses() as m:
+        m.patch(BULK, status=400)
+        result = await client.patch_time_entries(
+            1, [1, 2], [PatchOperation(op="replace", path="/billable", value=True)]
+        )
+    assert not result.success
+    assert [x.id for x in result.failure] == [1, 2]
+
+
+async def test_bulk_edit_timed_out_chunk_keeps_the_other_results(client):
+    ids = list(range(1, 151))
+
+    def respond(url, **_kwargs):
+        chunk = [int(x) for x in str(url).rsplit("/", 1)[1].split(",")]
+        if 1 in chunk:
+            raise TimeoutError()
+        return CallbackResult(payload={"success": chunk, "failure": []})
+
+    with aioresponses() as m:
+        m.patch(BULK, callback=respond, repeat=True)
+        result = await client.patch_time_entries(
+            1, ids, [PatchOperation(op="replace", path="/billable", value=True)]
+        )
+    assert sorted(result.success) == ids[100:]
+    assert sorted(x.id for x in result.failure) == ids[:100]
+    assert {x.message for x in result.failure} == {"TimeoutError"}
+
+
+async def test_bulk_edit_malformed_response_marks_every_entry(client):
+    with aioresponses() as m:
+        m.patch(BULK, payload={"success": "garbled"})
+        result = await client.patch_time_entries(
+            1, [1, 2], [PatchOperation(op="replace", path="/billable", value=True)]
+        )
+    assert [x.id for x in result.failure] == [1, 2]
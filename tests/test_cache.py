@@ -0,0 +1,156 @@
+"""Tests for the in-memory caches and the client's tag index"""
+
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import ClientResponseError
+from aioresponses import aioresponses
+
+from lib_toggl.cache import Freshness, RefreshingValue, TagIndex, TTLCache
+from lib_toggl.ratelimit import RetryPolicy
+from lib_toggl.tags import TAGS_ENDPOINT, Tag
+from lib_toggl.time_entries import CREATE_ENDPOINT, STOP_ENDPOINT, TimeEntry
+from lib_toggl.time_entries import ENDPOINT as TIME_ENTRIES_ENDPOINT
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires(monkeypatch):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", None)
+    assert "a" in cache
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert "a" not in cache
+    assert len(cache) == 0
+
+
+def test_tag_index_handles_rename_and_remove():
+    index = TagIndex(1, [Tag(id=1, name="old", workspace_id=1)])
+    index.add(Tag(id=1, name="new", workspace_id=1))
+    assert index.by_name == {"new": 1}
+    assert index.by_id == {1: "new"}
+    index.remove(1)
+    assert len(index) == 0
+
+
+@pytest.fixture
+def client_options():
+    return {"retry_policy": RetryPolicy(max_retries=0)}
+
+
+async def test_tag_index_is_fetched_once_and_updated_by_create(client):
+    with aioresponses() as m:
+        m.get(TAGS_ENDPOINT(1), payload=[{"id": 10, "name": "a", "workspace_id": 1}])
+        m.post(TAGS_ENDPOINT(1), payload={"id": 11, "name": "b", "workspace_id": 1})
+        assert (await client.tag_index(1)).by_name == {"a": 10}
+        await client.create_tag(1, "b")
+        # Served from memory; a second GET would not match any mocked response
+        assert (await client.tag_index(1)).by_name == {"a": 10, "b": 11}
+
+
+async def test_null_tag_listing_is_an_empty_index(client):
+    with aioresponses() as m:
+        m.get(TAGS_ENDPOINT(1), body="null", content_type="application/json")
+        index = await client.tag_index(1)
+        assert len(index) == 0
+        # Cached like any other listing
+        assert await client.tag_index(1) is index
+
+
+async def test_tag_conflict_invalidates_index(client):
+    with aioresponses() as m:
+        m.get(TAGS_ENDPOINT(1), payload=[])
+        m.post(TAGS_ENDPOINT(1), status=409)
+        await client.tag_index(1)
+        with pytest.raises(ClientResponseError):
+            await client.create_tag(1, "b")
+        m.get(TAGS_ENDPOINT(1), payload=[{"id": 11, "name": "b", "workspace_id": 1}])
+        assert (await client.tag_index(1)).by_name == {"b": 11}
+
+
+class _Counter:
+    """Fetch function that returns how many times it was called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.calls
+
+
+async def test_refreshing_value_serves_fresh_value_from_memory():
+    fetch = _Counter()
+    value = RefreshingValue(fetch, Freshness(ttl=60))
+    assert await value.get() == 1
+    assert await value.get() == 1
+    assert fetch.calls == 1
+
+
+async def test_refreshing_value_serves_stale_while_revalidating():
+    fetch = _Counter()
+    value = RefreshingValue(fetch, Freshness(ttl=10, stale=10))
+    await value.get()
+    # Age the value past its TTL but not past the stale window
+    # pylint: disable-next=protected-access
+    value._fetched_at -= 15
+    # Stale value comes straight back, refresh happens behind the scenes
+    assert await value.get() == 1
+    await asyncio.sleep(0.01)
+    assert fetch.calls == 2
+    assert value.peek() == 2
+
+
+async def test_refreshing_value_caches_none():
+    async def fetch():
+        return None
+
+    value = RefreshingValue(fetch, Freshness(ttl=60))
+    assert await value.get() is None
+    assert value.age is not None
+
+
+async def test_local_write_wins_over_in_flight_fetch():
+    fetch = _Counter()
+    value = RefreshingValue(fetch, Freshness(ttl=60))
+    pending = asyncio.ensure_future(value.refresh())
+    await asyncio.sleep(0)
+    value.set("written")
+    assert await pending == "written"
+    assert value.peek() == "written"
+
+
+async def test_stop_clears_cached_current_time_entry(client):
+    running = {"id": 5, "workspace_id": 1, "duration": -1, "stop": None}
+    stopped = {**running, "duration": 60, "stop": "2024-01-01T00:01:00Z"}
+    with aioresponses() as m:
+        m.get(f"{TIME_ENTRIES_ENDPOINT}/current", payload=running)
+        m.patch(STOP_ENDPOINT(1, 5), payload=stopped)
+        current = await client.current_time_entry
+        assert current is not None
+        await client.stop_time_entry(current)
+        # No GET mocked; this has to come from the cache
+        assert await client.current_time_entry is None
+
+
+async def test_create_running_entry_updates_cached_current_time_entry(client):
+    with aioresponses() as m:
+        m.post(CREATE_ENDPOINT(1), payload={"id": 9, "workspace_id": 1, "duration": -1})
+        await client.create_new_time_entry(TimeEntry(workspace_id=1))
+        current = await client.current_time_entry
+        assert current is not None
+        assert current.id == 9
@@ -0,0 +1,66 @@
+"""Tests for the Project, Client and Task indexes"""
+
+# pylint: disable=missing-function-docstring
+
+from lib_toggl import client as client_module
+from lib_toggl.cache import EntryNames
+from lib_toggl.mock_server import MockToggl
+from lib_toggl.time_entries import TimeEntry
+
+
+def _seed(server: MockToggl) -> list[TimeEntry]:
+    server.add_workspace(2, "Second")
+    acme = server.add_client(1, "Acme")
+    website = server.add_project(1, "Website", client_id=acme["id"])
+    design = server.add_task(website["id"], "Design")
+    internal = server.add_project(2, "Internal")
+    server.add_project(1, "Old", active=False)
+    rendered = [
+        server.add_time_entry(1, project_id=website["id"], task_id=design["id"]),
+        server.add_time_entry(2, project_id=internal["id"], duration=60),
+        server.add_time_entry(1, duration=60),
+        server.add_time_entry(1, project_id=999_999, duration=60),
+    ]
+    return [TimeEntry.model_validate(server.render_time_entry(x)) for x in rendered]
+
+
+async def test_resolve_names_fetches_each_listing_once(mock_server, mock_client):
+    entries = _seed(mock_server)
+    names = await mock_client.resolve_names(entries * 500)
+    assert names[:4] == [
+        EntryNames("Website", "Acme", "Design"),
+        EntryNames("Internal", None, None),
+        EntryNames(None, None, None),
+        EntryNames(None, None, None),
+    ]
+    # projects, clients and tasks for each of the two workspaces
+    assert mock_server.stats.requests == 6
+    await mock_client.resolve_names(entries)
+    assert mock_server.stats.requests == 6
+
+    mock_client.invalidate_cache()
+    await mock_client.prefetch_catalog([1])
+    assert mock_server.stats.requests == 9
+
+
+async def test_paginated_listings(monkeypatch, mock_server, mock_client):
+    monkeypatch.setattr(client_module, "LISTING_PAGE_SIZE", 2)
+    project = mock_server.add_project(1, "P")
+    for i in range(4):
+        mock_server.add_project(1, f"P{i}")
+        mock_server.add_task(project["id"], f"T{i}")
+    assert len(await mock_client.get_projects(1)) == 5
+    assert len(await mock_client.get_tasks(1)) == 4
+    # 3 pages of projects, then 2 full pages and an empty one of tasks
+    assert mock_server.stats.requests == 6
+    index = await mock_client.project_index(1)
+    assert index.name(index.by_name["P3"]) == "P3"
+    assert mock_server.stats.requests == 6
+
+
+async def test_bootstrap_fills_the_catalog(mock_server, mock_client):
+    entries = _seed(mock_server)
+    await mock_client.bootstrap()
+    names = await mock_client.resolve_names(entries)
+    assert names[0] == EntryNames("Website", "Acme", "Design")
+    assert mock_server.stats.requests == 1
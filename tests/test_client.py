@@ -1,8 +1,17 @@
 """Basic tests of the client module"""
 
+import asyncio
+import re
+from datetime import UTC, datetime, timedelta
+from urllib.parse import unquote
+
 import pytest
+from aiohttp import ClientResponseError
+from aioresponses import CallbackResult, aioresponses
 
 from lib_toggl.client import Toggl
+from lib_toggl.ratelimit import LeakyBucket, RetryPolicy
+from lib_toggl.time_entries import ENDPOINT as TIME_ENTRIES_ENDPOINT
 
 
 @pytest.mark.asyncio
@@ -28,3 +37,147 @@ async def test_client_init_with_api_key():
 # But it will require mocking out some of the API calls.
 # Let's call this a TODO for now.
 ##
+
+
+##
+# The request pipeline is worth testing though; retries and rate limiting are easy to get subtly wrong.
+##
+
+URL = "https://api.track.toggl.com/api/v9/me"
+TIME_ENTRIES = re.compile(rf"^{re.escape(TIME_ENTRIES_ENDPOINT)}(\?.*)?$")
+
+# No waiting around in tests
+FAST_RETRY = RetryPolicy(max_retries=2, backoff_base=0, backoff_max=1)
+
+
+@pytest.fixture
+def client_options():
+    return {"retry_policy": FAST_RETRY}
+
+
+async def test_request_retries_on_429_then_succeeds(client):
+    with aioresponses() as m:
+        m.get(URL, status=429, headers={"Retry-After": "0"})
+        m.get(URL, payload={"id": 1})
+        assert await client.do_get_request(URL) == {"id": 1}
+
+
+async def test_request_gives_up_after_max_retries(client):
+    with aioresponses() as m:
+        for _ in range(3):
+            m.get(URL, status=503)
+        with pytest.raises(ClientResponseError) as exc:
+            await client.do_get_request(URL)
+        assert exc.value.status == 503
+
+
+async def test_request_does_not_retry_client_errors(client):
+    with aioresponses() as m:
+        m.get(URL, status=404)
+        m.get(URL, payload={"id": 1})
+        with pytest.raises(ClientResponseError):
+            await client.do_get_request(URL)
+
+
+async def test_post_is_not_replayed_after_server_error(client):
+    with aioresponses() as m:
+        m.post(URL, status=500)
+        m.post(URL, payload={"id": 1})
+        with pytest.raises(ClientResponseError):
+            await client.do_post_request(URL, data_as_json_str="{}")
+
+
+async def test_post_is_replayed_after_429(client):
+    with aioresponses() as m:
+        m.post(URL, status=429)
+        m.post(URL, payload={"id": 1})
+        assert await client.do_post_request(URL, data_as_json_str="{}") == {"id": 1}
+
+
+async def test_retry_after_longer_than_backoff_max_is_raised(client):
+    with aioresponses() as m:
+        m.get(URL, status=429, headers={"Retry-After": "3600"})
+        with pytest.raises(ClientResponseError):
+            await client.do_get_request(URL)
+
+
+async def test_exhausted_quota_pauses_shared_bucket(make_client):
+    bucket = LeakyBucket(rate=1000, capacity=1000)
+    async with make_client(rate_limiter=bucket) as client:
+        with aioresponses() as m:
+            m.get(
+                URL,
+                payload={"id": 1},
+                headers={
+                    "X-Toggl-Quota-Remaining": "0",
+                    "X-Toggl-Quota-Resets-In": "60",
+                },
+            )
+            await client.do_get_request(URL)
+    assert bucket.reserve() == pytest.approx(60, abs=1)
+
+
+async def test_iter_time_entries_windows_and_dedupes(client):
+    day = timedelta(days=1)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    end = start + 3 * day
+    requested = []
+
+    def respond(url, **_kwargs):
+        # Some yarl versions hand the query back still percent-encoded
+        window_start = datetime.fromisoformat(unquote(url.query["start_date"]))
+        requested.append(window_start)
+        index = (window_start - start).days
+        # Entry 100 straddles the first boundary so both of the first two windows return it
+        entries = [{"id": index + 1, "workspace_id": 1}]
+        if index in (0, 1):
+            entries.append({"id": 100, "workspace_id": 1})
+        return CallbackResult(payload=entries)
+
+    with aioresponses() as m:
+        m.get(TIME_ENTRIES, callback=respond, repeat=True)
+        ids = [te.id async for te in client.iter_time_entries(start, end, window=day)]
+
+    assert ids == [1, 100, 2, 3]
+    assert requested == [start, start + day, start + 2 * day]
+
+
+async def test_iter_time_entries_rejects_backwards_range(client):
+    now = datetime.now(UTC)
+    with pytest.raises(ValueError):
+        async for _ in client.iter_time_entries(now, now - timedelta(days=1)):
+            pass
+
+
+async def test_concurrent_identical_gets_share_one_request(client):
+    with aioresponses() as m:
+        # Only one response is mocked; a second request would raise a ClientConnectionError
+        m.get(URL, payload={"id": 1})
+        results = await asyncio.gather(*(client.do_get_request(URL) for _ in range(5)))
+        assert results == [{"id": 1}] * 5
+        assert sum(len(x) for x in m.requests.values()) == 1
+
+        # Once finished, the next call goes to the server again
+        m.get(URL, payload={"id": 2})
+        assert await client.do_get_request(URL) == {"id": 2}
+
+
+async def test_different_params_are_not_coalesced(client):
+    with aioresponses() as m:
+        m.get(f"{URL}?a=1", payload={"a": 1})
+        m.get(f"{URL}?a=2", payload={"a": 2})
+        results = await asyncio.gather(
+            client.do_get_request(URL, data={"a": 1}),
+            client.do_get_request(URL, data={"a": 2}),
+        )
+        assert results == [{"a": 1}, {"a": 2}]
+
+
+async def test_cancelled_caller_does_not_cancel_shared_request(client):
+    with aioresponses() as m:
+        m.get(URL, payload={"id": 1})
+        first = asyncio.ensure_future(client.do_get_request(URL))
+        second = asyncio.ensure_future(client.do_get_request(URL))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == {"id": 1}
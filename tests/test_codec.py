@@ -0,0 +1,39 @@
+"""Tests for the pluggable JSON codecs and raw-bytes decoding"""
+
+# pylint: disable=missing-function-docstring
+
+import contextlib
+import json
+
+import pytest
+
+from lib_toggl.codec import JsonCodec, OrjsonCodec, default_codec, dump_model
+from lib_toggl.time_entries import TimeEntry
+
+
+def _codecs() -> list[JsonCodec]:
+    codecs = [JsonCodec()]
+    with contextlib.suppress(RuntimeError):  # orjson is optional
+        codecs.append(OrjsonCodec())
+    return codecs
+
+
+@pytest.mark.parametrize("codec", _codecs(), ids=lambda c: c.name)
+def test_codec_round_trip(codec: JsonCodec):
+    obj = {"a": [1, 2.5, None, True], "b": "ü"}
+    encoded = codec.dumps(obj)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == obj
+    assert codec.loads(encoded) == obj
+    assert codec.loads(b"") is None
+
+
+def test_default_codec_prefers_installed_backend():
+    assert isinstance(default_codec(), JsonCodec)
+
+
+def test_dump_model_matches_model_dump_json():
+    te = TimeEntry(workspace_id=1, description="x", tags=["a"])
+    assert dump_model(te, exclude_none=True).decode() == te.model_dump_json(
+        exclude_none=True
+    )
@@ -0,0 +1,110 @@
+"""Tests for the trusted Time Entry decode path"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+from aioresponses import aioresponses
+
+from lib_toggl.decode import (
+    DecodeMode,
+    decode_time_entries,
+    decode_time_entries_json,
+    decode_time_entry,
+    decode_time_entry_json,
+)
+from lib_toggl.time_entries import CREATE_ENDPOINT, ENDPOINT, TimeEntry
+
+# Shaped like a real /me/time_entries item, legacy fields and all
+PAYLOAD = {
+    "id": 3001,
+    "workspace_id": 10,
+    "project_id": 20,
+    "task_id": 30,
+    "billable": True,
+    "start": "2024-03-01T09:00:00+00:00",
+    "stop": "2024-03-01T10:30:00Z",
+    "duration": 5400,
+    "description": "Design review",
+    "tags": ["meeting", "design"],
+    "tag_ids": [1, 2],
+    "duronly": True,
+    "at": "2024-03-01T10:30:05+00:00",
+    "server_deleted_at": None,
+    "user_id": 40,
+    "uid": 40,
+    "wid": 10,
+    "pid": 20,
+    "tid": 30,
+    "permissions": None,
+    "client_name": "Acme",
+}
+
+
+def test_trusted_matches_validated():
+    validated = decode_time_entry(PAYLOAD)
+    trusted = decode_time_entry(PAYLOAD, DecodeMode.TRUSTED)
+    assert trusted == validated
+    assert trusted.model_fields_set == validated.model_fields_set
+    assert trusted.start == datetime(2024, 3, 1, 9, tzinfo=UTC)
+    assert trusted.task_id == 30
+    assert trusted.model_dump_json(exclude_none=True) == validated.model_dump_json(
+        exclude_none=True
+    )
+
+
+def test_trusted_running_entry_matches_validated():
+    running = {"id": 1, "workspace_id": 10, "duration": -1, "stop": None}
+    assert decode_time_entry(running, DecodeMode.TRUSTED) == decode_time_entry(running)
+
+
+def test_decode_time_entries_handles_none():
+    assert decode_time_entries(None, DecodeMode.TRUSTED) == []
+
+
+async def test_client_uses_configured_decode_mode(make_client):
+    start = datetime(2024, 3, 1, tzinfo=UTC)
+    async with make_client(decode_mode=DecodeMode.TRUSTED) as client:
+        with aioresponses() as m:
+            m.get(
+                f"{ENDPOINT}?end_date=2024-03-02T00:00:00Z&start_date=2024-03-01T00:00:00Z",
+                payload=[PAYLOAD],
+            )
+            entries = await client.get_time_entries(
+                start, datetime(2024, 3, 2, tzinfo=UTC)
+            )
+    assert entries == decode_time_entries([PAYLOAD])
+
+
+def test_trusted_ignores_task_id_without_alias():
+    payload = {"id": 1, "workspace_id": 10, "task_id": 30}
+    validated = decode_time_entry(payload)
+    trusted = decode_time_entry(payload, DecodeMode.TRUSTED)
+    assert trusted == validated
+    assert trusted.model_fields_set == validated.model_fields_set
+
+
+@pytest.mark.parametrize("mode", list(DecodeMode))
+def test_decode_json_matches_dict_path(mode: DecodeMode):
+    raw = json.dumps([PAYLOAD, PAYLOAD]).encode()
+    assert decode_time_entries_json(raw, mode) == decode_time_entries([PAYLOAD] * 2)
+    assert decode_time_entries_json(b"null", mode) == []
+    assert decode_time_entry_json(b"null", mode) is None
+    assert (
+        decode_time_entry_json(json.dumps(PAYLOAD).encode(), mode)
+        == (decode_time_entries([PAYLOAD])[0])
+    )
+
+
+async def test_create_sends_bytes_and_decodes_bytes(client):
+    with aioresponses() as m:
+        m.post(CREATE_ENDPOINT(10), payload=PAYLOAD)
+        created = await client.create_new_time_entry(
+            TimeEntry(workspace_id=10, description="Design review")
+        )
+        ((_, call),) = [(k, v[0]) for k, v in m.requests.items()]
+    assert isinstance(call.kwargs["data"], bytes)
+    assert json.loads(call.kwargs["data"])["description"] == "Design review"
+    assert created == decode_time_entries([PAYLOAD])[0]
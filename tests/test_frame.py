@@ -0,0 +1,107 @@
+"""Tests for the columnar TimeEntryFrame"""
+
+# pylint: disable=missing-function-docstring
+
+import re
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from aioresponses import aioresponses
+
+from lib_toggl.frame import NULL, TimeEntryFrame
+from lib_toggl.time_entries import ENDPOINT, TimeEntry
+
+T0 = datetime(2024, 1, 1, 9, tzinfo=UTC)
+
+
+def _entries(count: int = 6) -> list[TimeEntry]:
+    entries = []
+    for i in range(count):
+        start = T0 + timedelta(hours=i)
+        entries.append(
+            TimeEntry(
+                id=i + 1,
+                workspace_id=1 + i % 2,
+                project_id=None if i % 3 == 0 else 10,
+                user_id=7,
+                billable=i % 2 == 0,
+                start=start,
+                stop=start + timedelta(minutes=30),
+                duration=1800,
+                description="Standup",
+                tags=["meeting"] if i % 2 else ["meeting", "billable"],
+                tag_ids=[1] if i % 2 else [1, 2],
+                at=start + timedelta(minutes=31),
+            )
+        )
+    return entries
+
+
+def test_round_trip():
+    entries = _entries()
+    frame = TimeEntryFrame.from_entries(entries)
+    assert len(frame) == len(entries)
+    assert list(frame) == entries
+    assert frame[-1] == entries[-1]
+
+
+def test_running_entry_and_missing_tags():
+    te = TimeEntry(id=1, workspace_id=1, start=T0, duration=-1)
+    frame = TimeEntryFrame.from_entries([te])
+    assert frame.column("stop")[0] == NULL
+    assert frame[0] == te
+    assert frame.tags(0) is None
+
+
+def test_strings_are_interned():
+    frame = TimeEntryFrame.from_entries(_entries())
+    assert frame.tag_names == ["meeting", "billable"]
+    assert frame[0].description is frame[1].description
+
+
+def test_filter():
+    frame = TimeEntryFrame.from_entries(_entries())
+    assert [te.id for te in frame.filter(workspace_id=1)] == [1, 3, 5]
+    assert [te.id for te in frame.filter(tag="billable", project_id=10)] == [3, 5]
+    assert [te.id for te in frame.filter(start=T0 + timedelta(hours=4))] == [5, 6]
+    assert [te.id for te in frame.filter(end=T0 + timedelta(hours=1))] == [1]
+    assert len(frame.filter(tag="nope")) == 0
+    ids = frame.column("id")
+    assert [te.id for te in frame.filter(lambda i: ids[i] % 2 == 0)] == [2, 4, 6]
+    assert [te.id for te in frame[1:3]] == [2, 3]
+
+
+def test_frame_is_much_smaller_than_models():
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        entries = _entries(2000)
+        models = tracemalloc.get_traced_memory()[0] - before
+        frame = TimeEntryFrame.from_entries(entries)
+        columns = tracemalloc.get_traced_memory()[0] - before - models
+    finally:
+        tracemalloc.stop()
+    assert len(frame) == 2000
+    assert columns * 10 < models
+
+
+def test_to_numpy():
+    pytest.importorskip("numpy")
+    frame = TimeEntryFrame.from_entries(_entries())
+    columns = frame.to_numpy()
+    assert int(columns["duration"].sum()) == 6 * 1800
+
+
+async def test_client_streams_range_into_frame(client):
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    payload = [
+        {"id": 1, "workspace_id": 1, "start": "2024-01-01T09:00:00Z", "tags": ["a"]},
+        {"id": 2, "workspace_id": 1, "start": "2024-01-01T10:00:00Z", "tags": ["a"]},
+    ]
+    pattern = re.compile(rf"^{re.escape(ENDPOINT)}(\?.*)?$")
+    with aioresponses() as m:
+        m.get(pattern, payload=payload)
+        frame = await client.get_time_entry_frame(start, start + timedelta(days=1))
+    assert list(frame.column("id")) == [1, 2]
+    assert frame.tag_names == ["a"]
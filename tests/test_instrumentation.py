@@ -0,0 +1,132 @@
+"""Tests for request timing and operation tracing"""
+
+# pylint: disable=missing-function-docstring
+
+from datetime import UTC, datetime
+
+import pytest
+
+from lib_toggl.instrumentation import (
+    DecodeTiming,
+    Instrumentation,
+    MetricsInstrumentation,
+    OpenTelemetryInstrumentation,
+    OperationTiming,
+    RequestTiming,
+    current_operation,
+)
+from lib_toggl.mock_server import MockToggl, RecordedExchange, save_recording
+from lib_toggl.ratelimit import LeakyBucket, RetryPolicy
+from lib_toggl.time_entries import TimeEntry
+
+
+class Recorder(Instrumentation):
+    """Keeps every event."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.events: list = []
+
+    def on_operation(self, event):
+        self.events.append(event)
+
+    def on_request(self, event):
+        self.events.append(event)
+
+    def on_decode(self, event):
+        self.events.append(event)
+
+    def on_retry(self, event):
+        self.events.append(event)
+
+    def on_rate_limit_wait(self, event):
+        self.events.append(event)
+
+
+async def test_requests_are_attributed_to_the_outermost_operation(
+    mock_server, make_client
+):
+    recorder = Recorder()
+    async with make_client(mock_server, instrumentation=recorder) as client:
+        mock_server.add_tag(1, "a")
+        te = TimeEntry.model_validate(
+            mock_server.render_time_entry(mock_server.add_time_entry(1, duration=60))
+        )
+        await client.update_tags(te, ["a", "new"])
+
+    requests = [e for e in recorder.events if isinstance(e, RequestTiming)]
+    # GET tags, POST the new tag, PUT the entry
+    assert [r.method for r in requests] == ["GET", "POST", "PUT"]
+    assert {r.operation for r in requests} == {"update_tags"}
+    first = requests[0]
+    assert first.status == 200 and first.bytes
+    assert first.connect is not None and not first.reused_connection
+    assert requests[-1].reused_connection
+    assert all(r.ttfb is not None and r.total >= r.ttfb for r in requests)
+    assert "?" not in first.url
+
+    [operation] = [e for e in recorder.events if isinstance(e, OperationTiming)]
+    assert operation.operation == "update_tags" and operation.error is None
+    decodes = [e for e in recorder.events if isinstance(e, DecodeTiming)]
+    assert [d.mode for d in decodes][-1] == "validate"
+    assert current_operation() is None
+
+
+async def test_metrics_count_retries_and_waits(tmp_path, make_client):
+    path = tmp_path / "recording.json"
+    save_recording(
+        path,
+        [
+            RecordedExchange(method="GET", path="/me/time_entries", status=503),
+            RecordedExchange(
+                method="GET", path="/me/time_entries", status=200, body="[]"
+            ),
+        ],
+    )
+    metrics = MetricsInstrumentation()
+    async with (
+        MockToggl(replay=path) as server,
+        make_client(
+            server,
+            instrumentation=metrics,
+            retry_policy=RetryPolicy(backoff_base=0),
+            rate_limiter=LeakyBucket(rate=100, capacity=1),
+        ) as client,
+    ):
+        start = datetime(2024, 1, 1, tzinfo=UTC)
+        await client.sync_time_entries(1)
+        await client.sync_time_entries(2)
+        with pytest.raises(ValueError):
+            await client.get_time_entries(start, None)  # pyright: ignore
+
+    snapshot = metrics.metrics
+    assert snapshot.retries == {"503": 1}
+    assert snapshot.statuses == {503: 1, 200: 2}
+    assert snapshot.requests["sync_time_entries"].count == 3
+    assert snapshot.operations["sync_time_entries"].count == 2
+    assert snapshot.rate_limit_waits.count >= 1
+    assert snapshot.decode["sync_time_entries"].count == 2
+    assert snapshot.phases["ttfb"].count == 3
+    assert snapshot.operation_errors == {"get_time_entries": 1}
+    metrics.reset()
+    assert metrics.metrics.requests == {}
+
+
+async def test_disabled_instrumentation_sees_nothing(mock_server, make_client):
+    class Strict(Instrumentation):
+        def on_request(self, event):
+            raise AssertionError("not enabled")
+
+    async with make_client(mock_server, instrumentation=Strict()) as client:
+        assert await client.get_workspaces()
+
+
+def test_opentelemetry_is_optional():
+    try:
+        import opentelemetry  # noqa: F401  pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        with pytest.raises(RuntimeError):
+            OpenTelemetryInstrumentation()
+    else:
+        assert OpenTelemetryInstrumentation().enabled
@@ -0,0 +1,71 @@
+"""Tests for lazy payload logging"""
+
+# pylint: disable=missing-function-docstring
+
+import logging
+
+import pytest
+
+from lib_toggl import log_payloads
+from lib_toggl.log_payloads import (
+    LazyPayload,
+    configure_payload_logging,
+    debug_payload,
+    payload_logging,
+    payloads_enabled,
+)
+
+
+class Exploding:
+    """Fails the test if it is ever rendered."""
+
+    def __repr__(self):
+        raise AssertionError("payload was rendered")
+
+
+@pytest.fixture(autouse=True)
+def _defaults():
+    saved = payload_logging()
+    yield
+    configure_payload_logging(**saved.model_dump())
+
+
+def test_nothing_is_rendered_above_debug(caplog):
+    logger = logging.getLogger("lib_toggl.test")
+    caplog.set_level(logging.INFO, logger="lib_toggl.test")
+    assert not payloads_enabled(logger)
+    debug_payload(logger, "big", data=Exploding())
+    assert not caplog.records
+
+
+def test_payloads_are_truncated(caplog):
+    logger = logging.getLogger("lib_toggl.test")
+    caplog.set_level(logging.DEBUG, logger="lib_toggl.test")
+    configure_payload_logging(max_chars=32)
+    debug_payload(logger, "big", body=b"x" * 10_000, items=list(range(10_000)))
+    [record] = caplog.records
+    assert repr(record.body) == "x" * 32 + "... (truncated of 10000)"
+    assert len(repr(record.items)) < 64
+
+    configure_payload_logging(enabled=False)
+    debug_payload(logger, "off", data=Exploding())
+    assert len(caplog.records) == 1
+
+
+def test_payloads_are_sampled(caplog, monkeypatch):
+    logger = logging.getLogger("lib_toggl.test")
+    caplog.set_level(logging.DEBUG, logger="lib_toggl.test")
+    draws = iter([0.1, 0.3, 0.7, 0.2, 0.0])
+    monkeypatch.setattr(log_payloads.random, "random", lambda: next(draws))
+    configure_payload_logging(sample_rate=0.25)
+    for i in range(4):
+        debug_payload(logger, f"line {i}", data=i)
+    assert [r.message for r in caplog.records] == ["line 0", "line 3"]
+
+    configure_payload_logging(sample_rate=0)
+    debug_payload(logger, "never", data=Exploding())
+    assert len(caplog.records) == 2
+
+
+def test_untruncated_payload():
+    assert str(LazyPayload({"a": "b" * 5000}, None)) == repr({"a": "b" * 5000})
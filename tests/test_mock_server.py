@@ -0,0 +1,144 @@
+"""Tests for the local mock of the Toggl API"""
+
+# pylint: disable=missing-function-docstring
+
+from datetime import UTC, datetime, timedelta
+
+import aiohttp
+import pytest
+
+from lib_toggl.mock_server import (
+    MockConfig,
+    MockToggl,
+    RecordedExchange,
+    save_recording,
+)
+from lib_toggl.ratelimit import RetryPolicy
+from lib_toggl.time_entries import PatchOperation, TimeEntry
+
+FAST_RETRY = RetryPolicy(max_retries=3, backoff_base=0, backoff_max=1)
+
+
+@pytest.fixture
+def client_options():
+    return {"retry_policy": FAST_RETRY}
+
+
+async def test_client_round_trip(mock_server, mock_client):
+    account = await mock_client.get_account_details()
+    assert account is not None and account.default_workspace_id == 1
+    [workspace] = await mock_client.get_workspaces()
+    assert workspace.id == 1
+
+    start = datetime.now(UTC) - timedelta(minutes=5)
+    created = await mock_client.create_new_time_entry(
+        TimeEntry(workspace_id=1, start=start, description="a", tags=["x"])
+    )
+    assert created is not None and created.tags == ["x"]
+    assert (await mock_client.get_current_time_entry()) == created
+
+    stopped = await mock_client.stop_time_entry(created)
+    assert stopped is not None and stopped.duration >= 300
+    assert await mock_client.get_current_time_entry() is None
+
+    assert [t.name for t in await mock_client.get_tags(1)] == ["x"]
+    entries = await mock_client.get_time_entries(start, datetime.now(UTC))
+    assert [te.id for te in entries] == [created.id]
+
+    result = await mock_client.patch_time_entries(
+        1,
+        [created.id, 999_999],  # pyright: ignore reportArgumentType
+        [PatchOperation(op="replace", path="/description", value="b")],
+    )
+    assert result.success == [created.id]
+    assert [x.id for x in result.failure] == [999_999]
+    fetched = await mock_client.get_time_entry_by_id(created.id)  # pyright: ignore reportArgumentType
+    assert fetched is not None and fetched.description == "b"
+
+
+async def test_seeded_entries_and_since(mock_server, mock_client):
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    mock_server.seed_time_entries(50, start=start)
+    entries = await mock_client.get_time_entries(start, start + timedelta(hours=10))
+    assert len(entries) == 10
+    changes = await mock_client.sync_time_entries(1)
+    assert len(changes.inserted) == 50
+
+
+async def test_rate_limit_is_retried(make_client):
+    config = MockConfig(rate_limit=200, rate_limit_burst=1)
+    async with (
+        MockToggl(config) as server,
+        make_client(
+            server, retry_policy=RetryPolicy(max_retries=20, backoff_base=0)
+        ) as client,
+    ):
+        for _ in range(5):
+            await client.do_get_request(f"{server.base_url}/me")
+        assert server.stats.by_status[200] == 5
+        assert server.stats.by_status.get(429, 0) > 0
+
+
+async def test_quota_and_injected_errors(make_client):
+    async with MockToggl(MockConfig(quota=2)) as server:
+        async with make_client(server) as client:
+            await client.get_workspaces()
+            await client.get_workspaces()
+        # That client now sits out the rest of the window; a fresh bucket gets to see the 402
+        async with make_client(
+            server, retry_policy=RetryPolicy(max_retries=0)
+        ) as client:
+            with pytest.raises(aiohttp.ClientResponseError) as exc:
+                await client.get_workspaces()
+        assert exc.value.status == 402
+
+    async with (
+        MockToggl(MockConfig(error_rate=1.0)) as server,
+        make_client(server, retry_policy=RetryPolicy(max_retries=0)) as client,
+    ):
+        with pytest.raises(aiohttp.ClientResponseError) as exc:
+            await client.get_workspaces()
+        assert exc.value.status == 503
+        assert server.stats.by_route == {"GET /workspaces": 1}
+
+
+async def test_replay(tmp_path, make_client):
+    path = tmp_path / "recording.json"
+    save_recording(
+        path,
+        [
+            RecordedExchange(
+                method="GET", path="/workspaces", status=503, body='"down"'
+            ),
+            RecordedExchange(
+                method="GET",
+                path="/workspaces",
+                status=200,
+                headers={"Content-Type": "application/json"},
+                body='[{"id": 7, "name": "Recorded", "api_token": "redacted"}]',
+            ),
+        ],
+    )
+    async with MockToggl(replay=path) as server, make_client(server) as client:
+        [workspace] = await client.get_workspaces()
+        assert workspace.id == 7
+        # The last recorded response keeps being served
+        [workspace] = await client.get_workspaces()
+        assert workspace.id == 7
+        assert server.stats.by_status == {503: 1, 200: 2}
+
+
+async def test_record_then_replay(tmp_path, make_client):
+    path = tmp_path / "recording.json"
+    async with (
+        MockToggl() as upstream,
+        MockToggl(record=path, upstream=upstream.base_url) as recorder,
+        make_client(recorder) as client,
+    ):
+        [workspace] = await client.get_workspaces()
+    assert "mock-api-token" not in path.read_text()
+
+    async with MockToggl(replay=path) as server, make_client(server) as client:
+        [replayed] = await client.get_workspaces()
+        # api_token is excluded from dumps, which is just as well: it was scrubbed
+        assert replayed.model_dump() == workspace.model_dump()
@@ -0,0 +1,69 @@
+"""Tests for the multi-token fan-out client"""
+
+# pylint: disable=missing-function-docstring
+
+import asyncio
+
+from aioresponses import aioresponses
+
+from lib_toggl.client import Toggl
+from lib_toggl.multi import MultiToggl, TenantResult
+from lib_toggl.ratelimit import RetryPolicy
+from lib_toggl.time_entries import ENDPOINT
+
+CURRENT = f"{ENDPOINT}/current"
+
+
+async def test_fan_out_by_method_name_collects_every_token():
+    async with MultiToggl(
+        ["a", "b", "c"], retry_policy=RetryPolicy(max_retries=0)
+    ) as multi:
+        with aioresponses() as m:
+            m.get(CURRENT, payload={"id": 1, "workspace_id": 2})
+            m.get(CURRENT, payload=None)
+            m.get(CURRENT, status=403)
+            results = await multi.gather("get_current_time_entry")
+
+    assert set(results) == {"a", "b", "c"}
+    failed = [r for r in results.values() if not r.ok]
+    assert len(failed) == 1
+    running = [r.result for r in results.values() if r.ok and r.result is not None]
+    assert [te.id for te in running] == [1]
+
+
+async def test_slow_token_does_not_block_others():
+    async def call(client: Toggl):
+        if client.api_key == "slow":
+            await asyncio.sleep(10)
+        return client.api_key
+
+    async with MultiToggl(["slow", "fast-1", "fast-2"], timeout=0.2) as multi:
+        order = [res async for res in multi.fan_out(call)]
+
+    assert {r.api_key for r in order[:2]} == {"fast-1", "fast-2"}
+    assert order[2].api_key == "slow"
+    assert isinstance(order[2].error, asyncio.TimeoutError)
+
+
+async def test_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def call(_client: Toggl):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    async with MultiToggl([f"t{i}" for i in range(20)], concurrency=3) as multi:
+        results = await multi.gather(call)
+
+    assert len(results) == 20
+    assert peak == 3
+
+
+def test_result_repr_hides_token():
+    res = TenantResult(api_key="secret-token", result=1)
+    assert res.ok
+    assert "secret-token" not in repr(res)
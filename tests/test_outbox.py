@@ -0,0 +1,158 @@
+"""Tests for the offline write queue"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from lib_toggl.outbox import Outbox
+from lib_toggl.ratelimit import RetryPolicy
+from lib_toggl.time_entries import CREATE_ENDPOINT, EDIT_ENDPOINT, TimeEntry
+
+T0 = datetime(2024, 1, 1, 9, tzinfo=UTC)
+NO_RETRY = RetryPolicy(max_retries=0, backoff_base=0, backoff_max=0)
+
+
+@pytest.fixture
+def client_options():
+    return {"retry_policy": NO_RETRY}
+
+
+def _server_te(te_id: int, **kwargs) -> dict:
+    return {
+        "id": te_id,
+        "workspace_id": 1,
+        "start": T0.isoformat(),
+        "duration": -1,
+        **kwargs,
+    }
+
+
+def _bodies(m: aioresponses, method: str) -> list[dict]:
+    return [
+        json.loads(call.kwargs["data"])
+        for (verb, _url), calls in m.requests.items()
+        if verb == method
+        for call in calls
+    ]
+
+
+async def test_create_edit_stop_offline_is_one_post(client):
+    outbox = Outbox(client, retry_policy=NO_RETRY)
+    queued = outbox.enqueue_create(
+        TimeEntry(workspace_id=1, start=T0, duration=-1, description="a")
+    )
+    assert queued.id is not None and queued.id < 0
+    queued = outbox.enqueue_update(queued.model_copy(update={"description": "b"}))
+    outbox.enqueue_stop(queued, at=T0 + timedelta(minutes=30))
+    assert len(outbox) == 1
+
+    with aioresponses() as m:
+        m.post(CREATE_ENDPOINT(1), payload=_server_te(42, duration=1800))
+        await outbox.flush()
+        [body] = _bodies(m, "POST")
+    assert "id" not in body
+    assert body["description"] == "b"
+    assert body["duration"] == 1800
+    assert outbox.resolve(queued.id) == 42  # pyright: ignore reportArgumentType
+    assert len(outbox) == 0
+    await outbox.close()
+
+
+async def test_writes_after_create_follow_the_server_id(client):
+    outbox = Outbox(client, retry_policy=NO_RETRY)
+    queued = outbox.enqueue_create(TimeEntry(workspace_id=1, start=T0, duration=-1))
+    with aioresponses() as m:
+        m.post(CREATE_ENDPOINT(1), payload=_server_te(42))
+        m.put(EDIT_ENDPOINT(1, 42), payload=_server_te(42, duration=60))
+        await outbox.flush()
+        # Queued after the create was sent, against the temporary ID
+        outbox.enqueue_stop(queued, at=T0 + timedelta(minutes=1))
+        await outbox.flush()
+        [body] = _bodies(m, "PUT")
+    assert body["id"] == 42
+    assert body["duration"] == 60
+    await outbox.close()
+
+
+async def test_transient_failure_is_retried(tmp_path, client):
+    path = tmp_path / "outbox.db"
+    outbox = Outbox(client, path, retry_policy=NO_RETRY)
+    outbox.enqueue_update(TimeEntry(id=7, workspace_id=1, start=T0, duration=60))
+    with aioresponses() as m:
+        m.put(EDIT_ENDPOINT(1, 7), exception=aiohttp.ClientConnectionError())
+        m.put(EDIT_ENDPOINT(1, 7), payload=_server_te(7, duration=60))
+        await outbox.flush()
+    assert len(outbox) == 0
+    assert outbox.failed() == []
+    await outbox.close()
+
+
+async def test_queue_survives_restart(tmp_path, client):
+    path = tmp_path / "outbox.db"
+    outbox = Outbox(client, path)
+    outbox.enqueue_update(TimeEntry(id=7, workspace_id=1, start=T0, duration=60))
+    await outbox.close()
+
+    outbox = Outbox(client, path, retry_policy=NO_RETRY)
+    assert len(outbox) == 1
+    with aioresponses() as m:
+        m.put(EDIT_ENDPOINT(1, 7), payload=_server_te(7, duration=60))
+        await outbox.flush()
+    assert len(outbox) == 0
+    await outbox.close()
+
+
+async def test_rejected_write_fails_with_its_dependents(client):
+    outbox = Outbox(client, retry_policy=NO_RETRY)
+    queued = outbox.enqueue_create(TimeEntry(workspace_id=1, start=T0, duration=-1))
+    outbox.enqueue_update(TimeEntry(id=9, workspace_id=1, start=T0, duration=60))
+    with aioresponses() as m:
+        m.post(CREATE_ENDPOINT(1), status=400)
+        m.put(EDIT_ENDPOINT(1, 9), payload=_server_te(9, duration=60))
+        await outbox.flush()
+    # Builds on a create the server refused
+    with pytest.raises(ValueError):
+        outbox.enqueue_stop(queued, at=T0 + timedelta(minutes=1))
+    failed = outbox.failed()
+    assert [f.kind for f in failed] == ["create"]
+    assert "400" in failed[0].error
+    outbox.discard_failed()
+    assert outbox.failed() == []
+    await outbox.close()
+
+
+async def test_create_without_an_id_is_not_dropped(client):
+    outbox = Outbox(client, retry_policy=NO_RETRY)
+    queued = outbox.enqueue_create(TimeEntry(workspace_id=1, start=T0, duration=-1))
+    with aioresponses() as m:
+        m.post(CREATE_ENDPOINT(1), body="null", content_type="application/json")
+        await outbox.flush()
+    assert outbox.resolve(queued.id) is None  # pyright: ignore reportArgumentType
+    [failed] = outbox.failed()
+    assert failed.kind == "create" and "ID" in failed.error
+    await outbox.close()
+
+
+async def test_stop_accepts_naive_datetimes(client):
+    outbox = Outbox(client, retry_policy=NO_RETRY)
+    naive = T0.replace(tzinfo=None)
+    te = TimeEntry(id=7, workspace_id=1, start=naive, duration=-1)
+    assert outbox.enqueue_stop(te, at=naive + timedelta(minutes=5)).duration == 300
+    assert outbox.enqueue_stop(te, at=T0 + timedelta(minutes=6)).duration == 360
+    await outbox.close()
+
+
+async def test_flush_gives_up_after_timeout(client):
+    outbox = Outbox(client)
+    outbox.enqueue_update(TimeEntry(id=7, workspace_id=1, start=T0, duration=60))
+    with aioresponses() as m:
+        m.put(EDIT_ENDPOINT(1, 7), exception=aiohttp.ClientConnectionError())
+        with pytest.raises(TimeoutError):
+            await outbox.flush(timeout=0.2)
+    assert len(outbox) == 1
+    await outbox.close()
@@ -0,0 +1,173 @@
+"""Tests for adaptive polling of the running Time Entry"""
+
+# pylint: disable=missing-function-docstring
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+from lib_toggl.mock_server import MockToggl
+from lib_toggl.poller import CurrentTimeEntryPoller, PollPolicy, differs
+from lib_toggl.pool import ConnectionPool
+from lib_toggl.time_entries import TimeEntry
+
+FAST = PollPolicy(
+    min_interval=0.02, max_interval=0.08, backoff=2, jitter=0, after_write=0.01
+)
+
+
+async def _next(events, timeout: float = 2):
+    return await asyncio.wait_for(anext(events), timeout)
+
+
+async def test_polls_back_off_and_publish_only_changes(mock_server, mock_client):
+    running = mock_server.add_time_entry(1, description="a")
+    async with CurrentTimeEntryPoller(FAST) as poller:
+        events = poller.events()
+        poller.add("me", mock_client)
+        change = await _next(events)
+        assert change.kind == "started" and change.source == "poll"
+        assert change.current.id == running["id"]  # pyright: ignore
+
+        # Nothing changes; the interval grows to the max and no events arrive
+        await asyncio.sleep(0.3)
+        assert poller.interval("me") == FAST.max_interval
+        polls = mock_server.stats.by_route["GET /me/time_entries/current"]
+        assert 3 <= polls < 15
+
+        # Changed behind the mock_client's back; seen by the next poll, interval resets
+        mock_server._stop(running, datetime.now(UTC))  # pylint: disable=protected-access
+        change = await _next(events)
+        assert change.kind == "stopped" and change.source == "poll"
+        assert poller.interval("me") == FAST.min_interval
+        await events.aclose()
+
+
+async def test_local_writes_publish_and_tighten(mock_server, mock_client):
+    policy = FAST.model_copy(update={"max_interval": 10, "min_interval": 5})
+    changes = []
+    async with CurrentTimeEntryPoller(policy, on_change=changes.append) as poller:
+        poller.add("me", mock_client)
+        created = await mock_client.create_new_time_entry(
+            TimeEntry(workspace_id=1, description="b")
+        )
+        assert [c.kind for c in changes] == ["started"]
+        assert changes[0].source == "write"
+        # The follow-up poll comes after_write seconds later, not min_interval
+        await asyncio.sleep(0.2)
+        assert mock_server.stats.by_route.get("GET /me/time_entries/current") == 1
+        # ...and finds the same entry, so publishes nothing
+        assert len(changes) == 1
+
+        await mock_client.stop_time_entry(created)  # pyright: ignore
+        assert [c.kind for c in changes] == ["started", "stopped"]
+
+
+async def test_write_after_cache_invalidation_is_not_a_stop(mock_server, mock_client):
+    running = mock_server.add_time_entry(1, description="a")
+    other = mock_server.add_time_entry(1, duration=60)
+    changes = []
+    policy = FAST.model_copy(update={"max_interval": 10, "min_interval": 5})
+    async with CurrentTimeEntryPoller(policy, on_change=changes.append) as poller:
+        poller.add("me", mock_client)
+        assert await poller.poll("me")
+        mock_client.invalidate_cache()
+
+        # Editing a stopped entry says nothing about the running one
+        edited = TimeEntry.model_validate(mock_server.render_time_entry(other))
+        await mock_client.update_time_entry(
+            edited.model_copy(update={"description": "b"})
+        )
+        assert [c.kind for c in changes] == ["started"]
+
+        await mock_client.stop_time_entry(TimeEntry.model_validate(running))
+        assert [(c.kind, c.source) for c in changes] == [
+            ("started", "poll"),
+            ("stopped", "write"),
+        ]
+
+
+class _ScriptedClient:
+    """Stands in for `Toggl`. Poll `i` returns `results[i]` (the last one from then on), once
+    `gates[i]` is set if there is one."""
+
+    def __init__(self, *results, gates: int = 0) -> None:
+        self.results = results
+        self.gates = [asyncio.Event() for _ in range(gates)]
+        self.listeners: list = []
+        self.polls = 0
+
+    def add_write_listener(self, listener):
+        self.listeners.append(listener)
+        return lambda: None
+
+    async def get_current_time_entry(self):
+        i = self.polls
+        self.polls += 1
+        result = self.results[min(i, len(self.results) - 1)]
+        if i < len(self.gates):
+            await self.gates[i].wait()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def wait_for_poll(self, count: int) -> None:
+        async with asyncio.timeout(2):
+            while self.polls < count:
+                await asyncio.sleep(0.005)
+
+
+async def test_poll_in_flight_during_a_write_is_dropped():
+    running = TimeEntry(id=1, workspace_id=1, duration=-1)
+    client = _ScriptedClient(running, running, None, gates=2)
+    changes = []
+    async with CurrentTimeEntryPoller(FAST, on_change=changes.append) as poller:
+        poller.add("me", client)  # pyright: ignore reportArgumentType
+        await client.wait_for_poll(1)
+        client.gates[0].set()
+        await client.wait_for_poll(2)
+        assert [c.kind for c in changes] == ["started"]
+
+        # Stopped through the client while the second poll still has the old state
+        client.listeners[0](None)
+        client.gates[1].set()
+        await client.wait_for_poll(4)
+        assert [c.kind for c in changes] == ["started", "stopped"]
+
+
+async def test_polling_carries_on_after_unexpected_errors():
+    running = TimeEntry(id=1, workspace_id=1, duration=-1)
+    client = _ScriptedClient(ValueError("unexpected"), running)
+    async with CurrentTimeEntryPoller(FAST) as poller:
+        events = poller.events()
+        poller.add("me", client)  # pyright: ignore reportArgumentType
+        change = await _next(events)
+        assert change.current == running and client.polls == 2
+        await events.aclose()
+
+
+async def test_many_clients_are_spread_out(make_client):
+    async with MockToggl() as server, ConnectionPool() as pool:
+        clients = [make_client(server, pool=pool) for _ in range(20)]
+        await clients[0].get_workspaces()
+        server.stats.reset()
+        policy = PollPolicy(min_interval=0.5, max_interval=1)
+        async with CurrentTimeEntryPoller(policy, seed=1) as poller:
+            for i, client in enumerate(clients):
+                poller.add(str(i), client)
+            assert len(poller) == 20
+            await asyncio.sleep(0.25)
+            # Roughly half have had their first poll
+            assert 3 <= server.stats.requests <= 17
+            poller.remove("0")
+
+
+def test_differs():
+    te = TimeEntry(id=1, workspace_id=1, at=datetime(2024, 1, 1, tzinfo=UTC))
+    assert not differs(None, None)
+    assert differs(te, None)
+    assert not differs(te, te.model_copy(update={"description": "x"}))
+    assert differs(te, te.model_copy(update={"at": datetime.now(UTC)}))
+    with pytest.raises(ValueError):
+        PollPolicy(min_interval=10, max_interval=1)
@@ -0,0 +1,75 @@
+"""Tests for sharing a connection pool between clients"""
+
+# pylint: disable=missing-function-docstring
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from lib_toggl.client import Toggl
+from lib_toggl.pool import ConnectionPool, PoolOptions
+
+
+async def _ok(_request: web.Request) -> web.Response:
+    return web.json_response({"ok": True})
+
+
+async def test_pool_reuses_connections_and_counts_them():
+    app = web.Application()
+    app.router.add_get("/", _ok)
+    async with (
+        TestServer(app) as server,
+        ConnectionPool(PoolOptions(use_aiodns=False)) as pool,
+    ):
+        session = pool.get_session()
+        for _ in range(3):
+            async with session.get(server.make_url("/")) as resp:
+                assert (await resp.json()) == {"ok": True}
+
+        metrics = pool.metrics
+        assert metrics.requests == 3
+        assert metrics.in_flight == 0
+        assert metrics.connections_created == 1
+        assert metrics.connections_reused == 2
+
+
+async def test_clients_share_pool_session():
+    async with ConnectionPool() as pool:
+        a = Toggl("token-a", pool=pool)
+        b = Toggl("token-b", pool=pool)
+        # pylint: disable=protected-access
+        await a._pre_flight_check()
+        await b._pre_flight_check()
+        assert a._session is b._session
+
+        # Closing a client must not tear down the pool everybody else is using
+        await a.close()
+        assert not pool.closed
+
+
+async def test_private_pool_is_recreated_after_close():
+    client = Toggl("token")
+    # pylint: disable=protected-access
+    await client._pre_flight_check()
+    first = client._session
+    await client.close()
+    await client._pre_flight_check()
+    assert client._session is not first
+    assert not client._session.closed
+    await client.close()
+
+
+async def test_closed_injected_session_is_not_replaced():
+    session = aiohttp.ClientSession()
+    client = Toggl("token", session=session)
+    await session.close()
+    with pytest.raises(RuntimeError):
+        # pylint: disable=protected-access
+        await client._pre_flight_check()
+    assert client.pool_metrics is None
+
+
+def test_session_and_pool_are_mutually_exclusive():
+    with pytest.raises(ValueError):
+        Toggl("token", session=object(), pool=ConnectionPool())  # pyright: ignore
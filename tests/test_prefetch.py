@@ -0,0 +1,88 @@
+"""Tests for prefetching paged downloads"""
+
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import gc
+
+import pytest
+
+from lib_toggl.prefetch import prefetched_pages
+
+
+class Pages:
+    """Fetches pages 0..`last`; page `slow` never finishes and page `broken` fails."""
+
+    def __init__(self, last: int, slow: int = -1, broken: int = -1) -> None:
+        self.last = last
+        self.slow = slow
+        self.broken = broken
+        self.started: list[int] = []
+        self.cancelled: list[int] = []
+
+    async def fetch(self, page: int) -> tuple[int, int | None]:
+        self.started.append(page)
+        await asyncio.sleep(0)
+        if page == self.broken:
+            raise RuntimeError(f"page {page}")
+        if page == self.slow:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled.append(page)
+                raise
+        return page, page + 1 if page < self.last else None
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+async def test_every_page_in_order(prefetch):
+    pages = Pages(3)
+    assert [p async for p in prefetched_pages(pages.fetch, 0, prefetch)] == [0, 1, 2, 3]
+
+
+async def test_next_page_is_requested_before_the_current_one_is_consumed():
+    pages = Pages(3)
+    it = prefetched_pages(pages.fetch, 0)
+    assert await anext(it) == 0
+    await asyncio.sleep(0)
+    assert pages.started == [0, 1]
+    await it.aclose()
+
+    pages = Pages(3)
+    it = prefetched_pages(pages.fetch, 0, prefetch=False)
+    assert await anext(it) == 0
+    await asyncio.sleep(0)
+    assert pages.started == [0]
+    await it.aclose()
+
+
+async def test_stopping_early_waits_for_the_page_in_flight():
+    pages = Pages(3, slow=1)
+    it = prefetched_pages(pages.fetch, 0)
+    assert await anext(it) == 0
+    await asyncio.sleep(0.01)
+    await it.aclose()
+    assert pages.cancelled == [1]
+
+
+async def test_failed_prefetch_is_retrieved_when_stopping_early():
+    loop = asyncio.get_running_loop()
+    unhandled: list[dict] = []
+    loop.set_exception_handler(lambda _loop, context: unhandled.append(context))
+    try:
+        pages = Pages(3, broken=1)
+        it = prefetched_pages(pages.fetch, 0)
+        assert await anext(it) == 0
+        await asyncio.sleep(0.01)
+        await it.aclose()
+        del it
+        gc.collect()
+        assert unhandled == []
+    finally:
+        loop.set_exception_handler(None)
+
+    # ...and raised to a caller that keeps going
+    it = prefetched_pages(pages.fetch, 0)
+    with pytest.raises(RuntimeError):
+        async for _ in it:
+            pass
@@ -0,0 +1,61 @@
+"""Tests for the leaky bucket and retry policy helpers"""
+
+# pylint: disable=missing-function-docstring
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from lib_toggl.ratelimit import (
+    LeakyBucket,
+    RetryPolicy,
+    bucket_for_token,
+    parse_retry_after,
+)
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = LeakyBucket(rate=10.0, capacity=3)
+    delays = [bucket.reserve() for _ in range(5)]
+    # First `capacity` requests go straight through
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    # Then one slot every 1/rate seconds
+    assert delays[3] == pytest.approx(0.1, abs=0.01)
+    assert delays[4] == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_pause_delays_next_reservation():
+    bucket = LeakyBucket(rate=100.0, capacity=5)
+    bucket.pause_for(2.0)
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+
+def test_bucket_rejects_bad_limits():
+    with pytest.raises(ValueError):
+        LeakyBucket(rate=0)
+    with pytest.raises(ValueError):
+        LeakyBucket(capacity=0)
+
+
+def test_bucket_is_shared_per_token():
+    a = bucket_for_token("token-a")
+    assert bucket_for_token("token-a") is a
+    assert bucket_for_token("token-b") is not a
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+    for attempt in range(10):
+        assert 0 <= policy.backoff(attempt) <= min(5.0, 2**attempt)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("garbage") is None
+    future = datetime.now(UTC) + timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(future, usegmt=True)) == pytest.approx(
+        30, abs=2
+    )
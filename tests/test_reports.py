@@ -0,0 +1,76 @@
+"""Tests for the Reports API v3 client"""
+
+# pylint: disable=missing-function-docstring
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+
+from lib_toggl.mock_server import MockToggl
+from lib_toggl.reports import ReportFilters, Reports, next_cursor
+
+SEARCH = "POST /reports/api/v3/workspace/{workspace_id}/search/time_entries"
+JANUARY = ReportFilters(start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+
+
+def _seed(server: MockToggl, count: int) -> list[dict]:
+    start = datetime(2024, 1, 1, 9, tzinfo=UTC)
+    return server.seed_time_entries(count, start=start, spacing=timedelta(hours=5))
+
+
+async def test_detailed_follows_the_cursor(mock_server, mock_client):
+    entries = _seed(mock_server, 23)
+    mock_server.add_time_entry(1)  # running, not reported
+    rows = [r async for r in Reports(mock_client).detailed(1, JANUARY, page_size=5)]
+
+    assert [r.id for r in rows] == [te["id"] for te in reversed(entries)]
+    assert mock_server.stats.by_route[SEARCH] == 5
+    row, te = rows[-1], entries[0]
+    assert row.start == te["start"] and row.stop == te["stop"]
+    assert row.seconds == te["duration"] and len(row.tag_ids) == 1
+
+    only = JANUARY.model_copy(update={"tag_ids": list(row.tag_ids)})
+    tagged = [r async for r in Reports(mock_client).detailed(1, only, page_size=5)]
+    assert len(tagged) == 8 and all(r.tag_ids == row.tag_ids for r in tagged)
+
+
+async def test_detailed_prefetches_the_next_page(mock_server, mock_client):
+    async def requests_after_first_row(prefetch: bool) -> int:
+        mock_server.stats.reset()
+        rows = Reports(mock_client).detailed(1, JANUARY, page_size=5, prefetch=prefetch)
+        await anext(rows)
+        await asyncio.sleep(0.2)
+        await rows.aclose()
+        return mock_server.stats.by_route[SEARCH]
+
+    _seed(mock_server, 12)
+    assert await requests_after_first_row(prefetch=True) == 2
+    assert await requests_after_first_row(prefetch=False) == 1
+
+
+async def test_summary_and_weekly_totals(mock_server, mock_client):
+    website = mock_server.add_project(1, "Website")
+    entries = _seed(mock_server, 10)
+    for te in entries[::2]:
+        te["project_id"] = website["id"]
+    reports = Reports(mock_client)
+
+    summary = [r async for r in reports.summary(1, JANUARY)]
+    totals: dict = {}
+    for row in summary:
+        totals[row.group_id] = totals.get(row.group_id, 0) + row.seconds
+    assert totals == {website["id"]: 5 * 45 * 60, None: 5 * 45 * 60}
+    assert {r.title for r in summary} >= {"Standup", "Planning"}
+
+    week = ReportFilters(start_date=date(2024, 1, 1))
+    weekly = {r.project_id: r async for r in reports.weekly(1, week)}
+    assert weekly[website["id"]].total == 5 * 45 * 60
+    # Five hours apart from 09:00: the odd entries fall on Jan 1st, 2nd, 2nd, 2nd and 3rd
+    assert weekly[None].seconds[:4] == (45 * 60, 3 * 45 * 60, 45 * 60, 0)
+
+
+def test_next_cursor():
+    assert next_cursor({}) is None
+    assert next_cursor({"x-next-id": "7", "X-Next-Row-Number": "51"}) == {
+        "first_id": 7,
+        "first_row_number": 51,
+    }
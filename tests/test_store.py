@@ -0,0 +1,171 @@
+"""Tests for the SQLite mirror"""
+
+# pylint: disable=missing-function-docstring
+
+import re
+from datetime import UTC, datetime, timedelta
+
+from aioresponses import aioresponses
+
+from lib_toggl.store import LocalStore
+from lib_toggl.sync import SyncState
+from lib_toggl.tags import Tag
+from lib_toggl.time_entries import (
+    BULK_EDIT_ENDPOINT,
+    ENDPOINT,
+    PatchOperation,
+    TimeEntry,
+)
+from lib_toggl.workspace import ENDPOINT as WORKSPACE_ENDPOINT
+from lib_toggl.workspace import Workspace
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+TIME_ENTRIES = re.compile(rf"^{re.escape(ENDPOINT)}(\?.*)?$")
+
+
+def _te(te_id: int, hours: int, at: datetime = T0, **kwargs) -> TimeEntry:
+    return TimeEntry(
+        id=te_id,
+        workspace_id=1,
+        start=T0 + timedelta(hours=hours),
+        duration=60,
+        at=at,
+        **kwargs,
+    )
+
+
+def _payload(te: TimeEntry) -> dict:
+    return {**te.model_dump(mode="json", exclude_none=True), "at": te.at.isoformat()}
+
+
+def test_round_trip_and_range_query():
+    with LocalStore() as store:
+        entries = [
+            _te(1, 1, project_id=5, task_id=9, tags=["a"]),
+            _te(2, 30, project_id=6),
+            _te(3, 2, project_id=5),
+        ]
+        store.put_time_entries(entries)
+        assert store.get_time_entry(1) == entries[0]
+        day = store.time_entries(T0, T0 + timedelta(days=1))
+        assert [te.id for te in day] == [1, 3]
+        assert day[0].at == T0
+        assert [
+            te.id for te in store.time_entries(T0, T0 + timedelta(days=2), project_id=6)
+        ] == [2]
+
+
+def test_older_write_does_not_replace_newer():
+    with LocalStore() as store:
+        newer = _te(1, 1, at=T0 + timedelta(minutes=5), description="new")
+        store.put_time_entries([newer])
+        store.put_time_entries([_te(1, 1, description="old")])
+        assert store.get_time_entry(1).description == "new"
+        store.put_time_entries([_te(1, 1, server_deleted_at=T0)])
+        assert store.get_time_entry(1) is None
+
+
+def test_coverage_merges_and_forgets():
+    with LocalStore() as store:
+        store.add_coverage(T0, T0 + timedelta(days=1))
+        store.add_coverage(T0 + timedelta(days=1), T0 + timedelta(days=2))
+        assert store.covers(T0 + timedelta(hours=5), T0 + timedelta(days=2))
+        assert not store.covers(T0 - timedelta(hours=1), T0 + timedelta(days=1))
+
+        store.put_time_entries([_te(1, 3)])
+        store.forget_time_entries([1])
+        assert not store.covers(T0, T0 + timedelta(hours=1))
+        assert store.get_time_entry(1) is None
+
+
+def test_sync_state_survives_reopen(tmp_path):
+    path = tmp_path / "mirror.db"
+    with LocalStore(path) as store:
+        store.put_time_entries([_te(1, 1)])
+        store.save_sync_state(SyncState(workspace_id=1, since=T0))
+    with LocalStore(path) as store:
+        state = store.load_sync_state(1)
+        assert state.since == T0
+        assert state.known == {1: T0}
+        assert store.load_sync_state(2) is None
+
+
+def test_workspaces_and_tags_round_trip():
+    with LocalStore() as store:
+        assert store.workspaces() is None
+        store.put_workspaces([Workspace(id=1, name="Home", api_token="secret")])
+        workspaces, age = store.workspaces()
+        assert workspaces[0].name == "Home"
+        assert workspaces[0].api_token is None
+        assert age < 5
+
+        store.put_tags(1, [Tag(id=3, name="a", workspace_id=1)])
+        store.put_tag(Tag(id=4, name="b", workspace_id=1))
+        tags, _ = store.tags(1)
+        assert [tag.name for tag in tags] == ["a", "b"]
+
+
+async def test_range_is_served_locally_once_fetched(make_client):
+    store = LocalStore()
+    entry = _te(1, 1)
+    async with make_client(store=store) as client:
+        with aioresponses() as m:
+            m.get(TIME_ENTRIES, payload=[_payload(entry)])
+            first = await client.get_time_entries(T0, T0 + timedelta(days=1))
+            # Nothing mocked any more; this has to come from the store
+            second = await client.get_time_entries(T0, T0 + timedelta(hours=12))
+    assert [te.id for te in first] == [te.id for te in second] == [1]
+
+
+async def test_sync_writes_to_store_and_cold_start_resumes(make_client):
+    store = LocalStore()
+    entry = _te(1, 1)
+    async with make_client(store=store) as client:
+        with aioresponses() as m:
+            m.get(TIME_ENTRIES, payload=[_payload(entry)])
+            await client.sync_time_entries(1)
+    assert store.get_time_entry(1) == entry
+
+    # A new process: high-water mark and known entries come from the store
+    async with make_client(store=store) as client:
+        state = client.sync_state(1)
+        assert state.since == T0
+        assert 1 in state.known
+
+
+async def test_workspaces_cold_start_from_store(make_client):
+    store = LocalStore()
+    async with make_client(store=store) as client:
+        with aioresponses() as m:
+            m.get(
+                WORKSPACE_ENDPOINT,
+                payload=[{"id": 1, "name": "Home", "api_token": None}],
+            )
+            await client.get_workspaces()
+    async with make_client(store=store) as client:
+        # No request mocked
+        workspaces = await client.workspaces
+        assert workspaces[0].name == "Home"
+
+
+async def test_tag_index_cold_start_from_store(make_client):
+    store = LocalStore()
+    store.put_tags(1, [Tag(id=3, name="a", workspace_id=1)])
+    async with make_client(store=store) as client:
+        with aioresponses():
+            index = await client.tag_index(1)
+    assert index.by_name["a"] == 3
+
+
+async def test_bulk_patch_forgets_stale_rows(make_client):
+    store = LocalStore()
+    store.put_time_entries([_te(1, 1)])
+    store.add_coverage(T0, T0 + timedelta(days=1))
+    async with make_client(store=store) as client:
+        with aioresponses() as m:
+            m.patch(BULK_EDIT_ENDPOINT(1, [1]), payload={"success": [1], "failure": []})
+            await client.patch_time_entries(
+                1, [1], [PatchOperation(op="replace", path="/description", value="x")]
+            )
+    assert store.get_time_entry(1) is None
+    assert not store.covers(T0, T0 + timedelta(days=1))
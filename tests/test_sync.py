@@ -0,0 +1,75 @@
+"""Tests for incremental Time Entry sync"""
+
+# pylint: disable=missing-function-docstring
+
+import re
+from datetime import UTC, datetime, timedelta
+
+from aioresponses import CallbackResult, aioresponses
+
+from lib_toggl.sync import SyncState, apply_changes
+from lib_toggl.time_entries import ENDPOINT, TimeEntry
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _te(te_id: int, at: datetime, workspace_id: int = 1, **kwargs) -> TimeEntry:
+    return TimeEntry(id=te_id, workspace_id=workspace_id, at=at, **kwargs)
+
+
+def test_apply_changes_classifies_entries():
+    state = SyncState(workspace_id=1)
+    first = apply_changes(state, [_te(1, T0), _te(2, T0)], fallback_until=T0)
+    assert [te.id for te in first.inserted] == [1, 2]
+    assert state.since == T0
+
+    later = T0 + timedelta(minutes=5)
+    second = apply_changes(
+        state,
+        [
+            # Same version as before; `since` is inclusive so the server sends it again
+            _te(1, T0),
+            _te(2, later),
+            _te(3, later),
+            _te(4, later, workspace_id=99),
+            _te(1, later, server_deleted_at=later),
+        ],
+        fallback_until=later,
+    )
+    assert [te.id for te in second.inserted] == [3]
+    assert [te.id for te in second.updated] == [2]
+    assert [te.id for te in second.deleted] == [1]
+    assert second.since == T0
+    assert second.until == later
+    assert set(state.known) == {2, 3}
+
+
+def test_apply_changes_keeps_mark_when_nothing_changed():
+    state = SyncState(workspace_id=1, since=T0)
+    changes = apply_changes(state, [], fallback_until=T0 + timedelta(hours=1))
+    assert not changes
+    assert state.since == T0
+
+
+async def test_sync_time_entries_sends_since_after_first_sync(client):
+    seen_params = []
+
+    def respond(url, **_kwargs):
+        seen_params.append(dict(url.query))
+        return CallbackResult(
+            payload=[{"id": 1, "workspace_id": 1, "at": T0.isoformat()}]
+        )
+
+    with aioresponses() as m:
+        m.get(
+            re.compile(rf"^{re.escape(ENDPOINT)}(\?.*)?$"),
+            callback=respond,
+            repeat=True,
+        )
+        first = await client.sync_time_entries(1)
+        second = await client.sync_time_entries(1)
+
+    assert [te.id for te in first.inserted] == [1]
+    assert not second
+    assert seen_params == [{}, {"since": str(int(T0.timestamp()))}]
+    assert client.sync_state(1).since == T0
@@ -0,0 +1,134 @@
+"""Tests for planning and applying tag updates"""
+
+# pylint: disable=missing-function-docstring
+
+import json
+
+import pytest
+from aioresponses import aioresponses
+
+from lib_toggl.cache import TagIndex
+from lib_toggl.ratelimit import RetryPolicy
+from lib_toggl.tag_update import plan_tag_update
+from lib_toggl.tags import TAGS_ENDPOINT, Tag
+from lib_toggl.time_entries import EDIT_ENDPOINT, TimeEntry
+
+INDEX = TagIndex(
+    1,
+    [
+        Tag(id=10, name="keep", workspace_id=1),
+        Tag(id=11, name="drop", workspace_id=1),
+        Tag(id=12, name="add", workspace_id=1),
+    ],
+)
+
+
+@pytest.fixture
+def client_options():
+    return {"retry_policy": RetryPolicy(max_retries=0)}
+
+
+def _te(tags: list[str]) -> TimeEntry:
+    return TimeEntry(id=5, workspace_id=1, tags=tags)
+
+
+def _tags(**ids: int) -> list[dict]:
+    return [{"id": i, "name": name, "workspace_id": 1} for name, i in ids.items()]
+
+
+def _puts(m: aioresponses) -> list[dict]:
+    return [
+        json.loads(call.kwargs["data"])
+        for (method, url), calls in m.requests.items()
+        if method == "PUT" and str(url) == EDIT_ENDPOINT(1, 5)
+        for call in calls
+    ]
+
+
+def test_plan_no_changes_is_empty():
+    plan = plan_tag_update(_te(["keep"]), ["keep"], INDEX)
+    assert not plan
+    assert plan.call_count == 0
+
+
+def test_plan_add_and_remove():
+    plan = plan_tag_update(_te(["keep", "drop"]), ["keep", "add", "new"], INDEX)
+    assert plan.to_create == ["new"]
+    assert plan.to_add == ["add", "new"]
+    assert plan.to_remove == ["drop"]
+    assert plan.put_count == 2
+    assert plan.call_count == 3
+
+
+def test_plan_only_adds_is_one_put():
+    plan = plan_tag_update(_te(["keep"]), ["keep", "add"], INDEX)
+    assert plan.call_count == 1
+
+
+def test_plan_unknown_tag_cannot_be_removed():
+    plan = plan_tag_update(_te(["ghost"]), [], INDEX)
+    assert plan.unresolved == ["ghost"]
+    assert plan.call_count == 0
+    # Still work left undone, not "no changes"
+    assert plan
+
+
+async def test_update_tags_sends_planned_calls(client):
+    edit_url = EDIT_ENDPOINT(1, 5)
+    with aioresponses() as m:
+        m.get(
+            TAGS_ENDPOINT(1),
+            payload=[{"id": 10, "name": "keep", "workspace_id": 1}],
+        )
+        m.post(TAGS_ENDPOINT(1), payload={"id": 20, "name": "a", "workspace_id": 1})
+        m.post(TAGS_ENDPOINT(1), payload={"id": 21, "name": "b", "workspace_id": 1})
+        m.put(
+            edit_url,
+            payload={"id": 5, "workspace_id": 1, "tags": ["keep", "a", "b"]},
+        )
+        m.put(edit_url, payload={"id": 5, "workspace_id": 1, "tags": ["a", "b"]})
+        result = await client.update_tags(_te(["keep"]), ["a", "b"])
+        puts = _puts(m)
+
+    assert result is not None
+    assert result.tags == ["a", "b"]
+    # Two creates (concurrently), one PUT adding both, one PUT removing the old one
+    assert len(puts) == 2
+    assert puts[0]["tag_action"] == "add"
+    assert sorted(puts[0]["tag_ids"]) == [20, 21]
+    assert puts[1]["tag_action"] == "delete"
+    assert puts[1]["tag_ids"] == [10]
+
+
+async def test_failed_creation_removes_nothing(client):
+    with aioresponses() as m:
+        m.get(TAGS_ENDPOINT(1), payload=_tags(keep=10))
+        m.post(TAGS_ENDPOINT(1), status=500)
+        m.get(TAGS_ENDPOINT(1), payload=_tags(keep=10))
+        result = await client.update_tags(_te(["keep"]), ["new"])
+        assert _puts(m) == []
+    assert result is None
+
+
+async def test_tag_created_elsewhere_is_found_after_a_reload(client):
+    with aioresponses() as m:
+        m.get(TAGS_ENDPOINT(1), payload=_tags(keep=10))
+        # Already exists, the cached index just doesn't know
+        m.post(TAGS_ENDPOINT(1), status=400)
+        m.get(TAGS_ENDPOINT(1), payload=_tags(keep=10, elsewhere=30))
+        m.put(EDIT_ENDPOINT(1, 5), payload={"id": 5, "workspace_id": 1})
+        m.put(EDIT_ENDPOINT(1, 5), payload={"id": 5, "workspace_id": 1})
+        assert await client.update_tags(_te(["keep"]), ["elsewhere"]) is not None
+        add, delete = _puts(m)
+    assert add["tag_action"] == "add" and add["tag_ids"] == [30]
+    assert delete["tag_action"] == "delete" and delete["tag_ids"] == [10]
+
+
+async def test_unknown_tag_is_removed_after_a_reload(client):
+    with aioresponses() as m:
+        m.get(TAGS_ENDPOINT(1), payload=_tags(keep=10))
+        m.get(TAGS_ENDPOINT(1), payload=_tags(keep=10, ghost=31))
+        m.put(EDIT_ENDPOINT(1, 5), payload={"id": 5, "workspace_id": 1})
+        assert await client.update_tags(_te(["keep", "ghost"]), ["keep"]) is not None
+        [delete] = _puts(m)
+    assert delete["tag_action"] == "delete" and delete["tag_ids"] == [31]
@@ -0,0 +1,146 @@
+"""Tests for webhook subscriptions and the receiver"""
+
+# pylint: disable=missing-function-docstring
+
+import asyncio
+
+import aiohttp
+
+from lib_toggl.const import WEBHOOK_SIGNATURE_HEADER
+from lib_toggl.tags import Tag
+from lib_toggl.time_entries import TimeEntry
+from lib_toggl.webhooks import (
+    EventFilter,
+    WebhookReceiver,
+    Webhooks,
+    build_event,
+    deliver,
+    signed_request,
+    verify_signature,
+)
+
+SECRET = "shhh"
+
+
+async def test_signatures_validation_and_duplicates():
+    tag = Tag(id=5, name="new", workspace_id=1)
+    event = build_event(tag, "created", event_id=42)
+    body, headers = signed_request(SECRET, event)
+    assert verify_signature(SECRET, body, headers[WEBHOOK_SIGNATURE_HEADER])
+    assert not verify_signature("other", body, headers[WEBHOOK_SIGNATURE_HEADER])
+
+    async with (
+        WebhookReceiver({1: SECRET}) as receiver,
+        aiohttp.ClientSession() as session,
+    ):
+        events = receiver.events()
+        resp = await deliver(receiver.url, "wrong", event, session)
+        assert resp.status == 401
+
+        validation = build_event(None, validation_code="abc")
+        async with session.post(
+            receiver.url, data=signed_request(SECRET, validation)[0]
+        ) as resp:
+            assert resp.status == 401  # unsigned
+        body, headers = signed_request(SECRET, validation)
+        async with session.post(receiver.url, data=body, headers=headers) as resp:
+            assert await resp.json() == {"validation_code": "abc"}
+
+        for _ in range(2):
+            assert (await deliver(receiver.url, SECRET, event, session)).status == 200
+        later = build_event(tag, "deleted", event_id=43)
+        await deliver(receiver.url, SECRET, later, session)
+        received = await asyncio.wait_for(anext(events), 1)
+        assert received.action == "created" and received.entity() == tag
+        # The redelivery was acknowledged but not passed on
+        assert (await asyncio.wait_for(anext(events), 1)).event_id == 43
+        await events.aclose()
+
+
+async def test_events_from_the_api_reach_the_caches(
+    mock_server, mock_client, make_client
+):
+    async with make_client(mock_server) as other_device:
+        webhooks = Webhooks(mock_client)
+        async with WebhookReceiver(SECRET, client=mock_client) as receiver:
+            events = receiver.events()
+            subscription = await webhooks.create_subscription(
+                1,
+                receiver.url,
+                [EventFilter(entity="*", action="*")],
+                secret=SECRET,
+            )
+            await mock_server.drain_webhooks()
+            [listed] = await webhooks.get_subscriptions(1)
+            assert listed.validated_at is not None
+            assert listed.subscription_id == subscription.subscription_id
+
+            index = await mock_client.tag_index(1)
+            started = await other_device.create_new_time_entry(
+                TimeEntry(workspace_id=1, description="elsewhere", tags=["fresh"])
+            )
+            await mock_server.drain_webhooks()
+            kinds = set()
+            while len(kinds) < 2:
+                kinds.add((await asyncio.wait_for(anext(events), 1)).model)
+            assert kinds == {"tag", "time_entry"}
+
+            seen = mock_server.stats.requests
+            assert (await mock_client.current_time_entry) == started
+            assert "fresh" in index.by_name
+            assert mock_server.stats.requests == seen
+
+            await other_device.stop_time_entry(started)  # pyright: ignore
+            await mock_server.drain_webhooks()
+            assert await mock_client.current_time_entry is None
+
+            await webhooks.set_subscription_enabled(
+                1,
+                subscription.subscription_id,
+                False,  # pyright: ignore
+            )
+            await webhooks.delete_subscription(1, subscription.subscription_id)  # pyright: ignore
+            assert await webhooks.get_subscriptions(1) == []
+            assert "time_entry" in await webhooks.get_event_filters()
+            await events.aclose()
+
+
+async def test_other_users_time_entries_are_skipped(mock_server, mock_client):
+    mine = TimeEntry(id=7, workspace_id=1, user_id=mock_server.user_id, duration=-1)
+    theirs = mine.model_copy(update={"id": 8, "user_id": mock_server.user_id + 1})
+    async with (
+        WebhookReceiver(SECRET, client=mock_client) as receiver,
+        aiohttp.ClientSession() as session,
+    ):
+        for te in (mine, theirs):
+            await deliver(receiver.url, SECRET, build_event(te, "created"), session)
+        assert (await mock_client.current_time_entry) == mine
+
+
+class _FlakyClient:
+    """Fails to apply the first event it is given."""
+
+    def __init__(self) -> None:
+        self.applied: list = []
+
+    def apply_webhook_event(self, event) -> None:
+        if not self.applied:
+            self.applied.append(None)
+            raise RuntimeError("not now")
+        self.applied.append(event)
+
+
+async def test_events_that_failed_are_handled_on_redelivery():
+    client = _FlakyClient()
+    event = build_event(Tag(id=5, name="new", workspace_id=1), "created", event_id=42)
+    async with (
+        WebhookReceiver(SECRET, client=client) as receiver,  # pyright: ignore reportArgumentType
+        aiohttp.ClientSession() as session,
+    ):
+        events = receiver.events()
+        assert (await deliver(receiver.url, SECRET, event, session)).status == 500
+        for _ in range(2):
+            assert (await deliver(receiver.url, SECRET, event, session)).status == 200
+        assert (await asyncio.wait_for(anext(events), 1)).event_id == 42
+        assert len(client.applied) == 2
+        await events.aclose()